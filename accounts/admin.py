@@ -1,16 +1,112 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.auth.models import User
 from django.contrib.auth.admin import UserAdmin
-from .models import VendorProfile, SupplierProfile
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.utils.functional import cached_property
+from django.utils.text import smart_split, unescape_string_literal
+
+from .models import (
+    Order, Product, SharedOrder, SupplierAnalytics, SupplierInventory, SupplierProfile, VendorProfile,
+)
+from .versioning import bump_version, profile_scope
+
+# Unfiltered changelists of tables bigger than this show PostgreSQL's row
+# estimate instead of running COUNT(*).
+ESTIMATE_COUNT_ABOVE = 100_000
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that takes the planner's row estimate for large, unfiltered tables."""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            connection = connections[queryset.db]
+            if connection.vendor == 'postgresql':
+                # A partitioned table (accounts.partitions) takes the sum of its
+                # partitions, as autovacuum never analyzes the parent itself.
+                # reltuples is -1 until a table is first analyzed.
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT CASE WHEN t.relkind = 'p' THEN (SELECT SUM(GREATEST(p.reltuples, 0)) "
+                        "FROM pg_inherits i JOIN pg_class p ON p.oid = i.inhrelid WHERE i.inhparent = t.oid) "
+                        "ELSE t.reltuples END::bigint "
+                        "FROM pg_class t WHERE t.oid = %s::regclass",
+                        [queryset.model._meta.db_table],
+                    )
+                    row = cursor.fetchone()
+                if row and row[0] is not None and row[0] > ESTIMATE_COUNT_ABOVE:
+                    return row[0]
+        return super().count
+
+
+class IndexedSearchMixin:
+    """
+    Admin search that can use the trigram indexes (migration 0012).
+
+    Django ORs every search field into one WHERE clause across the joined
+    tables, which PostgreSQL can only answer with a scan. Here each field is
+    looked up on its own, where its index applies, and the matching primary
+    keys are combined with UNION. Joins no longer multiply rows either, so the
+    changelist never needs DISTINCT.
+    """
+    lookup_prefixes = {'^': 'istartswith', '=': 'iexact'}
+
+    def get_search_results(self, request, queryset, search_term):
+        search_fields = self.get_search_fields(request)
+        if not search_fields or not search_term:
+            return queryset, False
+        lookups = [
+            f"{field[1:]}__{self.lookup_prefixes[field[0]]}" if field[0] in self.lookup_prefixes
+            else f"{field}__icontains"
+            for field in search_fields
+        ]
+        manager = self.model._default_manager
+        for term in smart_split(search_term):
+            if term.startswith(('"', "'")) and term[0] == term[-1]:
+                term = unescape_string_literal(term)
+            matches = [manager.filter(**{lookup: term}).values('pk') for lookup in lookups]
+            queryset = queryset.filter(pk__in=matches[0].union(*matches[1:]))
+        return queryset, False
+
+
+class LargeTableAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # The "N total" link next to filtered results would count the whole table.
+    show_full_result_count = False
+
+
+def _set_verified(modeladmin, request, queryset, verified):
+    user_ids = list(queryset.values_list('user_id', flat=True))
+    updated = queryset.update(is_verified=verified)
+    # update() skips post_save, so invalidate the cached profiles here.
+    transaction.on_commit(lambda: [bump_version(profile_scope(user_id)) for user_id in user_ids])
+    modeladmin.message_user(
+        request, f"{updated} profile(s) marked as {'verified' if verified else 'unverified'}.", messages.SUCCESS)
+
+
+@admin.action(description="Mark selected profiles as verified")
+def mark_verified(modeladmin, request, queryset):
+    _set_verified(modeladmin, request, queryset, True)
+
+
+@admin.action(description="Mark selected profiles as unverified")
+def mark_unverified(modeladmin, request, queryset):
+    _set_verified(modeladmin, request, queryset, False)
 
 
 @admin.register(VendorProfile)
-class VendorProfileAdmin(admin.ModelAdmin):
+class VendorProfileAdmin(LargeTableAdmin):
     list_display = ['user', 'company_name', 'business_type', 'phone', 'is_verified', 'created_at']
     list_filter = ['business_type', 'is_verified', 'created_at', 'updated_at']
+    list_select_related = ['user']
     search_fields = ['user__email', 'company_name', 'phone', 'gst_number']
     readonly_fields = ['created_at', 'updated_at']
+    raw_id_fields = ['user']
     list_editable = ['is_verified']
+    actions = [mark_verified, mark_unverified]
 
     fieldsets = (
         ('User Information', {
@@ -26,12 +122,15 @@ class VendorProfileAdmin(admin.ModelAdmin):
 
 
 @admin.register(SupplierProfile)
-class SupplierProfileAdmin(admin.ModelAdmin):
+class SupplierProfileAdmin(LargeTableAdmin):
     list_display = ['user', 'organization_name', 'contact_person', 'business_category', 'is_verified', 'created_at']
     list_filter = ['business_category', 'is_verified', 'created_at', 'updated_at']
+    list_select_related = ['user']
     search_fields = ['user__email', 'organization_name', 'contact_person', 'phone', 'gst_number', 'pan_number']
     readonly_fields = ['created_at', 'updated_at']
+    raw_id_fields = ['user']
     list_editable = ['is_verified']
+    actions = [mark_verified, mark_unverified]
 
     fieldsets = (
         ('User Information', {
@@ -50,6 +149,48 @@ class SupplierProfileAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(Product)
+class ProductAdmin(LargeTableAdmin):
+    list_display = ['name', 'category', 'price', 'rating', 'supplier', 'updated_at']
+    search_fields = ['name', 'supplier']
+    readonly_fields = ['name_hash', 'updated_at']
+    raw_id_fields = ['supplier_profile']
+
+
+@admin.register(SupplierInventory)
+class SupplierInventoryAdmin(LargeTableAdmin):
+    list_display = ['product', 'supplier', 'stock_quantity', 'custom_price', 'updated_at']
+    list_select_related = ['product', 'supplier__user']
+    search_fields = ['product__name', 'supplier__organization_name']
+    readonly_fields = ['added_on', 'updated_at']
+    raw_id_fields = ['supplier', 'product']
+
+
+@admin.register(Order)
+class OrderAdmin(LargeTableAdmin):
+    list_display = ['order_id', 'customer', 'item_name', 'vendor', 'amount', 'progress', 'date']
+    list_filter = ['progress']
+    list_select_related = ['vendor__user']
+    search_fields = ['order_id', 'customer', 'item_name']
+    raw_id_fields = ['vendor']
+
+
+@admin.register(SharedOrder)
+class SharedOrderAdmin(LargeTableAdmin):
+    list_display = ['order_id', 'item_name', 'supplier', 'vendor', 'quantity', 'amount', 'progress', 'date']
+    list_filter = ['progress']
+    list_select_related = ['supplier__user', 'vendor__user']
+    search_fields = ['order_id', 'item_name']
+    raw_id_fields = ['supplier', 'vendor']
+
+
+@admin.register(SupplierAnalytics)
+class SupplierAnalyticsAdmin(admin.ModelAdmin):
+    list_display = ['supplier', 'new_orders', 'active_products', 'revenue']
+    list_select_related = ['supplier__user']
+    raw_id_fields = ['supplier']
+
+
 # Extend the default User admin to show profiles
 class VendorProfileInline(admin.StackedInline):
     model = VendorProfile
@@ -65,8 +206,14 @@ class SupplierProfileInline(admin.StackedInline):
     fk_name = 'user'
 
 
-class CustomUserAdmin(UserAdmin):
+class CustomUserAdmin(IndexedSearchMixin, UserAdmin):
     inlines = (VendorProfileInline, SupplierProfileInline)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # Loaded with the user so get_inline_instances needs no extra queries.
+        return super().get_queryset(request).select_related('vendor_profile', 'supplier_profile')
 
     def get_inline_instances(self, request, obj=None):
         """Only show relevant inline based on user's profile"""
@@ -85,4 +232,4 @@ admin.site.register(User, CustomUserAdmin)
 # Custom admin site configuration
 admin.site.site_header = "Vendor-Supplier Dashboard Admin"
 admin.site.site_title = "Vendor-Supplier Admin Portal"
-admin.site.index_title = "Welcome to Vendor-Supplier Dashboard Administration"
\ No newline at end of file
+admin.site.index_title = "Welcome to Vendor-Supplier Dashboard Administration"
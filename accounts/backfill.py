@@ -0,0 +1,48 @@
+"""
+Batched, resumable backfill of Product.supplier_profile from the free-text
+Product.supplier column. Shared by migration 0009 (with historical models)
+and the backfill_product_suppliers command (to resume or re-run it).
+"""
+import time
+from collections import defaultdict
+
+from django.db import transaction
+
+BATCH_SIZE = 2000
+PAUSE_SECONDS = 0.05
+
+
+def backfill_product_suppliers(Product, SupplierProfile, batch_size=BATCH_SIZE, pause=PAUSE_SECONDS, log=None):
+    """
+    Match Product.supplier to SupplierProfile.organization_name (trimmed, case
+    insensitive; the oldest profile wins a tie) and set supplier_profile.
+
+    Each batch is its own short transaction, followed by a pause so the table
+    is never locked for long. Only rows still missing supplier_profile are
+    touched, so an interrupted run can simply be started again.
+    """
+    profiles = {}
+    for profile_id, name in (SupplierProfile.objects.exclude(organization_name__isnull=True)
+                             .order_by('id').values_list('id', 'organization_name')):
+        profiles.setdefault(name.strip().lower(), profile_id)
+
+    last_id, matched = 0, 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                Product.objects.filter(id__gt=last_id, supplier_profile__isnull=True)
+                .order_by('id').values_list('id', 'supplier')[:batch_size]
+            )
+            if not batch:
+                return matched
+            by_profile = defaultdict(list)
+            for product_id, supplier in batch:
+                profile_id = profiles.get((supplier or '').strip().lower())
+                if profile_id:
+                    by_profile[profile_id].append(product_id)
+            for profile_id, product_ids in by_profile.items():
+                matched += Product.objects.filter(id__in=product_ids).update(supplier_profile_id=profile_id)
+            last_id = batch[-1][0]
+        if log:
+            log(f"Products up to id {last_id}: {matched} matched so far")
+        time.sleep(pause)
@@ -0,0 +1,80 @@
+"""
+Delta sync for the product catalog.
+
+Clients keep an opaque token and ask /api/products/changes/?since=<token> for
+products updated after it (Product.updated_at; inventory writes touch their
+product, see accounts.signals) and the ids of products deleted since
+(ProductTombstone). Without a token the feed starts from the beginning, which
+is the one full download a client needs.
+
+Pages are walked by (updated_at, id). Once a client is caught up its token is
+set OVERLAP before the time of the request, so rows from transactions that
+were still committing are sent again on the next call instead of being missed;
+applying a change twice is harmless.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Product, ProductTombstone
+
+PAGE_SIZE = 500
+OVERLAP = timedelta(seconds=5)
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+class TokenExpired(Exception):
+    """The token predates the tombstones still kept; the client must resync."""
+
+
+def encode_token(moment, last_id=0):
+    micros = int(moment.timestamp() * 1_000_000)
+    return f"{micros}-{last_id}"
+
+
+def decode_token(token):
+    try:
+        micros, last_id = (int(part) for part in token.split('-'))
+        return datetime.fromtimestamp(micros / 1_000_000, tz=dt_timezone.utc), last_id
+    except (TypeError, ValueError, OverflowError, OSError):
+        raise InvalidToken(f"Invalid change token {token!r}")
+
+
+def catalog_changes(token=None, page_size=PAGE_SIZE, products=None):
+    """
+    Returns (changed products, deleted product ids, next token, more). Deleted
+    ids are only reported for a token: a first load has nothing to drop.
+    products narrows the product queryset read, e.g. to the columns sent.
+    """
+    started = timezone.now()
+    if products is None:
+        products = Product.objects.select_related('best_offer')
+    products = products.order_by('updated_at', 'id')
+    deleted = []
+    if token:
+        since, last_id = decode_token(token)
+        if since < started - TOMBSTONE_RETENTION:
+            raise TokenExpired(token)
+        products = products.filter(Q(updated_at__gt=since) | Q(updated_at=since, id__gt=last_id))
+        deleted = list(ProductTombstone.objects.filter(deleted_at__gt=since)
+                       .values_list('product_id', flat=True).distinct())
+
+    changed = list(products[:page_size + 1])
+    more = len(changed) > page_size
+    if more:
+        changed = changed[:page_size]
+        next_token = encode_token(changed[-1].updated_at, changed[-1].id)
+    else:
+        next_token = encode_token(started - OVERLAP)
+    return changed, deleted, next_token, more
+
+
+def prune_tombstones():
+    """Drop tombstones older than any token still accepted. Returns how many."""
+    deleted, _ = ProductTombstone.objects.filter(deleted_at__lt=timezone.now() - TOMBSTONE_RETENTION).delete()
+    return deleted
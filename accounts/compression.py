@@ -0,0 +1,163 @@
+"""
+Response compression for the JSON APIs.
+
+Bodies of a compressible type and at least COMPRESSION_MIN_BYTES long are
+compressed with brotli or gzip, whichever Accept-Encoding prefers (brotli on a
+tie). Streaming responses, such as the order event stream, are compressed
+chunk by chunk and flushed after every chunk, so no event is held back.
+
+Responses that used the CSRF token (get_csrf_token, pages rendering
+{% csrf_token %}) are never compressed: a secret compressed together with
+attacker-influenced content is what BREACH exploits.
+
+A response carrying an ETag (accounts.etags) has the same body as every other
+response with that ETag, so its compressed forms are kept in a small
+in-process LRU and reused instead of compressed again. Static files and the
+catalog snapshots are compressed ahead of time and served by
+StaticFilesMiddleware, which answers before this runs.
+"""
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+
+import brotli
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+# Dynamic responses trade a little ratio for much less CPU than the settings
+# used for the precompressed files.
+BROTLI_QUALITY = 5
+GZIP_LEVEL = 6
+ENCODINGS = ('br', 'gzip')  # preference order on equal q-values
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+_cache_lock = threading.Lock()
+_cache = OrderedDict()  # (etag, encoding) -> compressed body
+_cache_size = 0
+
+
+def negotiate(accept_encoding):
+    """The encoding to use for an Accept-Encoding header: 'br', 'gzip' or None."""
+    weights = {}
+    for part in accept_encoding.split(','):
+        coding, *params = part.split(';')
+        weight = 1.0
+        for param in params:
+            name, _, value = param.strip().partition('=')
+            if name.lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if coding.strip():
+            weights[coding.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(encoding, data):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _cached_compress(etag, encoding, data):
+    global _cache_size
+    key = (etag, encoding)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    compressed = compress(encoding, data)
+    with _cache_lock:
+        if key not in _cache:
+            _cache[key] = compressed
+            _cache_size += len(compressed)
+        while _cache_size > CACHE_MAX_BYTES:
+            _cache_size -= len(_cache.popitem(last=False)[1])
+    return compressed
+
+
+class StreamCompressor:
+    """Incremental compression whose every chunk can be decoded as it arrives."""
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'br':
+            self.compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self.compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data):
+        if self.encoding == 'br':
+            return self.compressor.process(data) + self.compressor.flush()
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self.compressor.finish()
+        return self.compressor.flush()
+
+
+def _compress_stream(encoding, chunks):
+    compressor = StreamCompressor(encoding)
+    for data in chunks:
+        yield compressor.chunk(data)
+    yield compressor.finish()
+
+
+async def _acompress_stream(encoding, chunks):
+    compressor = StreamCompressor(encoding)
+    async for data in chunks:
+        yield compressor.chunk(data)
+    yield compressor.finish()
+
+
+def _uses_csrf_token(request, response):
+    # get_token() flags the cookie for renewal; CsrfViewMiddleware, which runs
+    # inside this middleware, then sets it on the response and clears the flag.
+    return settings.CSRF_COOKIE_NAME in response.cookies or request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+
+
+def compress_response(request, response):
+    """Compress the response in place if worthwhile and allowed; see module docstring."""
+    if (response.has_header('Content-Encoding')
+            or not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES)
+            or _uses_csrf_token(request, response)):
+        return response
+    patch_vary_headers(response, ('Accept-Encoding',))
+    encoding = negotiate(request.headers.get('Accept-Encoding', ''))
+    if encoding is None:
+        return response
+
+    if response.streaming:
+        if response.is_async:
+            response.streaming_content = _acompress_stream(encoding, response.streaming_content)
+        else:
+            response.streaming_content = _compress_stream(encoding, response.streaming_content)
+        del response.headers['Content-Length']
+    else:
+        if len(response.content) < settings.COMPRESSION_MIN_BYTES:
+            return response
+        etag = response.get('ETag')
+        if etag:
+            compressed = _cached_compress(etag, encoding, response.content)
+        else:
+            compressed = compress(encoding, response.content)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        # The compressed body is a different byte sequence from the same entity.
+        response['ETag'] = f"W/{etag}"
+    response['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,329 @@
+"""
+Synthetic, production-shaped data for load and capacity testing (the
+generate_dataset command).
+
+Row counts are SCALE_UNIT times --scale. At --scale 1000 that is 100k vendors,
+50k suppliers, 1M products, 2M inventory rows, 10M orders and 5M shared orders.
+The data is skewed like real traffic. Product popularity follows a Zipf law,
+so a few products appear on most orders. A few vendors place a large share of
+all orders. A few large suppliers carry most of the catalog. Order dates bunch
+up towards the end date, and only recent orders are still in progress.
+
+The output depends only on the seed, the scale and the end date. Rows get
+explicit ids after the current maximum of each table, so existing data is
+kept, and the sequences are reset at the end. On PostgreSQL rows are streamed
+in with COPY. Other databases get batched executemany() INSERTs, which, unlike
+bulk_create, keep the generated created_at and date values instead of
+overwriting them with auto_now(_add).
+
+Everything is inserted in one transaction, then BestOffer and the monthly
+order totals are rebuilt and the catalog versions are bumped. The raw inserts send no signals. Afterwards old
+order months that fell into a DEFAULT partition get partitions of their own.
+"""
+import datetime
+import itertools
+from decimal import Decimal
+
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from . import dedupe, partitions
+from .models import (
+    Order, Product, ProductNameBucket, SharedOrder, SupplierInventory, SupplierProfile, VendorProfile,
+)
+from .offers import rebuild_best_offers
+from .pricing import PRICES_SCOPE
+from .versioning import CATALOG_SCOPE, bump_version
+
+SCALE_UNIT = {
+    'vendors': 100,
+    'suppliers': 50,
+    'products': 1000,
+    'inventory': 2000,
+    'orders': 10_000,
+    'shared_orders': 5_000,
+}
+BATCH_SIZE = 50_000
+PRODUCT_SKEW = 1.1  # Zipf exponents
+VENDOR_SKEW = 1.0
+SUPPLIER_SKEW = 0.8
+ORDER_AGE_DAYS = 180  # mean age of an order; the oldest are 3 years old
+MAX_AGE_DAYS = 3 * 365
+ACTIVE_DAYS = 7  # orders younger than this may still be in progress
+
+CATALOG = {
+    'Grain': ['Wheat Flour', 'Basmati Rice', 'Sona Masoori Rice', 'Besan', 'Sooji', 'Poha', 'Toor Dal',
+              'Moong Dal', 'Chana Dal', 'Masoor Dal', 'Rajma', 'Maida'],
+    'Spice': ['Garam Masala', 'Black Pepper', 'Turmeric Powder', 'Red Chilli Powder', 'Cumin Seeds',
+              'Coriander Powder', 'Cardamom', 'Cloves', 'Mustard Seeds', 'Chaat Masala', 'Hing'],
+    'Oils': ['Mustard Oil', 'Sunflower Oil', 'Groundnut Oil', 'Rice Bran Oil', 'Coconut Oil', 'Ghee',
+             'Sesame Oil', 'Palm Oil'],
+    'Dairy': ['Paneer', 'Butter', 'Curd', 'Milk', 'Cheese Slices', 'Fresh Cream', 'Khoa', 'Mozzarella'],
+    'Nonveg': ['Eggs', 'Chicken Breast', 'Chicken Curry Cut', 'Mutton', 'Fish Fillet', 'Prawns',
+               'Chicken Keema'],
+    'Bakery': ['Brown Bread', 'White Bread', 'Pav', 'Burger Buns', 'Rusk', 'Pizza Base', 'Kulcha'],
+}
+SIZES = {
+    'Grain': ['500g', '1kg', '5kg', '10kg', '25kg'],
+    'Spice': ['100g', '250g', '500g', '1kg'],
+    'Oils': ['1L', '5L', '15L'],
+    'Dairy': ['200g', '500g', '1kg', '1L'],
+    'Nonveg': ['500g', '1kg', '30 pcs', '2kg'],
+    'Bakery': ['400g', '6 pcs', '12 pcs', '800g'],
+}
+PRICE_PER_SIZE = {'Grain': 60, 'Spice': 300, 'Oils': 180, 'Dairy': 350, 'Nonveg': 250, 'Bakery': 90}
+QUALIFIERS = ['Premium', 'Pure', 'Fresh', 'Organic', 'Classic', 'Select', 'Farm Fresh', 'Golden', 'Royal',
+              'Daily', 'Chef Special', 'Export Quality']
+BRANDS = ['Aashirvaad', 'Annapurna', 'Bharat', 'Desi Rasoi', 'Ganga', 'Himalaya Farms', 'Indus', 'Kaveri',
+          'Kisan', 'Malabar', 'Narmada', 'Nilgiri', 'Panchvati', 'Rasoi Ghar', 'Sahyadri', 'Shakti', 'Swadesh',
+          'Tirupati', 'Vindhya', 'Yamuna']
+BADGES = ['', '', '', 'BESTSELLER', 'FRESH', 'LIMITED TIME', 'ORGANIC', 'POPULAR']
+CITIES = ['Delhi', 'Mumbai', 'Kolkata', 'Chennai', 'Bengaluru', 'Hyderabad', 'Pune', 'Ahmedabad', 'Jaipur',
+          'Lucknow', 'Kochi', 'Indore', 'Surat', 'Nagpur', 'Patna', 'Bhopal']
+VENDOR_KINDS = ['Snacks', 'Tiffins', 'Dhaba', 'Street Food', 'Chaat Corner', 'Biryani House', 'Sweets',
+                'Sandwich Hub', 'Dosa Point', 'Rolls', 'Juice Centre', 'Bakery Cafe']
+SUPPLIER_KINDS = ['Grains Supply', 'Spice Co.', 'Oil Mills', 'Dairy', 'Fresh Farms', 'Traders',
+                  'Wholesale', 'Agro Foods', 'Distributors', 'Provisions']
+BUSINESS_TYPES = ['Street Food', 'Restaurant', 'Cafe', 'Caterer', 'Cloud Kitchen', 'Sweet Shop']
+FIRST_NAMES = ['Rajesh', 'Priya', 'Amit', 'Sunita', 'Vijay', 'Anjali', 'Rahul', 'Deepa', 'Suresh', 'Kavita',
+               'Arjun', 'Meena', 'Ravi', 'Pooja', 'Sanjay', 'Neha', 'Manoj', 'Lakshmi', 'Imran', 'Fatima']
+LAST_NAMES = ['Kumar', 'Sharma', 'Patel', 'Singh', 'Reddy', 'Iyer', 'Gupta', 'Das', 'Nair', 'Khan',
+              'Joshi', 'Mehta', 'Rao', 'Verma', 'Bose', 'Pillai']
+
+
+class DatasetGenerator:
+
+    def __init__(self, scale, seed=0, end_date=None, password='loadtest', log=None):
+        self.counts = {name: max(1, int(unit * scale)) for name, unit in SCALE_UNIT.items()}
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.end_date = end_date or timezone.localdate()
+        self.end = datetime.datetime.combine(self.end_date, datetime.time(18), tzinfo=datetime.timezone.utc)
+        self.password = password
+        self.log = log or (lambda message: None)
+
+    # Sampling helpers
+
+    def _zipf(self, n, size, skew):
+        """size indexes into range(n), index popularity following a Zipf law of the given exponent."""
+        weights = 1.0 / np.arange(1, n + 1) ** skew
+        ranks = self.rng.choice(n, size=size, p=weights / weights.sum())
+        # The most popular items shouldn't all be the oldest rows.
+        return self.rng.permutation(n)[ranks]
+
+    def _ages(self, size):
+        """Ages in days, exponentially distributed with mean ORDER_AGE_DAYS."""
+        return np.minimum(self.rng.exponential(ORDER_AGE_DAYS, size), MAX_AGE_DAYS).astype(np.int64)
+
+    def _pick(self, options, size):
+        return [options[i] for i in self.rng.integers(0, len(options), size)]
+
+    def _phones(self, size):
+        return [f"+91{n}" for n in self.rng.integers(7_000_000_000, 9_999_999_999, size)]
+
+    def _gst(self, size):
+        return [f"{n:02d}ABCDE{m:04d}F1Z{n % 10}" for n, m in
+                zip(self.rng.integers(1, 37, size), self.rng.integers(0, 10_000, size))]
+
+    # Loading
+
+    def _next_id(self, model):
+        return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+    def _load(self, model, attnames, rows):
+        """Insert rows (tuples of attnames' values) into model's table; returns the row count."""
+        fields = [model._meta.get_field(name) for name in attnames]
+        columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+        table = connection.ops.quote_name(model._meta.db_table)
+        count = 0
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                with cursor.cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+                    for row in rows:
+                        copy.write_row(row)
+                        count += 1
+            else:
+                sql = f"INSERT INTO {table} ({columns}) VALUES ({', '.join(['%s'] * len(fields))})"
+                for batch in iter(lambda: list(itertools.islice(rows, BATCH_SIZE)), []):
+                    cursor.executemany(sql, [
+                        [field.get_db_prep_save(value, connection) for field, value in zip(fields, row)]
+                        for row in batch
+                    ])
+                    count += len(batch)
+        self.log(f"{model._meta.db_table}: {count} rows")
+        return count
+
+    def _batches(self, total):
+        for start in range(0, total, BATCH_SIZE):
+            yield start, min(BATCH_SIZE, total - start)
+
+    # Tables
+
+    def _users(self, kind, count):
+        first_id = self._next_id(User)
+        password = make_password(self.password)
+        joined = self.end - datetime.timedelta(days=MAX_AGE_DAYS)
+        offsets = self.rng.integers(0, MAX_AGE_DAYS * 86400, count)
+        first, last = self._pick(FIRST_NAMES, count), self._pick(LAST_NAMES, count)
+        self._load(User, ['id', 'password', 'is_superuser', 'username', 'first_name', 'last_name', 'email',
+                          'is_staff', 'is_active', 'date_joined'], (
+            (first_id + i, password, False, email, first[i], last[i], email, False, True,
+             joined + datetime.timedelta(seconds=int(offsets[i])))
+            for i in range(count)
+            for email in [f"{kind}-{self.seed}-{i}@example.com"]
+        ))
+        return first_id
+
+    def vendors(self):
+        count = self.counts['vendors']
+        first_user = self._users('vendor', count)
+        self.vendor_id = self._next_id(VendorProfile)
+        city, kind = self._pick(CITIES, count), self._pick(VENDOR_KINDS, count)
+        self.vendor_names = [f"{city[i]} {kind[i]} {i}" for i in range(count)]
+        btype, phone, gst = self._pick(BUSINESS_TYPES, count), self._phones(count), self._gst(count)
+        verified = self.rng.random(count) < 0.6
+        self._load(VendorProfile, ['id', 'user_id', 'company_name', 'business_type', 'phone', 'address',
+                                   'gst_number', 'website', 'created_at', 'updated_at', 'is_verified'], (
+            (self.vendor_id + i, first_user + i, self.vendor_names[i], btype[i], phone[i],
+             f"Shop {i % 200 + 1}, Main Market, {city[i]}", gst[i], None, self.end, self.end, bool(verified[i]))
+            for i in range(count)
+        ))
+
+    def suppliers(self):
+        count = self.counts['suppliers']
+        first_user = self._users('supplier', count)
+        self.supplier_id = self._next_id(SupplierProfile)
+        city, kind = self._pick(CITIES, count), self._pick(SUPPLIER_KINDS, count)
+        self.supplier_names = [f"{city[i]} {kind[i]} {i}" for i in range(count)]
+        category = self._pick(list(CATALOG), count)
+        contact = [f"{f} {l}" for f, l in zip(self._pick(FIRST_NAMES, count), self._pick(LAST_NAMES, count))]
+        phone, gst = self._phones(count), self._gst(count)
+        verified = self.rng.random(count) < 0.7
+        self._load(SupplierProfile, ['id', 'user_id', 'organization_name', 'contact_person', 'phone', 'address',
+                                     'gst_number', 'pan_number', 'business_category', 'supply_capacity',
+                                     'certifications', 'website', 'created_at', 'updated_at', 'is_verified'], (
+            (self.supplier_id + i, first_user + i, self.supplier_names[i], contact[i], phone[i],
+             f"Godown {i % 50 + 1}, Industrial Area, {city[i]}", gst[i], f"ABCDE{i % 10_000:04d}F", category[i],
+             f"{(i % 20 + 1) * 100} units/day", 'FSSAI', None, self.end, self.end, bool(verified[i]))
+            for i in range(count)
+        ))
+
+    def products(self):
+        count = self.counts['products']
+        self.product_id = self._next_id(Product)
+        categories = list(CATALOG)
+        category = self.rng.integers(0, len(categories), count)
+        item = self.rng.integers(0, 1_000_000, count)
+        qualifier, brand = self._pick(QUALIFIERS, count), self._pick(BRANDS, count)
+        suppliers = self._zipf(self.counts['suppliers'], count, SUPPLIER_SKEW)
+        badge = self._pick(BADGES, count)
+        self.product_names, self.product_prices = [], []
+        for i in range(count):
+            name = categories[category[i]]
+            items, sizes = CATALOG[name], SIZES[name]
+            size = sizes[item[i] % len(sizes)]
+            self.product_names.append(f"{brand[i]} {qualifier[i]} {items[item[i] % len(items)]} ({size})")
+            self.product_prices.append(round(PRICE_PER_SIZE[name] * (1 + (item[i] % len(sizes)) * 1.8)
+                                             * (0.7 + (item[i] % 61) / 100), 2))
+        rating = np.round(self.rng.uniform(3.0, 5.0, count), 1)
+        rating_count = self.rng.zipf(1.6, count) % 5000
+        self._load(Product, ['id', 'name', 'price', 'rating', 'rating_count', 'category', 'image', 'badge',
+                             'supplier', 'supplier_profile_id', 'supplier_image', 'description', 'name_hash',
+                             'updated_at'], (
+            (self.product_id + i, self.product_names[i], self.product_prices[i], float(rating[i]),
+             int(rating_count[i]), categories[category[i]], 'https://cdn-icons-png.flaticon.com/512/3081/3081559.png',
+             badge[i], self.supplier_names[suppliers[i]], self.supplier_id + int(suppliers[i]),
+             f"https://randomuser.me/api/portraits/men/{i % 100}.jpg",
+             f"{self.product_names[i]} from {self.supplier_names[suppliers[i]]}.",
+             dedupe.name_hash(self.product_names[i]), self.end)
+            for i in range(count)
+        ))
+        # Names repeat across suppliers, so their buckets can be computed once per name.
+        name_buckets = {}
+        self._load(ProductNameBucket, ['product_id', 'bucket'], (
+            (self.product_id + i, bucket)
+            for i, name in enumerate(self.product_names)
+            for bucket in name_buckets.get(name) or name_buckets.setdefault(
+                name, dedupe.buckets(dedupe.normalize(name)))
+        ))
+
+    def inventory(self):
+        products, suppliers = self.counts['products'], self.counts['suppliers']
+        target = min(self.counts['inventory'], products * suppliers)
+        pairs = np.unique(self._zipf(suppliers, target, SUPPLIER_SKEW).astype(np.int64) * products
+                          + self._zipf(products, target, PRODUCT_SKEW))
+        stock = self.rng.integers(0, 500, len(pairs))
+        custom = self.rng.random(len(pairs)) < 0.4
+        discount = self.rng.uniform(0.85, 1.05, len(pairs))
+        self._load(SupplierInventory, ['supplier_id', 'product_id', 'stock_quantity', 'custom_price',
+                                       'added_on', 'updated_at'], (
+            (self.supplier_id + int(pair // products), self.product_id + int(pair % products), int(stock[i]),
+             Decimal(str(round(self.product_prices[pair % products] * discount[i], 2))) if custom[i] else None,
+             self.end, self.end)
+            for i, pair in enumerate(pairs)
+        ))
+
+    def _order_batches(self, total):
+        """Per batch: (start, vendor indexes, product indexes, quantities, dates, progress values)."""
+        for start, size in self._batches(total):
+            vendors = self._zipf(self.counts['vendors'], size, VENDOR_SKEW)
+            products = self._zipf(self.counts['products'], size, PRODUCT_SKEW)
+            quantities = self.rng.integers(1, 50, size)
+            ages = self._ages(size)
+            progress = np.where(ages < ACTIVE_DAYS, self.rng.integers(1, 4, size), 3)
+            dates = [self.end_date - datetime.timedelta(days=int(age)) for age in ages]
+            yield start, vendors, products, quantities, dates, progress
+
+    def orders(self):
+        def rows():
+            for start, vendors, products, quantities, dates, progress in self._order_batches(self.counts['orders']):
+                customers = self._pick(self.vendor_names, len(vendors))
+                for i in range(len(vendors)):
+                    yield (f"#SS-{start + i + 1}", customers[i], self.product_names[products[i]], int(progress[i]),
+                           Decimal(str(round(self.product_prices[products[i]] * quantities[i], 2))), dates[i],
+                           self.vendor_id + int(vendors[i]))
+        self._load(Order, ['order_id', 'customer', 'item_name', 'progress', 'amount', 'date', 'vendor_id'], rows())
+
+    def shared_orders(self):
+        def rows():
+            for start, vendors, products, quantities, dates, progress in self._order_batches(
+                    self.counts['shared_orders']):
+                suppliers = self._zipf(self.counts['suppliers'], len(vendors), SUPPLIER_SKEW)
+                for i in range(len(vendors)):
+                    yield (self.supplier_id + int(suppliers[i]), self.vendor_id + int(vendors[i]),
+                           f"#PO-{start + i + 1}", self.product_names[products[i]], int(quantities[i]),
+                           Decimal(str(round(self.product_prices[products[i]] * quantities[i], 2))), dates[i],
+                           int(progress[i]))
+        self._load(SharedOrder, ['supplier_id', 'vendor_id', 'order_id', 'item_name', 'quantity', 'amount', 'date',
+                                 'progress'], rows())
+
+    def generate(self):
+        models = [User, VendorProfile, SupplierProfile, Product, ProductNameBucket, SupplierInventory, Order,
+                  SharedOrder]
+        with transaction.atomic():
+            self.vendors()
+            self.suppliers()
+            self.products()
+            self.inventory()
+            self.orders()
+            self.shared_orders()
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                    cursor.execute(sql)
+            self.log(f"Best offers refreshed for {rebuild_best_offers()} products")
+            self.log(f"Order totals rolled up for {len(partitions.close_months(recount=True))} closed months")
+            transaction.on_commit(lambda: bump_version(CATALOG_SCOPE))
+            transaction.on_commit(lambda: bump_version(PRICES_SCOPE))
+        for name in partitions.ensure_partitions():
+            self.log(f"Created {name}")
+        if connection.vendor == 'postgresql':
+            # Fresh statistics for the planner (and EstimatedCountPaginator).
+            with connection.cursor() as cursor:
+                for model in models:
+                    cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+        return self.counts
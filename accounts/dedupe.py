@@ -0,0 +1,206 @@
+"""
+Canonical product matching.
+
+Names are normalized (case, punctuation, unit spellings, word order) and
+hashed, so exact duplicates are one indexed lookup on Product.name_hash. Near
+duplicates are found with MinHash over character 3-grams and banded LSH: each
+product stores BANDS bucket ids (ProductNameBucket), and only products sharing
+a bucket with the new name are compared, instead of the whole catalog. A
+candidate must be in the same category, carry the same quantities ("10kg" is
+not "5kg") and reach MATCH_THRESHOLD Jaccard similarity to count as a match.
+"""
+import hashlib
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Product, ProductNameBucket, SupplierInventory
+from .offers import refresh_best_offers
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+# With 16 bands of 4 rows, names at 0.8 similarity share a bucket > 99.9% of
+# the time, names below 0.3 well under 15%.
+MATCH_THRESHOLD = 0.8
+MAX_CANDIDATES = 20
+
+_PRIME = (1 << 31) - 1
+# Fixed seed: signatures are stored, so they must not change between processes.
+_rng = np.random.default_rng(7919)
+_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+_UNITS = {
+    'kg': 'kg', 'kgs': 'kg', 'kilo': 'kg', 'kilos': 'kg', 'kilogram': 'kg', 'kilograms': 'kg',
+    'g': 'g', 'gm': 'g', 'gms': 'g', 'gram': 'g', 'grams': 'g',
+    'l': 'l', 'lt': 'l', 'ltr': 'l', 'ltrs': 'l', 'litre': 'l', 'litres': 'l', 'liter': 'l', 'liters': 'l',
+    'ml': 'ml', 'pc': 'pc', 'pcs': 'pc', 'piece': 'pc', 'pieces': 'pc',
+}
+_QUANTITY = re.compile(r'(\d+(?:\.\d+)?)\s*(' + '|'.join(sorted(_UNITS, key=len, reverse=True)) + r')\b')
+
+
+def normalize(name):
+    """'Premium Wheat Flour (10 Kgs)' -> '10kg flour premium wheat'."""
+    text = unicodedata.normalize('NFKC', name or '').lower().replace('&', ' and ')
+    text = _QUANTITY.sub(lambda m: f" {m.group(1)}{_UNITS[m.group(2)]} ", text)
+    tokens = re.findall(r'\d+(?:\.\d+)?[a-z]*|[a-z]+', text)
+    return ' '.join(sorted(tokens))
+
+
+def _hash(normalized):
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+
+def name_hash(name):
+    return _hash(normalize(name))
+
+
+def _quantities(normalized):
+    return {token for token in normalized.split() if token[0].isdigit()}
+
+
+def _shingles(normalized):
+    if len(normalized) < 3:
+        return {normalized}
+    return {normalized[i:i + 3] for i in range(len(normalized) - 2)}
+
+
+def similarity(a, b):
+    """Jaccard similarity of two normalized names; 0 when their quantities differ."""
+    if _quantities(a) != _quantities(b):
+        return 0.0
+    a, b = _shingles(a), _shingles(b)
+    return len(a & b) / len(a | b)
+
+
+def buckets(normalized):
+    """The BANDS LSH bucket ids of a normalized name."""
+    shingles = _shingles(normalized)
+    hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+    signature = ((np.outer(hashes % _PRIME, _A) + _B) % _PRIME).min(axis=0).astype('<u8')
+    return [
+        int.from_bytes(hashlib.blake2b(bytes([band]) + signature[band * ROWS:(band + 1) * ROWS].tobytes(),
+                                       digest_size=8).digest(), 'little', signed=True)
+        for band in range(BANDS)
+    ]
+
+
+def replace_buckets(products):
+    ProductNameBucket.objects.filter(product__in=[product.pk for product in products]).delete()
+    ProductNameBucket.objects.bulk_create([
+        ProductNameBucket(product_id=product.pk, bucket=bucket)
+        for product in products
+        for bucket in buckets(normalize(product.name))
+    ])
+
+
+def reindex(products):
+    """Refresh name_hash and the LSH buckets of products saved before they existed."""
+    products = list(products)
+    for product in products:
+        product.name_hash = name_hash(product.name)
+    Product.objects.bulk_update(products, ['name_hash'])
+    replace_buckets(products)
+
+
+def find_canonical(name, category):
+    """The existing product the given name and category most likely refer to, or None."""
+    normalized = normalize(name)
+    in_category = Product.objects.filter(category__iexact=category)
+    exact = in_category.filter(name_hash=_hash(normalized)).order_by('id').first()
+    if exact:
+        return exact
+
+    candidate_ids = (
+        ProductNameBucket.objects
+        .filter(bucket__in=buckets(normalized), product__category__iexact=category)
+        .values('product_id').annotate(shared=Count('id'))
+        .order_by('-shared', 'product_id')
+        .values_list('product_id', flat=True)[:MAX_CANDIDATES]
+    )
+    best, best_score = None, MATCH_THRESHOLD
+    for product in in_category.filter(id__in=list(candidate_ids)).order_by('id'):
+        score = similarity(normalized, normalize(product.name))
+        if score > best_score or (best is None and score == best_score):
+            best, best_score = product, score
+    return best
+
+
+def duplicate_groups(rows, threshold=MATCH_THRESHOLD):
+    """
+    Group (id, name, category) rows into {canonical id: [duplicate ids]}.
+    The oldest product of a group is its canonical one, and every duplicate is
+    compared against it directly, so matches never chain A ~ B ~ C.
+    """
+    exact = {}
+    index = defaultdict(list)  # (category, bucket) -> canonical ids
+    canonical_names = {}
+    groups = defaultdict(list)
+    for product_id, name, category in sorted(rows):
+        normalized, category = normalize(name), (category or '').strip().lower()
+        if (category, normalized) in exact:
+            groups[exact[(category, normalized)]].append(product_id)
+            continue
+        product_buckets = buckets(normalized)
+        candidates = {c for bucket in product_buckets for c in index[(category, bucket)]}
+        best, best_score = None, threshold
+        for candidate in sorted(candidates):
+            score = similarity(normalized, canonical_names[candidate])
+            if score > best_score or (best is None and score == best_score):
+                best, best_score = candidate, score
+        if best is not None:
+            groups[best].append(product_id)
+            continue
+        exact[(category, normalized)] = product_id
+        canonical_names[product_id] = normalized
+        for bucket in product_buckets:
+            index[(category, bucket)].append(product_id)
+    return dict(groups)
+
+
+@transaction.atomic
+def merge_products(canonical_id, duplicate_ids):
+    """
+    Fold duplicate products into the canonical one: move their supplier
+    inventory over (adding stock where the supplier already lists the
+    canonical product), combine ratings, then delete the duplicates.
+    """
+    canonical = Product.objects.select_for_update().get(pk=canonical_id)
+    duplicates = list(Product.objects.select_for_update().filter(pk__in=duplicate_ids))
+    if not duplicates:
+        return canonical
+
+    by_supplier = {inventory.supplier_id: inventory for inventory in canonical.supplier_inventories.all()}
+    moved, merged, absorbed = [], set(), []
+    for inventory in SupplierInventory.objects.filter(product__in=duplicates).order_by('id'):
+        existing = by_supplier.get(inventory.supplier_id)
+        if existing is None:
+            inventory.product = canonical
+            by_supplier[inventory.supplier_id] = inventory
+            moved.append(inventory)
+        else:
+            existing.stock_quantity += inventory.stock_quantity
+            if existing.custom_price is None:
+                existing.custom_price = inventory.custom_price
+            merged.add(existing)
+            absorbed.append(inventory.pk)
+    SupplierInventory.objects.bulk_update(moved, ['product'])
+    SupplierInventory.objects.bulk_update(merged, ['stock_quantity', 'custom_price'])
+    SupplierInventory.objects.filter(pk__in=absorbed).delete()
+
+    rated = [canonical] + duplicates
+    rating_count = sum(product.rating_count for product in rated)
+    if rating_count:
+        canonical.rating = round(sum(p.rating * p.rating_count for p in rated) / rating_count, 2)
+    canonical.rating_count = rating_count
+    canonical.save(update_fields=['rating', 'rating_count', 'updated_at'])
+
+    Product.objects.filter(pk__in=[product.pk for product in duplicates]).delete()
+    refresh_best_offers([canonical.pk])
+    return canonical
@@ -0,0 +1,161 @@
+"""
+Order change notifications, fanned out through Redis pub/sub and streamed to
+the dashboards as Server-Sent Events.
+
+Writers publish on commit (see accounts.signals). Each ASGI worker keeps one
+Redis subscription and hands messages to the connected dashboards through
+in-memory queues, so an open dashboard costs one idle HTTP connection.
+Payloads have the shape of the order list APIs, so a client can merge them
+into what it loaded.
+
+Streaming needs ASGI. A WSGI worker would be held by each open stream, so
+there the stream endpoint answers 204 and the dashboards poll instead.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from .serializers import OrderSerializer
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_SECONDS = 15
+RETRY_MILLISECONDS = 5000
+QUEUE_SIZE = 100
+
+_publisher = None
+
+
+def vendor_channel(vendor_id):
+    return f"orders:vendor:{vendor_id}"
+
+
+def supplier_channel(supplier_id):
+    return f"orders:supplier:{supplier_id}"
+
+
+def order_payload(order):
+    """As in the vendor's order list (OrderSerializer)."""
+    return OrderSerializer(order).data
+
+
+def shared_order_payload(order):
+    """As in the supplier's order list (supplier_orders_api)."""
+    return {field.attname: getattr(order, field.attname) for field in order._meta.concrete_fields}
+
+
+def publish(channels, event, payload):
+    """
+    Best effort: a dashboard that misses an event still sees the change on its
+    next full load, so Redis trouble must never fail the write that caused it.
+    """
+    global _publisher
+    # Encoded like the API responses (DRF's encoder), for the same shape.
+    message = json.dumps({"event": event, "data": payload}, cls=JSONEncoder)
+    try:
+        if _publisher is None:
+            _publisher = redis.Redis.from_url(settings.REDIS_URL)
+        with _publisher.pipeline(transaction=False) as pipe:
+            for channel in channels:
+                pipe.publish(channel, message)
+            pipe.execute()
+    except redis.RedisError:
+        logger.warning("Could not publish %s to %s", event, channels, exc_info=True)
+
+
+class _Hub:
+    """One Redis subscription per event loop, shared by every open stream."""
+
+    def __init__(self):
+        self.listeners = defaultdict(set)
+        self.lock = asyncio.Lock()
+        self.client = None
+        self.pubsub = None
+        self.reader = None
+
+    async def subscribe(self, channels):
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        async with self.lock:
+            if self.pubsub is None:
+                self.client = aioredis.from_url(settings.REDIS_URL)
+                self.pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            new_channels = [channel for channel in channels if not self.listeners[channel]]
+            for channel in channels:
+                self.listeners[channel].add(queue)
+            if new_channels:
+                await self.pubsub.subscribe(*new_channels)
+            if self.reader is None or self.reader.done():
+                self.reader = asyncio.create_task(self._read())
+        return queue
+
+    async def unsubscribe(self, channels, queue):
+        async with self.lock:
+            gone = []
+            for channel in channels:
+                self.listeners[channel].discard(queue)
+                if not self.listeners[channel]:
+                    del self.listeners[channel]
+                    gone.append(channel)
+            if gone and self.pubsub is not None:
+                await self.pubsub.unsubscribe(*gone)
+
+    async def _read(self):
+        try:
+            while self.listeners:
+                message = await self.pubsub.get_message(timeout=1.0)
+                if message is None:
+                    continue
+                channel = message['channel'].decode()
+                for queue in list(self.listeners.get(channel, ())):
+                    try:
+                        queue.put_nowait(message['data'])
+                    except asyncio.QueueFull:
+                        pass  # a stalled client; it resyncs when it reconnects
+        except (redis.RedisError, OSError):
+            logger.warning("Order event subscription lost", exc_info=True)
+            async with self.lock:
+                for queue in {q for queues in self.listeners.values() for q in queues}:
+                    if queue.full():
+                        queue.get_nowait()
+                    queue.put_nowait(None)
+                self.listeners.clear()
+                await self.client.aclose()
+                self.client = self.pubsub = None
+
+
+_hubs = {}
+
+
+def _hub():
+    loop = asyncio.get_running_loop()
+    if loop not in _hubs:
+        for stale in [l for l in _hubs if l.is_closed()]:
+            del _hubs[stale]
+        _hubs[loop] = _Hub()
+    return _hubs[loop]
+
+
+async def stream(channels):
+    """Async iterator of SSE frames for the given channels."""
+    hub = _hub()
+    queue = await hub.subscribe(channels)
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        while True:
+            try:
+                raw = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if raw is None:
+                return  # subscription dropped; EventSource reconnects after `retry`
+            message = json.loads(raw)
+            yield f"event: {message['event']}\ndata: {json.dumps(message['data'])}\n\n"
+    finally:
+        await hub.unsubscribe(channels, queue)
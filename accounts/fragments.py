@@ -0,0 +1,24 @@
+"""
+Version-keyed caching of expensive response sections.
+
+A fragment's cache key carries the versions of the data scopes it was built
+from (see accounts.versioning). Writes bump those versions, which makes every
+fragment built from the old data unreachable; nothing is deleted explicitly.
+The versions are read before building, so a write that lands mid-build only
+strands the fragment under a key nobody asks for again.
+"""
+from django.core.cache import cache
+
+from .versioning import get_versions
+
+FRAGMENT_TIMEOUT = 60 * 60
+
+
+def cached_fragment(name, scopes, build, timeout=FRAGMENT_TIMEOUT):
+    versions = get_versions(*scopes)
+    key = f"fragment:{name}:{':'.join(str(version) for version in versions)}"
+    fragment = cache.get(key)
+    if fragment is None:
+        fragment = build()
+        cache.set(key, fragment, timeout)
+    return fragment
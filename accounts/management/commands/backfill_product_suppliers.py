@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from accounts.backfill import BATCH_SIZE, PAUSE_SECONDS, backfill_product_suppliers
+from accounts.models import Product, SupplierProfile
+
+
+class Command(BaseCommand):
+    help = "Link products to their SupplierProfile by organization name, in small throttled batches. Safe to re-run."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--pause', type=float, default=PAUSE_SECONDS, help='Seconds to sleep between batches.')
+
+    def handle(self, *args, **options):
+        matched = backfill_product_suppliers(
+            Product, SupplierProfile, options['batch_size'], options['pause'],
+            log=self.stdout.write if options['verbosity'] > 1 else None,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Linked {matched} products to supplier profiles."))
@@ -0,0 +1,54 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from accounts.compression import compress
+
+DEFAULT_PATHS = ['/api/products/', '/api/orders/', '/api/profile/', '/api/vendor/bootstrap/']
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure bytes on the wire and compression CPU time per endpoint for "
+        "identity, gzip and brotli, at the settings CompressionMiddleware uses."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help=f"Endpoints to measure (default: {' '.join(DEFAULT_PATHS)}).")
+        parser.add_argument('--user', help='Username to log in as for authenticated endpoints.')
+        parser.add_argument('--repeat', type=int, default=50, help='Compressions per endpoint and encoding.')
+
+    def handle(self, *args, **options):
+        client = Client()
+        if options['user']:
+            try:
+                client.force_login(User.objects.get(username=options['user']))
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['user']!r} does not exist")
+
+        repeat = max(1, options['repeat'])
+        self.stdout.write(f"{'endpoint':<32} {'identity':>10} {'gzip':>10} {'br':>10} "
+                          f"{'gzip x':>7} {'br x':>7} {'gzip ms':>8} {'br ms':>8} {'sent as':>8}")
+        for path in options['paths'] or DEFAULT_PATHS:
+            # Uncompressed body as the view produces it.
+            response = client.get(path, HTTP_ACCEPT_ENCODING='identity')
+            if response.status_code != 200:
+                self.stdout.write(f"{path:<32} HTTP {response.status_code}, skipped")
+                continue
+            body = response.content
+            sizes, cpu_ms = {}, {}
+            for encoding in ('gzip', 'br'):
+                sizes[encoding] = len(compress(encoding, body))
+                start = time.process_time()
+                for _ in range(repeat):
+                    compress(encoding, body)
+                cpu_ms[encoding] = (time.process_time() - start) * 1000 / repeat
+            # What the middleware actually sent to a browser.
+            wire = client.get(path, HTTP_ACCEPT_ENCODING='gzip, deflate, br').get('Content-Encoding', 'identity')
+            self.stdout.write(
+                f"{path:<32} {len(body):>10} {sizes['gzip']:>10} {sizes['br']:>10} "
+                f"{len(body) / sizes['gzip']:>7.1f} {len(body) / sizes['br']:>7.1f} "
+                f"{cpu_ms['gzip']:>8.3f} {cpu_ms['br']:>8.3f} {wire:>8}"
+            )
@@ -0,0 +1,84 @@
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.test import Client
+
+from accounts.views import connection_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-request latency of an endpoint when every request opens a "
+        "fresh database connection versus the configured reuse mode "
+        "(DB_CONN_MAX_AGE / DB_CONN_HEALTH_CHECKS or DB_POOL)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=300, help='Requests per mode.')
+        parser.add_argument('--path', default='/api/health/', help='Endpoint to hit.')
+        parser.add_argument('--user', help='Username to log in as, e.g. to benchmark /api/profile/.')
+
+    def handle(self, *args, **options):
+        client = Client()
+        if options['user']:
+            try:
+                client.force_login(User.objects.get(username=options['user']))
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['user']!r} does not exist")
+
+        connection = connections['default']
+        settings_dict = connection.settings_dict
+        configured_max_age = settings_dict.get('CONN_MAX_AGE', 0)
+        pool_options = settings_dict['OPTIONS'].get('pool')
+        configured_label = (
+            f"pooled (max_size={pool_options.get('max_size')})" if pool_options
+            else f"persistent (CONN_MAX_AGE={configured_max_age}, "
+                 f"health checks={settings_dict.get('CONN_HEALTH_CHECKS')})"
+        )
+
+        results = []
+        try:
+            # Baseline: what the project did before, a new connection per request.
+            connection.close()
+            settings_dict['CONN_MAX_AGE'] = 0
+            settings_dict['OPTIONS'].pop('pool', None)
+            results.append(('fresh connection', self._run(client, options['path'], options['requests'])))
+
+            connection.close()
+            settings_dict['CONN_MAX_AGE'] = configured_max_age
+            if pool_options:
+                settings_dict['OPTIONS']['pool'] = pool_options
+            results.append((configured_label, self._run(client, options['path'], options['requests'])))
+        finally:
+            connection.close()
+            settings_dict['CONN_MAX_AGE'] = configured_max_age
+            if pool_options:
+                settings_dict['OPTIONS']['pool'] = pool_options
+
+        self.stdout.write(f"{options['requests']} x GET {options['path']}")
+        self.stdout.write(f"{'mode':<60} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8}")
+        for label, timings in results:
+            p95 = statistics.quantiles(timings, n=20)[18] if len(timings) > 1 else timings[0]
+            self.stdout.write(
+                f"{label:<60} {statistics.median(timings):>8.2f} {p95:>8.2f} {statistics.fmean(timings):>8.2f}"
+            )
+        if pool_options:
+            self.stdout.write(f"pool stats: {connection_stats()['pool']}")
+
+    def _run(self, client, path, count):
+        # The test client keeps close_old_connections() away from its request
+        # signals, so call it the way the real request handler does.
+        client.get(path)
+        close_old_connections()
+        timings = []
+        for _ in range(count):
+            start = time.perf_counter()
+            response = client.get(path)
+            close_old_connections()
+            timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 500:
+                raise CommandError(f"{path} returned {response.status_code}")
+        return timings
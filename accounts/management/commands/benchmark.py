@@ -0,0 +1,211 @@
+import datetime
+import hashlib
+import json
+import logging
+import statistics
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from accounts import swr
+from accounts.dataset import DatasetGenerator
+from accounts.models import BestOffer, Product, SupplierInventory, SupplierProfile, VendorProfile
+from accounts.pricing import PRICES_SCOPE
+from accounts.versioning import CATALOG_SCOPE, bump_version, inventory_scope, orders_scope, profile_scope
+
+ROUTES = [
+    'product-list', 'order-list', 'create-order', 'profile-api', 'supplier-dashboard-api', 'supplier-inventory-api',
+    'supplier-inventory-update-api', 'supplier-inventory-add-api', 'supplier-inventory-delete-api',
+]
+DEFAULT_SCALES = [0.1, 0.5, 1.0]
+DEFAULT_BASELINE = settings.BASE_DIR / 'benchmarks' / 'baselines.json'
+# Fixed, so that every run benchmarks the same data.
+END_DATE = datetime.date(2025, 6, 30)
+# Latency is gated on the median, which is stable over a few dozen requests,
+# and only differences above this many milliseconds count.
+MIN_LATENCY_DELTA_MS = 5.0
+# Everything in-process: no Redis, and no snapshot files written into static/.
+BENCHMARK_SETTINGS = {
+    'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    'CATALOG_SNAPSHOTS': False,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the API routes through the test client against generated datasets of increasing size, "
+        "in a throwaway test database. Reports latency percentiles, queries and peak Python memory per "
+        "request, and fails if a route regressed beyond --tolerance from the baselines stored in "
+        "benchmarks/baselines.json (per database vendor and scale). Redis isn't needed: the cache is "
+        "swapped for a local-memory one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', type=float, nargs='+', default=DEFAULT_SCALES,
+                            help='generate_dataset scales to benchmark, smallest first.')
+        parser.add_argument('--routes', nargs='+', choices=ROUTES, default=ROUTES)
+        parser.add_argument('--requests', type=int, default=30, help='Timed requests per route and scale.')
+        parser.add_argument('--warmup', type=int, default=3, help='Untimed requests before timing.')
+        parser.add_argument('--tolerance', type=float, default=0.5,
+                            help='Allowed relative increase of median latency and peak memory.')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+        parser.add_argument('--update-baseline', action='store_true',
+                            help='Store the results as the new baselines instead of comparing.')
+
+    def handle(self, *args, **options):
+        scales = sorted(options['scales'])
+        results = {}
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        # Without Redis every order event fails to publish; that's expected here.
+        events_logger = logging.getLogger('accounts.events')
+        events_level = events_logger.level
+        events_logger.setLevel(logging.ERROR)
+        try:
+            with override_settings(**BENCHMARK_SETTINGS):
+                generated = 0.0
+                for seed, scale in enumerate(scales):
+                    # Each dataset is the previous one plus the difference.
+                    DatasetGenerator(scale - generated, seed=seed, end_date=END_DATE).generate()
+                    generated = scale
+                    self._prepare()
+                    results[f"{scale:g}"] = {
+                        route: self._measure(route, options['requests'], options['warmup'])
+                        for route in options['routes']
+                    }
+                    self._report(scale, results[f"{scale:g}"])
+        finally:
+            events_logger.setLevel(events_level)
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        path = options['baseline']
+        try:
+            with open(path) as f:
+                baselines = json.load(f)
+        except FileNotFoundError:
+            baselines = {}
+        if options['update_baseline']:
+            for scale, routes in results.items():
+                baselines.setdefault(connection.vendor, {}).setdefault(scale, {}).update(routes)
+            with open(path, 'w') as f:
+                json.dump(baselines, f, indent=2, sort_keys=True)
+                f.write('\n')
+            self.stdout.write(self.style.SUCCESS(f"Baselines written to {path}"))
+            return
+
+        regressions = self._compare(baselines.get(connection.vendor, {}), results, options['tolerance'])
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(regression))
+        if regressions:
+            raise CommandError(f"{len(regressions)} regression(s) against {path}")
+        self.stdout.write(self.style.SUCCESS("No regressions."))
+
+    def _prepare(self):
+        """Log in as the busiest vendor and supplier of the current dataset."""
+        vendor = VendorProfile.objects.annotate(n=Count('orders')).order_by('-n', 'id').first()
+        supplier = SupplierProfile.objects.annotate(n=Count('inventory')).order_by('-n', 'id').first()
+        self.clients = {'vendor': Client(), 'supplier': Client()}
+        self.clients['vendor'].force_login(vendor.user)
+        self.clients['supplier'].force_login(supplier.user)
+        self.vendor, self.supplier = vendor, supplier
+        self.product_id = BestOffer.objects.filter(best_price__isnull=False).order_by('product_id').first().product_id
+        self.item_id = supplier.inventory.order_by('id').first().id
+        self.counter = 0
+
+    def _request(self, route):
+        """(client, method, path, JSON body) for one request; any setup it needs happens here, untimed."""
+        self.counter += 1
+        n = self.counter
+        if route in ('product-list', 'order-list', 'profile-api'):
+            return self.clients['vendor'], 'get', reverse(route), None
+        if route == 'create-order':
+            return self.clients['vendor'], 'post', reverse(route), {'cart': [{'id': self.product_id, 'quantity': 2}]}
+        if route in ('supplier-dashboard-api', 'supplier-inventory-api'):
+            return self.clients['supplier'], 'get', reverse(route), None
+        if route == 'supplier-inventory-update-api':
+            return self.clients['supplier'], 'post', reverse(route), {'id': self.item_id, 'stock_quantity': 100 + n}
+        # Names that match nothing in the catalog, so every add creates a product.
+        name = f"Bench {hashlib.sha1(str(n).encode()).hexdigest()[:12]} Masala (1kg)"
+        if route == 'supplier-inventory-add-api':
+            return self.clients['supplier'], 'post', reverse(route), {
+                'name': name, 'category': 'Spice', 'price': 250, 'stock_quantity': 10}
+        product = Product.objects.create(name=name, price=250, rating=0, rating_count=0, category='Spice',
+                                         image='', supplier=self.supplier.organization_name,
+                                         supplier_profile=self.supplier, supplier_image='', description='')
+        item = SupplierInventory.objects.create(supplier=self.supplier, product=product, stock_quantity=10)
+        return self.clients['supplier'], 'delete', reverse(route, args=[item.id]), None
+
+    def _invalidate_caches(self):
+        """Make the cached catalog, price tables, dashboard aggregates and per-user data stale."""
+        for scope in (CATALOG_SCOPE, PRICES_SCOPE, orders_scope(self.vendor.user_id),
+                      profile_scope(self.vendor.user_id), profile_scope(self.supplier.user_id),
+                      inventory_scope(self.supplier.user_id)):
+            bump_version(scope)
+        swr.invalidate('supplier-stats', self.supplier.id)
+        swr.invalidate('supplier-categories', self.supplier.id)
+
+    def _send(self, route):
+        client, method, path, body = self._request(route)
+        start = time.perf_counter()
+        if body is None:
+            response = getattr(client, method)(path)
+        else:
+            response = getattr(client, method)(path, body, content_type='application/json')
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code >= 400:
+            raise CommandError(f"{method.upper()} {path} returned {response.status_code}: {response.content[:200]}")
+        return elapsed
+
+    def _measure(self, route, requests, warmup):
+        for _ in range(warmup):
+            self._send(route)
+        timings = [self._send(route) for _ in range(max(2, requests))]
+        # Queries and memory come from one extra request, as tracing slows it
+        # down. It runs cold, so cached responses don't hide what they cost.
+        self._invalidate_caches()
+        tracemalloc.start()
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                self._send(route)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        percentiles = statistics.quantiles(timings, n=100)
+        return {
+            'p50_ms': round(percentiles[49], 2),
+            'p95_ms': round(percentiles[94], 2),
+            'p99_ms': round(percentiles[98], 2),
+            'queries': len(queries),
+            'peak_kb': round(peak / 1024, 1),
+        }
+
+    def _report(self, scale, routes):
+        self.stdout.write(f"scale {scale:g}")
+        self.stdout.write(f"  {'route':<32} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'peak KB':>9}")
+        for route, m in routes.items():
+            self.stdout.write(f"  {route:<32} {m['p50_ms']:>8.2f} {m['p95_ms']:>8.2f} {m['p99_ms']:>8.2f} "
+                              f"{m['queries']:>8} {m['peak_kb']:>9.1f}")
+
+    def _compare(self, baselines, results, tolerance):
+        regressions = []
+        for scale, routes in results.items():
+            for route, measured in routes.items():
+                baseline = baselines.get(scale, {}).get(route)
+                if baseline is None:
+                    self.stdout.write(self.style.WARNING(f"No baseline for {route} at scale {scale}"))
+                    continue
+                if measured['queries'] > baseline['queries']:
+                    regressions.append(f"{route} at scale {scale}: {measured['queries']} queries, "
+                                       f"baseline {baseline['queries']}")
+                for metric, floor in (('p50_ms', MIN_LATENCY_DELTA_MS), ('peak_kb', 0)):
+                    if measured[metric] > max(baseline[metric] * (1 + tolerance), baseline[metric] + floor):
+                        regressions.append(f"{route} at scale {scale}: {metric} {measured[metric]}, "
+                                           f"baseline {baseline[metric]} (+{tolerance:.0%} allowed)")
+        return regressions
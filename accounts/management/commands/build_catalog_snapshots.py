@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from accounts.snapshots import build_snapshots, snapshot_dir, watch
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the precompressed, content-hashed catalog snapshots and their manifest "
+        "under STATIC_ROOT. Run on deploy, and keep a --watch process running (with "
+        "CATALOG_SNAPSHOTS on) to rebuild them after catalog writes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--watch', action='store_true',
+                            help='After the first build, rebuild whenever catalog writes flag the snapshots.')
+
+    def handle(self, *args, **options):
+        self.report(build_snapshots())
+        if options['watch']:
+            watch(log=self.report)
+
+    def report(self, manifest):
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {manifest['count']} products in {len(manifest['categories'])} categories to {snapshot_dir()}"
+        ))
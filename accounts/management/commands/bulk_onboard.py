@@ -0,0 +1,40 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.onboarding import CHUNK_SIZE, PROFILE_FIELDS, bulk_onboard
+
+
+class Command(BaseCommand):
+    help = (
+        "Create vendor and supplier accounts from a CSV file (columns: email, user_type, password, "
+        "first_name, last_name and profile fields). Rows without a password become invite-only accounts. "
+        f"Vendor fields: {', '.join(PROFILE_FIELDS['vendor'])}. "
+        f"Supplier fields: {', '.join(PROFILE_FIELDS['supplier'])}."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', help="CSV file to read, or - for standard input.")
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Rows per insert transaction.')
+        parser.add_argument('--workers', type=int, help='Password hashing processes (default: one per core).')
+
+    def handle(self, *args, **options):
+        log = self.stdout.write if options['verbosity'] > 1 else None
+        if options['csv_path'] == '-':
+            report = bulk_onboard(sys.stdin, options['chunk_size'], options['workers'], log)
+        else:
+            try:
+                with open(options['csv_path'], newline='', encoding='utf-8-sig') as csv_file:
+                    report = bulk_onboard(csv_file, options['chunk_size'], options['workers'], log)
+            except FileNotFoundError:
+                raise CommandError(f"{options['csv_path']} does not exist")
+
+        for line, email in sorted(report.duplicates):
+            self.stdout.write(self.style.WARNING(f"Line {line}: {email} is already registered, skipped"))
+        for line, reason in report.invalid:
+            self.stdout.write(self.style.ERROR(f"Line {line}: {reason}, skipped"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {report.created['vendor']} vendors and {report.created['supplier']} suppliers "
+            f"({report.invites} invite-only); {len(report.duplicates)} duplicates and "
+            f"{len(report.invalid)} invalid rows skipped."
+        ))
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+
+from accounts.dedupe import MATCH_THRESHOLD, duplicate_groups, merge_products, reindex
+from accounts.models import Product
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge duplicate catalog products into their oldest (canonical) copy, moving "
+        "supplier inventory across. Also indexes products saved before name matching existed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=float, default=MATCH_THRESHOLD,
+                            help='Minimum name similarity (0-1) for near-duplicates.')
+        parser.add_argument('--dry-run', action='store_true', help='Report duplicate groups without merging.')
+        parser.add_argument('--reindex', action='store_true', help='Recompute the name index for every product.')
+
+    def handle(self, *args, **options):
+        unindexed = Product.objects.order_by('id').only('id', 'name')
+        if not options['reindex']:
+            unindexed = unindexed.filter(name_hash='')
+        last_id, indexed = 0, 0
+        while batch := list(unindexed.filter(id__gt=last_id)[:BATCH_SIZE]):
+            reindex(batch)
+            indexed += len(batch)
+            last_id = batch[-1].id
+        if indexed:
+            self.stdout.write(f"Indexed {indexed} product names.")
+
+        names = {}
+        rows = []
+        for product_id, name, category in Product.objects.values_list('id', 'name', 'category').iterator(BATCH_SIZE):
+            names[product_id] = name
+            rows.append((product_id, name, category))
+        groups = duplicate_groups(rows, options['threshold'])
+
+        duplicates = 0
+        for canonical_id, duplicate_ids in groups.items():
+            duplicates += len(duplicate_ids)
+            if options['verbosity'] > 1 or options['dry_run']:
+                self.stdout.write(f"{names[canonical_id]!r} <- {[names[i] for i in duplicate_ids]!r}")
+            if not options['dry_run']:
+                merge_products(canonical_id, duplicate_ids)
+
+        verb = 'Found' if options['dry_run'] else 'Merged'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {duplicates} duplicates of {len(groups)} products out of {len(rows)}."
+        ))
@@ -0,0 +1,34 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.dataset import SCALE_UNIT, DatasetGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a deterministic, production-shaped dataset for load and capacity testing: per unit of --scale "
+        + ", ".join(f"{count} {name.replace('_', ' ')}" for name, count in SCALE_UNIT.items())
+        + ". Every account's password is --password."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help='Multiplier for the row counts.')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; also part of every generated username.')
+        parser.add_argument('--end-date', type=datetime.date.fromisoformat,
+                            help='Date of the newest orders, YYYY-MM-DD (default: today).')
+        parser.add_argument('--password', default='loadtest')
+
+    def handle(self, *args, **options):
+        if options['scale'] <= 0:
+            raise CommandError("--scale must be positive")
+        if User.objects.filter(username__startswith=f"vendor-{options['seed']}-").exists():
+            raise CommandError(f"A dataset with seed {options['seed']} already exists; pick another --seed")
+        generator = DatasetGenerator(options['scale'], options['seed'], options['end_date'], options['password'],
+                                     log=self.stdout.write if options['verbosity'] > 1 else None)
+        counts = generator.generate()
+        self.stdout.write(self.style.SUCCESS(
+            "Generated " + ", ".join(f"{count} {name.replace('_', ' ')}" for name, count in counts.items())
+            + f". Log in as vendor-{options['seed']}-0@example.com or supplier-{options['seed']}-0@example.com."
+        ))
@@ -0,0 +1,90 @@
+import http.client
+import statistics
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+DEFAULT_PATHS = ['/api/products/', '/api/orders/', '/api/profile/']
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer a running server with concurrent GETs and report throughput and "
+        "latency percentiles. Compare the WSGI and ASGI paths by running it "
+        "against, e.g., `gunicorn vendor_project.wsgi -w 4 --threads 8` with "
+        "ASYNC_API_VIEWS=False and `uvicorn vendor_project.asgi:application "
+        "--workers 4` with ASYNC_API_VIEWS=True, at the same --concurrency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='Base URL of the server.')
+        parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS, help='Paths to cycle through.')
+        parser.add_argument('--concurrency', type=int, default=200)
+        parser.add_argument('--requests', type=int, default=5000, help='Total requests.')
+        parser.add_argument('--user', help='Log in as this user (a vendor for the default paths).')
+
+    def handle(self, *args, **options):
+        base = urlsplit(options['url'])
+        headers = {'Connection': 'keep-alive'}
+        if options['user']:
+            # Sessions live in the shared cache, so one made here is valid on the server.
+            client = Client()
+            try:
+                client.force_login(User.objects.get(username=options['user']))
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['user']!r} does not exist")
+            headers['Cookie'] = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+        paths = options['paths']
+        total = options['requests']
+        counter = iter(range(total))
+        lock = threading.Lock()
+        timings = []
+        statuses = Counter()
+
+        def worker():
+            connection = http.client.HTTPConnection(base.hostname, base.port or 80, timeout=60)
+            while True:
+                with lock:
+                    index = next(counter, None)
+                if index is None:
+                    break
+                path = paths[index % len(paths)]
+                start = time.perf_counter()
+                try:
+                    connection.request('GET', path, headers=headers)
+                    response = connection.getresponse()
+                    response.read()
+                    outcome = response.status
+                except (OSError, http.client.HTTPException) as e:
+                    connection.close()
+                    connection = http.client.HTTPConnection(base.hostname, base.port or 80, timeout=60)
+                    outcome = type(e).__name__
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    timings.append(elapsed)
+                    statuses[outcome] += 1
+            connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(options['concurrency'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        percentiles = statistics.quantiles(timings, n=100)
+        self.stdout.write(f"{total} requests, concurrency {options['concurrency']}, {wall:.2f}s")
+        self.stdout.write(f"throughput: {total / wall:.1f} req/s")
+        self.stdout.write(
+            f"latency ms: p50 {percentiles[49]:.1f}  p95 {percentiles[94]:.1f}  "
+            f"p99 {percentiles[98]:.1f}  max {max(timings):.1f}"
+        )
+        self.stdout.write(f"responses: {dict(statuses)}")
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from accounts.partitions import (
+    PARTITIONED_MODELS, ArchiveError, add_months, archive_partition, close_months, ensure_partitions, partition_months,
+    this_month,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Roll up the supplier order totals of closed months, create the monthly order partitions for the "
+        "months ahead (and for any month that landed in a default partition), and with --archive move months "
+        "older than --archive-after-months to Parquet files under ORDER_ARCHIVE_DIR. Run daily; everything "
+        "but the rollup needs PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=settings.ORDER_PARTITIONS_AHEAD)
+        parser.add_argument('--archive', action='store_true', help='Also archive and drop old partitions.')
+        parser.add_argument('--archive-after-months', type=int, default=settings.ORDER_ARCHIVE_AFTER_MONTHS)
+        parser.add_argument('--force', action='store_true', help='Archive months that still have orders in progress.')
+
+    def handle(self, *args, **options):
+        for month in close_months():
+            self.stdout.write(f"Rolled up the shared orders of {month:%Y-%m}")
+        if connection.vendor != 'postgresql':
+            if options['archive']:
+                raise CommandError("Order partitions need PostgreSQL")
+            return
+        for name in ensure_partitions(options['months_ahead']):
+            self.stdout.write(f"Created {name}")
+        if not options['archive']:
+            return
+        if options['archive_after_months'] < 2:
+            raise CommandError("--archive-after-months must be at least 2")
+        cutoff = add_months(this_month(), -options['archive_after_months'])
+        failed = 0
+        for model in PARTITIONED_MODELS:
+            for month in partition_months(model):
+                if month >= cutoff:
+                    break
+                try:
+                    path = archive_partition(model, month, force=options['force'])
+                except ArchiveError as e:
+                    failed += 1
+                    self.stderr.write(str(e))
+                else:
+                    self.stdout.write(f"Archived {model._meta.db_table} {month:%Y-%m} to {path}")
+        if failed:
+            raise CommandError(f"{failed} partition(s) not archived")
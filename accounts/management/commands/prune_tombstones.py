@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from accounts.changes import TOMBSTONE_RETENTION, prune_tombstones
+
+
+class Command(BaseCommand):
+    help = f"Delete product tombstones older than {TOMBSTONE_RETENTION.days} days. Run it daily from cron."
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(f"Pruned {prune_tombstones()} tombstones."))
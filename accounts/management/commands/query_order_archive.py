@@ -0,0 +1,37 @@
+import csv
+import datetime
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import Order, SharedOrder
+from accounts.partitions import read_archive
+
+MODELS = {'order': Order, 'sharedorder': SharedOrder}
+
+
+class Command(BaseCommand):
+    help = "Print archived orders (see maintain_order_partitions --archive) as CSV or JSON lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=MODELS)
+        parser.add_argument('--from', dest='start', type=datetime.date.fromisoformat, help='YYYY-MM-DD, inclusive.')
+        parser.add_argument('--to', dest='end', type=datetime.date.fromisoformat, help='YYYY-MM-DD, inclusive.')
+        parser.add_argument('--vendor', type=int, help='VendorProfile id.')
+        parser.add_argument('--supplier', type=int, help='SupplierProfile id (sharedorder only).')
+        parser.add_argument('--format', choices=['csv', 'json'], default='csv')
+
+    def handle(self, *args, **options):
+        model = MODELS[options['model']]
+        if options['supplier'] is not None and model is Order:
+            raise CommandError("--supplier only applies to sharedorder")
+        values = {f"{name}_id": options[name] for name in ('vendor', 'supplier') if options[name] is not None}
+        orders = read_archive(model, options['start'], options['end'], **values)
+        fields = [field.attname for field in model._meta.concrete_fields]
+        if options['format'] == 'csv':
+            writer = csv.writer(self.stdout)
+            writer.writerow(fields)
+            writer.writerows([getattr(order, name) for name in fields] for order in orders)
+        else:
+            for order in orders:
+                self.stdout.write(json.dumps({name: getattr(order, name) for name in fields}, default=str))
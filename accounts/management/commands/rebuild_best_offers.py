@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from accounts.offers import REBUILD_BATCH_SIZE, rebuild_best_offers
+
+
+class Command(BaseCommand):
+    help = "Recompute the BestOffer row of every product (run once after migrating, or to repair drift)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=REBUILD_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        count = rebuild_best_offers(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Refreshed best offers for {count} products."))
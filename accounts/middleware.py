@@ -0,0 +1,94 @@
+import os
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.responders import MissingFileError
+
+from . import routers
+from .compression import compress_response
+from .snapshots import MANIFEST_NAME, snapshot_dir, snapshot_url
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let safe requests read from replicas and pin clients to the primary for a
+    short window after they write. See accounts.routers.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = routers.begin_request(request)
+        response = None
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.end_request(token, request, response)
+        return response
+
+    async def __acall__(self, request):
+        token = routers.begin_request(request)
+        response = None
+        try:
+            response = await self.get_response(request)
+        finally:
+            routers.end_request(token, request, response)
+        return response
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Brotli/gzip per Accept-Encoding for the API and page responses. See
+    accounts.compression for what is and isn't compressed.
+    """
+
+    def process_response(self, request, response):
+        return compress_response(request, response)
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise for STATIC_ROOT, plus the catalog snapshots (accounts.snapshots).
+    Those are written after startup, so they are looked up on disk per request
+    instead of from the index WhiteNoise builds when it starts; the content
+    hashed files are immutable, the manifest must always be revalidated.
+    """
+
+    def __init__(self, get_response=None, settings=settings):
+        # Set before WhiteNoise indexes STATIC_ROOT, which calls the hooks below.
+        self.snapshot_prefix = urlsplit(snapshot_url('')).path
+        self.snapshot_root = os.path.join(snapshot_dir(), '')
+        super().__init__(get_response, settings=settings)
+        self.files = {url: file for url, file in self.files.items() if not url.startswith(self.snapshot_prefix)}
+
+    def __call__(self, request):
+        url = request.path_info
+        if url.startswith(self.snapshot_prefix) and self.url_is_canonical(url):
+            path = os.path.join(self.snapshot_root, url[len(self.snapshot_prefix):])
+            if self.path_is_child_of(path, self.snapshot_root):
+                try:
+                    return self.serve(self.find_file_at_path(path, url), request)
+                except MissingFileError:
+                    pass
+        return super().__call__(request)
+
+    def add_cache_headers(self, headers, path, url):
+        if url == f"{self.snapshot_prefix}{MANIFEST_NAME}":
+            headers['Cache-Control'] = 'no-cache'
+        else:
+            super().add_cache_headers(headers, path, url)
+
+    def immutable_file_test(self, path, url):
+        if url.startswith(self.snapshot_prefix):
+            return True  # snapshot names carry their content hash; the manifest is handled above
+        return super().immutable_file_test(path, url)
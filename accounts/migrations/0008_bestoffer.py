@@ -0,0 +1,61 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce
+
+
+def build_best_offers(apps, schema_editor):
+    # accounts.offers.rebuild_best_offers against the historical models, so
+    # the table is filled on deploy; `manage.py rebuild_best_offers` redoes it.
+    Product = apps.get_model('accounts', 'Product')
+    BestOffer = apps.get_model('accounts', 'BestOffer')
+    SupplierInventory = apps.get_model('accounts', 'SupplierInventory')
+    offers = (
+        SupplierInventory.objects
+        .filter(product=OuterRef('pk'), stock_quantity__gt=0)
+        .annotate(effective_price=Coalesce(
+            'custom_price', Cast(F('product__price'), DecimalField(max_digits=10, decimal_places=2))
+        ))
+        .order_by('effective_price', 'id')
+    )
+    last_id = 0
+    while True:
+        rows = list(
+            Product.objects.filter(id__gt=last_id).order_by('id')
+            .annotate(
+                total_stock=Coalesce(Sum('supplier_inventories__stock_quantity'), Value(0)),
+                best_price=Subquery(offers.values('effective_price')[:1]),
+                best_supplier_id=Subquery(offers.values('supplier_id')[:1]),
+            )
+            .values_list('id', 'total_stock', 'best_price', 'best_supplier_id')[:1000]
+        )
+        if not rows:
+            return
+        BestOffer.objects.bulk_create([
+            BestOffer(product_id=product_id, total_stock=total_stock, best_price=best_price, supplier_id=supplier_id)
+            for product_id, total_stock, best_price, supplier_id in rows
+        ])
+        last_id = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_alter_supplierprofile_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BestOffer',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='best_offer', serialize=False, to='accounts.product')),
+                ('best_price', models.DecimalField(blank=True, db_index=True, decimal_places=2, max_digits=10, null=True)),
+                ('total_stock', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('supplier', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='accounts.supplierprofile')),
+            ],
+        ),
+        migrations.RunPython(build_best_offers, migrations.RunPython.noop),
+    ]
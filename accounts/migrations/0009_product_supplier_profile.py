@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from accounts.backfill import backfill_product_suppliers
+
+
+def backfill(apps, schema_editor):
+    backfill_product_suppliers(apps.get_model('accounts', 'Product'), apps.get_model('accounts', 'SupplierProfile'))
+
+
+class Migration(migrations.Migration):
+    # The backfill commits batch by batch; rerun it with `manage.py
+    # backfill_product_suppliers` if it is interrupted.
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0008_bestoffer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='supplier_profile',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='products', to='accounts.supplierprofile'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-19 17:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_product_supplier_profile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='name_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=40),
+        ),
+        migrations.CreateModel(
+            name='ProductNameBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField(db_index=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='name_buckets', to='accounts.product')),
+            ],
+        ),
+    ]
@@ -0,0 +1,64 @@
+from django.db import migrations
+
+# Trigram indexes for the admin's search fields (see accounts.admin). Django
+# runs icontains as UPPER(column::text) LIKE UPPER('%term%') on PostgreSQL, so
+# the indexes are on exactly that expression. PostgreSQL only; other
+# databases keep searching with table scans.
+SEARCH_COLUMNS = [
+    ('auth_user', 'username'),
+    ('auth_user', 'email'),
+    ('auth_user', 'first_name'),
+    ('auth_user', 'last_name'),
+    ('accounts_vendorprofile', 'company_name'),
+    ('accounts_vendorprofile', 'phone'),
+    ('accounts_vendorprofile', 'gst_number'),
+    ('accounts_supplierprofile', 'organization_name'),
+    ('accounts_supplierprofile', 'contact_person'),
+    ('accounts_supplierprofile', 'phone'),
+    ('accounts_supplierprofile', 'gst_number'),
+    ('accounts_supplierprofile', 'pan_number'),
+    ('accounts_product', 'name'),
+    ('accounts_product', 'supplier'),
+    ('accounts_order', 'order_id'),
+    ('accounts_order', 'customer'),
+    ('accounts_order', 'item_name'),
+    ('accounts_sharedorder', 'order_id'),
+    ('accounts_sharedorder', 'item_name'),
+]
+
+
+def _index_name(table, column):
+    return f"{table}_{column}_upper_trgm"
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, column in SEARCH_COLUMNS:
+        # CONCURRENTLY keeps the tables writable while the index builds.
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{_index_name(table, column)}" '
+            f'ON "{table}" USING gin ((UPPER("{column}"::text)) gin_trgm_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, column in SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{_index_name(table, column)}"')
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('accounts', '0011_catalog_change_tracking'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,170 @@
+import datetime
+
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+# Rebuilds the order tables as monthly range partitions (see
+# accounts.partitions). PostgreSQL only; the rows are copied across, so this
+# holds a lock on each table while it runs. The DDL helpers are copied from
+# accounts.partitions as they were, so later changes there can't alter this
+# migration.
+MODELS = ['Order', 'SharedOrder']
+PARTITION_KEY = 'date'
+
+
+def add_months(month, count):
+    years, index = divmod(month.month - 1 + count, 12)
+    return datetime.date(month.year + years, index + 1, 1)
+
+
+def this_month():
+    return timezone.localdate().replace(day=1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y%m}"
+
+
+def default_partition(table):
+    return f"{table}_default"
+
+
+def is_partitioned(cursor, table):
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))", [table])
+    return cursor.fetchone()[0]
+
+
+def create_partition(cursor, table, month):
+    """
+    Attach the partition of table for month, unless it exists. Rows of that
+    month sitting in the DEFAULT partition are moved into it first, as
+    PostgreSQL won't attach a partition for rows the default one still holds.
+    """
+    qn = cursor.db.ops.quote_name
+    name = partition_name(table, month)
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+    if cursor.fetchone()[0]:
+        return False
+    start, end = month, add_months(month, 1)
+    cursor.execute(f"CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {qn(default_partition(table))} "
+        f"WHERE {PARTITION_KEY} >= %s AND {PARTITION_KEY} < %s RETURNING *) "
+        f"INSERT INTO {qn(name)} SELECT * FROM moved",
+        [start, end],
+    )
+    cursor.execute(
+        f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} FOR VALUES FROM ('{start}') TO ('{end}')"
+    )
+    return True
+
+
+def _indexes_and_foreign_keys(cursor, table):
+    """CREATE INDEX statements (except the primary key's) and (name, definition) of the foreign keys of table."""
+    cursor.execute(
+        "SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i WHERE i.indrelid = %s::regclass "
+        "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid "
+        "AND c.conrelid = i.indrelid AND c.contype IN ('p', 'u', 'x'))",
+        [table],
+    )
+    indexes = [row[0] for row in cursor.fetchall()]
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+        [table],
+    )
+    return indexes, cursor.fetchall()
+
+
+def _restore_indexes_and_foreign_keys(cursor, table, indexes, foreign_keys):
+    qn = cursor.db.ops.quote_name
+    for sql in indexes:
+        cursor.execute(sql)
+    for name, definition in foreign_keys:
+        cursor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}")
+
+
+def _set_aside(cursor, table, new_name):
+    """Rename table and its primary key, freeing both names for the rebuilt table."""
+    qn = cursor.db.ops.quote_name
+    cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(new_name)}")
+    cursor.execute("SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'", [new_name])
+    (primary_key,), = cursor.fetchall()
+    cursor.execute(f"ALTER TABLE {qn(new_name)} RENAME CONSTRAINT {qn(primary_key)} TO {qn(f'{new_name}_pkey')}")
+
+
+def partition_table(cursor, table, months_ahead):
+    """Rebuild table as a partitioned table with the same rows, indexes and foreign keys."""
+    qn = cursor.db.ops.quote_name
+    old, sequence = f"{table}_unpartitioned", f"{table}_id_seq"
+    indexes, foreign_keys = _indexes_and_foreign_keys(cursor, table)
+    _set_aside(cursor, table, old)
+    cursor.execute(f"ALTER SEQUENCE {qn(sequence)} RENAME TO {qn(f'{old}_id_seq')}")
+    cursor.execute(
+        f"CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f"PARTITION BY RANGE ({PARTITION_KEY})"
+    )
+    # Identity columns on partitioned tables need PostgreSQL 17; a sequence
+    # owned by the column works everywhere (and for pg_get_serial_sequence).
+    cursor.execute(f"CREATE SEQUENCE {qn(sequence)} OWNED BY {qn(table)}.id")
+    cursor.execute(f"SELECT setval('{sequence}', COALESCE((SELECT MAX(id) FROM {qn(old)}), 0) + 1, false)")
+    cursor.execute(f"ALTER TABLE {qn(table)} ALTER COLUMN id SET DEFAULT nextval('{sequence}'::regclass)")
+    cursor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(f'{table}_pkey')} PRIMARY KEY (id, {PARTITION_KEY})")
+    cursor.execute(f"CREATE TABLE {qn(default_partition(table))} PARTITION OF {qn(table)} DEFAULT")
+
+    cursor.execute(f"SELECT DISTINCT date_trunc('month', {PARTITION_KEY})::date FROM {qn(old)}")
+    months = {row[0] for row in cursor.fetchall()}
+    months.update(add_months(this_month(), count) for count in range(months_ahead + 1))
+    for month in sorted(months):
+        create_partition(cursor, table, month)
+    cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(old)}")
+    cursor.execute(f"DROP TABLE {qn(old)}")
+    _restore_indexes_and_foreign_keys(cursor, table, indexes, foreign_keys)
+
+
+def unpartition_table(cursor, table):
+    """Turn table back into a plain table with an identity id. Archived months stay archived."""
+    qn = cursor.db.ops.quote_name
+    old = f"{table}_partitioned"
+    indexes, foreign_keys = _indexes_and_foreign_keys(cursor, table)
+    _set_aside(cursor, table, old)
+    cursor.execute(f"CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING CONSTRAINTS)")
+    cursor.execute(f"INSERT INTO {qn(table)} SELECT * FROM {qn(old)}")
+    cursor.execute(f"DROP TABLE {qn(old)}")  # with its partitions and sequence
+    cursor.execute(f"ALTER TABLE {qn(table)} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY")
+    cursor.execute(f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 0) + 1, false) "
+                   f"FROM {qn(table)}", [table])
+    cursor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(f'{table}_pkey')} PRIMARY KEY (id)")
+    _restore_indexes_and_foreign_keys(cursor, table, indexes, foreign_keys)
+
+
+
+def partition(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for name in MODELS:
+            table = apps.get_model('accounts', name)._meta.db_table
+            if not is_partitioned(cursor, table):
+                partition_table(cursor, table, settings.ORDER_PARTITIONS_AHEAD)
+
+
+def unpartition(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for name in MODELS:
+            table = apps.get_model('accounts', name)._meta.db_table
+            if is_partitioned(cursor, table):
+                unpartition_table(cursor, table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_admin_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
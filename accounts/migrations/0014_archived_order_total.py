@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-19 18:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0013_partition_order_tables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrderTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('orders', models.PositiveIntegerField()),
+                ('revenue', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('supplier', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_order_totals', to='accounts.supplierprofile')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('supplier', 'month'), name='archived_order_total_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+import datetime
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+
+def roll_up_closed_months(apps, schema_editor):
+    # accounts.partitions.close_months against the historical models, so the
+    # supplier totals don't lose the months before the live window on deploy.
+    SharedOrder = apps.get_model('accounts', 'SharedOrder')
+    MonthlyOrderTotal = apps.get_model('accounts', 'MonthlyOrderTotal')
+    this_month = timezone.localdate().replace(day=1)
+    closed = (this_month - datetime.timedelta(days=1)).replace(day=1)
+    orders = SharedOrder.objects.filter(date__lt=closed)
+    latest = MonthlyOrderTotal.objects.aggregate(latest=Max('month'))['latest']
+    if latest is not None:
+        # Archived months are rolled up already.
+        orders = orders.filter(date__gte=(latest.replace(day=28) + datetime.timedelta(days=4)).replace(day=1))
+    MonthlyOrderTotal.objects.bulk_create([
+        MonthlyOrderTotal(**row) for row in
+        orders.annotate(month=TruncMonth('date')).values('supplier_id', 'month')
+        .annotate(orders=Count('id'), revenue=Sum('amount')).order_by()
+    ], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_archived_order_total'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='archivedordertotal',
+            name='archived_order_total_unique',
+        ),
+        migrations.RenameModel(
+            old_name='ArchivedOrderTotal',
+            new_name='MonthlyOrderTotal',
+        ),
+        migrations.AlterField(
+            model_name='monthlyordertotal',
+            name='supplier',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_order_totals', to='accounts.supplierprofile'),
+        ),
+        migrations.AddConstraint(
+            model_name='monthlyordertotal',
+            constraint=models.UniqueConstraint(fields=('supplier', 'month'), name='monthly_order_total_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(condition=models.Q(('progress__lt', 3)), fields=['vendor'], name='order_in_progress_idx'),
+        ),
+        migrations.RunPython(roll_up_closed_months, migrations.RunPython.noop),
+    ]
@@ -48,10 +48,7 @@ class SupplierInventory(models.Model):
     stock_quantity = models.PositiveIntegerField(default=0)
     custom_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)  # supplier-specific price
     added_on = models.DateTimeField(auto_now_add=True)
-
-    def __init__(self, *args: any, **kwargs: any):
-        super().__init__(args, kwargs)
-        self.id = None
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.product.name} - {self.supplier.organization_name}"
@@ -69,6 +66,24 @@ class SharedOrder(models.Model):
     def __str__(self):
         return f"SharedOrder {self.order_id} - {self.item_name}"
 
+
+class MonthlyOrderTotal(models.Model):
+    """
+    A supplier's shared-order count and revenue for one closed month, rolled
+    up by accounts.partitions.close_months(), so lifetime totals only
+    aggregate the latest months' orders and need no archive files.
+    """
+    supplier = models.ForeignKey(SupplierProfile, on_delete=models.CASCADE, related_name='monthly_order_totals')
+    month = models.DateField()
+    orders = models.PositiveIntegerField()
+    revenue = models.DecimalField(max_digits=14, decimal_places=2)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['supplier', 'month'], name='monthly_order_total_unique')]
+
+    def __str__(self):
+        return f"{self.supplier_id} {self.month:%Y-%m}: {self.orders} orders, {self.revenue}"
+
 # Helper function to determine user type
 def get_user_type(user):
     """Determine if user is vendor or supplier"""
@@ -96,13 +111,53 @@ class Product(models.Model):
     category = models.CharField(max_length=100)
     image = models.URLField()
     badge = models.CharField(max_length=50, blank=True)
-    supplier = models.CharField(max_length=255)
+    supplier = models.CharField(max_length=255)  # display copy of supplier_profile.organization_name
+    supplier_profile = models.ForeignKey(SupplierProfile, on_delete=models.SET_NULL, null=True, blank=True,
+                                         related_name='products')
     supplier_image = models.URLField()
     description = models.TextField()
+    name_hash = models.CharField(max_length=40, blank=True, db_index=True, editable=False)  # see accounts.dedupe
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # see accounts.changes
 
     def __str__(self):
         return self.name
 
+
+class BestOffer(models.Model):
+    """
+    Cheapest in-stock supplier offer and total stock per product, kept up to
+    date from SupplierInventory writes (see accounts.offers) so the catalog can
+    show it without scanning every supplier's inventory.
+    """
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True, related_name='best_offer')
+    best_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, db_index=True)
+    supplier = models.ForeignKey(SupplierProfile, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    total_stock = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Best offer for {self.product_id}: {self.best_price}"
+
+class ProductTombstone(models.Model):
+    """A deleted product, kept for a while so delta sync clients can drop it (see accounts.changes)."""
+    product_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Product {self.product_id} deleted at {self.deleted_at}"
+
+
+class ProductNameBucket(models.Model):
+    """
+    One row per LSH band of a product's name signature. Products sharing a
+    bucket are near-duplicate candidates (see accounts.dedupe).
+    """
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='name_buckets')
+    bucket = models.BigIntegerField(db_index=True)
+
+    def __str__(self):
+        return f"{self.product_id}: {self.bucket}"
+
 # accounts/models.py
 class Order(models.Model):
     order_id = models.CharField(max_length=20)
@@ -113,6 +168,14 @@ class Order(models.Model):
     date = models.DateField()
     vendor = models.ForeignKey(VendorProfile, on_delete=models.CASCADE, related_name='orders')
 
+    class Meta:
+        indexes = [
+            # Orders in progress show on the dashboard however old they are, so
+            # they can't be found by date; on PostgreSQL every monthly
+            # partition gets this index, which holds only its few such rows.
+            models.Index(fields=['vendor'], condition=models.Q(progress__lt=3), name='order_in_progress_idx'),
+        ]
+
     def __str__(self):
         return f"{self.order_id} - {self.item_name}"
 
@@ -0,0 +1,60 @@
+"""
+Maintenance of the BestOffer table: per product, the lowest effective price
+(custom_price, falling back to Product.price) among suppliers with stock, who
+offers it, and the stock summed across suppliers.
+"""
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce
+
+from .models import BestOffer, Product, SupplierInventory
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def _offers_for(product_ref):
+    return (
+        SupplierInventory.objects
+        .filter(product=product_ref, stock_quantity__gt=0)
+        .annotate(effective_price=Coalesce(
+            'custom_price', Cast(F('product__price'), DecimalField(max_digits=10, decimal_places=2))
+        ))
+        .order_by('effective_price', 'id')
+    )
+
+
+def refresh_best_offers(product_ids):
+    """Recompute and upsert the BestOffer rows for the given products in two queries."""
+    product_ids = list(product_ids)
+    if not product_ids:
+        return
+    offers = _offers_for(OuterRef('pk'))
+    rows = (
+        Product.objects.filter(id__in=product_ids)
+        .annotate(
+            total_stock=Coalesce(Sum('supplier_inventories__stock_quantity'), Value(0)),
+            best_price=Subquery(offers.values('effective_price')[:1]),
+            best_supplier_id=Subquery(offers.values('supplier_id')[:1]),
+        )
+        .values_list('id', 'total_stock', 'best_price', 'best_supplier_id')
+    )
+    BestOffer.objects.bulk_create(
+        [
+            BestOffer(product_id=product_id, total_stock=total_stock, best_price=best_price,
+                      supplier_id=supplier_id)
+            for product_id, total_stock, best_price, supplier_id in rows
+        ],
+        update_conflicts=True,
+        unique_fields=['product'],
+        update_fields=['total_stock', 'best_price', 'supplier', 'updated_at'],
+    )
+
+
+def rebuild_best_offers(batch_size=REBUILD_BATCH_SIZE):
+    """Refresh every product, batch by batch. Returns the number of products."""
+    last_id, count = 0, 0
+    while True:
+        ids = list(Product.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return count
+        refresh_best_offers(ids)
+        last_id, count = ids[-1], count + len(ids)
@@ -0,0 +1,128 @@
+"""
+Bulk creation of vendor and supplier accounts from a CSV file, for the
+bulk_onboard command.
+
+One row per account: email (also the username, as in signup_page), user_type
+("vendor" or "supplier"), optional password, first_name and last_name, plus any
+VendorProfile or SupplierProfile field by its model name (company_name,
+organization_name, gst_number, ...). A row without a password becomes an
+invite-only account with an unusable password, to be set through password
+reset.
+
+The file is read in chunks. Passwords are hashed in a process pool, since
+PBKDF2 is deliberately slow and a single core would take hours for a large
+network. Hashing of one chunk overlaps with inserting the previous one. Each
+chunk checks for existing accounts with one query, then inserts its users and
+profiles with bulk_create in its own transaction.
+"""
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from .models import SupplierProfile, VendorProfile
+
+CHUNK_SIZE = 1000
+PROFILE_MODELS = {'vendor': VendorProfile, 'supplier': SupplierProfile}
+_NOT_FROM_CSV = {'id', 'user', 'created_at', 'updated_at', 'is_verified'}
+PROFILE_FIELDS = {
+    user_type: [field.name for field in model._meta.concrete_fields if field.name not in _NOT_FROM_CSV]
+    for user_type, model in PROFILE_MODELS.items()
+}
+
+
+def _hash(password):
+    # make_password(None) gives an unusable password.
+    return make_password(password or None)
+
+
+def _chunks(rows, size):
+    while chunk := list(itertools.islice(rows, size)):
+        yield chunk
+
+
+def _value(row, name):
+    value = (row.get(name) or '').strip()
+    return value or None
+
+
+class Report:
+    def __init__(self):
+        self.created = {'vendor': 0, 'supplier': 0}
+        self.invites = 0
+        self.duplicates = []  # (line, email)
+        self.invalid = []  # (line, reason)
+
+
+def _accept(chunk, seen, report):
+    """The (line, row) pairs of a chunk that can be created; the rest go to the report."""
+    valid = []
+    for line, row in chunk:
+        email = _value(row, 'email')
+        user_type = (_value(row, 'user_type') or '').lower()
+        if not email:
+            report.invalid.append((line, "missing email"))
+        elif user_type not in PROFILE_MODELS:
+            report.invalid.append((line, f"user_type must be vendor or supplier, not {row.get('user_type')!r}"))
+        elif email in seen:
+            report.duplicates.append((line, email))
+        else:
+            seen.add(email)
+            row['email'], row['user_type'] = email, user_type
+            valid.append((line, row))
+    existing = set(User.objects.filter(username__in=[row['email'] for _, row in valid])
+                   .values_list('username', flat=True))
+    report.duplicates.extend((line, row['email']) for line, row in valid if row['email'] in existing)
+    return [(line, row) for line, row in valid if row['email'] not in existing]
+
+
+def _insert(rows, hashes, report):
+    users = [
+        User(username=row['email'], email=row['email'], password=password,
+             first_name=_value(row, 'first_name') or '', last_name=_value(row, 'last_name') or '')
+        for (_, row), password in zip(rows, hashes)
+    ]
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        if any(user.pk is None for user in users):  # backends that can't return ids from a bulk insert
+            ids = dict(User.objects.filter(username__in=[user.username for user in users])
+                       .values_list('username', 'id'))
+            for user in users:
+                user.pk = ids[user.username]
+        for user_type, model in PROFILE_MODELS.items():
+            profiles = [
+                model(user=user, **{name: _value(row, name) for name in PROFILE_FIELDS[user_type]})
+                for (_, row), user in zip(rows, users) if row['user_type'] == user_type
+            ]
+            model.objects.bulk_create(profiles)
+            report.created[user_type] += len(profiles)
+    report.invites += sum(1 for _, row in rows if not row.get('password'))
+
+
+def bulk_onboard(csv_file, chunk_size=CHUNK_SIZE, workers=None, log=None):
+    """Create the accounts listed in csv_file (an open text file); returns a Report."""
+    report, seen = Report(), set()
+    # Line numbers as a spreadsheet shows them: the header is line 1.
+    rows = zip(itertools.count(2), csv.DictReader(csv_file))
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        pending = None
+        for chunk in _chunks(rows, chunk_size):
+            accepted = _accept(chunk, seen, report)
+            # map() submits every password at once; the pool hashes this chunk
+            # while the previous one is inserted below.
+            hashes = pool.map(_hash, [row.get('password') for _, row in accepted],
+                              chunksize=max(1, len(accepted) // (4 * workers)))
+            if pending:
+                _insert(*pending, report)
+                if log:
+                    log(f"Up to line {pending[0][-1][0]}: {sum(report.created.values())} accounts created")
+            pending = (accepted, hashes) if accepted else None
+        if pending:
+            _insert(*pending, report)
+    return report
@@ -0,0 +1,162 @@
+"""
+Multi-supplier cart optimizer.
+
+Given cart lines (product, quantity), choose how much of each line to buy from
+which supplier so the cart costs as little as possible, subject to every
+supplier's stock_quantity and optionally to a minimum order value per supplier
+and a cap on how many suppliers are used.
+
+All candidate offers are loaded with one query into dense line x supplier
+matrices. For a given set of allowed suppliers every line is filled from its
+cheapest allowed offers first, which is optimal for that set; this fill is
+evaluated for many supplier sets at once with numpy. Without constraints the
+result is the exact optimum. Supplier caps and minimum orders make the problem
+NP-hard, so those are met by greedy supplier-set search on top of the exact fill.
+"""
+from decimal import Decimal
+
+import numpy as np
+from django.db.models import DecimalField, F
+from django.db.models.functions import Cast, Coalesce
+
+from .models import SupplierInventory
+from .pricing import CENT, PricingError
+
+
+class CartOptimizer:
+
+    def __init__(self, items):
+        quantities = {}
+        for item in items:
+            try:
+                product_id, quantity = int(item['id']), int(item.get('quantity', 1))
+            except (KeyError, TypeError, ValueError):
+                raise PricingError("Each cart line needs a numeric product id and quantity")
+            if quantity < 1:
+                raise PricingError(f"Invalid quantity for product {product_id}")
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+
+        offers = list(
+            SupplierInventory.objects
+            .filter(product_id__in=quantities, stock_quantity__gt=0)
+            .annotate(effective_price=Coalesce(
+                'custom_price', Cast(F('product__price'), DecimalField(max_digits=10, decimal_places=2))
+            ))
+            .values_list('product_id', 'supplier_id', 'stock_quantity', 'effective_price')
+        )
+
+        self.product_ids = list(quantities)
+        self.supplier_ids = sorted({supplier_id for _, supplier_id, _, _ in offers})
+        line_index = {product_id: i for i, product_id in enumerate(self.product_ids)}
+        supplier_index = {supplier_id: j for j, supplier_id in enumerate(self.supplier_ids)}
+        shape = (len(self.product_ids), len(self.supplier_ids))
+
+        self.quantity = np.array([quantities[p] for p in self.product_ids], dtype=np.int64)
+        price = np.full(shape, np.inf)
+        stock = np.zeros(shape, dtype=np.int64)
+        self.unit_prices = {}  # exact Decimal prices for the final amounts, in cents
+        for product_id, supplier_id, stock_quantity, effective_price in offers:
+            i, j = line_index[product_id], supplier_index[supplier_id]
+            # A supplier may list the same product twice; pool the stock at the cheaper price.
+            stock[i, j] += stock_quantity
+            if effective_price < price[i, j]:
+                price[i, j] = float(effective_price)
+                self.unit_prices[(product_id, supplier_id)] = Decimal(effective_price).quantize(CENT)
+
+        # Cheapest-first supplier order per line, reused by every evaluation.
+        self.order = np.argsort(price, axis=1, kind='stable')
+        self.sorted_stock = np.take_along_axis(stock, self.order, axis=1)
+        self.sorted_price = np.nan_to_num(np.take_along_axis(price, self.order, axis=1), posinf=0.0)
+
+    def _fill(self, masks):
+        """
+        Greedy cheapest-first fill for a batch of supplier masks (B x S).
+        Returns the quantities taken (B x L x S, in sorted order), cost and unfilled units per mask.
+        """
+        stock = self.sorted_stock[None, :, :] * masks[:, self.order]
+        before = stock.cumsum(axis=2) - stock
+        take = np.clip(self.quantity[None, :, None] - before, 0, stock)
+        cost = (take * self.sorted_price[None, :, :]).sum(axis=(1, 2))
+        unfilled = (self.quantity[None, :] - take.sum(axis=2)).sum(axis=1)
+        return take, cost, unfilled
+
+    def _score(self, masks):
+        _, cost, unfilled = self._fill(masks)
+        # Filling the cart matters more than any saving.
+        return unfilled * (self.sorted_price.sum() * self.quantity.sum() + 1) + cost
+
+    def _supplier_spend(self, mask):
+        take, _, _ = self._fill(mask[None, :])
+        spend = np.zeros(len(self.supplier_ids))
+        np.add.at(spend, self.order, take[0] * self.sorted_price)
+        return spend
+
+    def _cap_suppliers(self, mask, max_suppliers):
+        used = self._supplier_spend(mask) > 0
+        if used.sum() <= max_suppliers:
+            return used
+        # Shrink the set, removing the suppliers that cost least to lose. All
+        # candidate removals are scored in one batched fill per round, and up to
+        # half of the excess goes each round, so this takes O(log S) rounds.
+        chosen = used.copy()
+        while chosen.sum() > max_suppliers:
+            candidates = np.flatnonzero(chosen)
+            trial = np.repeat(chosen[None, :], len(candidates), axis=0)
+            trial[np.arange(len(candidates)), candidates] = False
+            step = max(1, (chosen.sum() - max_suppliers) // 2)
+            chosen[candidates[np.argsort(self._score(trial), kind='stable')[:step]]] = False
+        return chosen
+
+    def _enforce_minimum(self, mask, min_order):
+        # Drop the smallest supplier below the minimum and refill, until every
+        # remaining supplier clears it.
+        while True:
+            spend = self._supplier_spend(mask)
+            below = np.flatnonzero((spend > 0) & (spend < min_order))
+            if not len(below):
+                return mask
+            mask = mask.copy()
+            mask[below[np.argmin(spend[below])]] = False
+
+    def solve(self, max_suppliers=None, min_order=None):
+        mask = np.ones(len(self.supplier_ids), dtype=bool)
+        if max_suppliers is not None:
+            mask = self._cap_suppliers(mask, max_suppliers)
+        if min_order:
+            mask = self._enforce_minimum(mask, float(min_order))
+
+        take, _, _ = self._fill(mask[None, :])
+        take = take[0]
+        assignments, unfilled = [], []
+        suppliers = {}
+        total = Decimal('0.00')
+        for i, product_id in enumerate(self.product_ids):
+            for k in np.flatnonzero(take[i]):
+                supplier_id = self.supplier_ids[self.order[i, k]]
+                quantity = int(take[i, k])
+                unit_price = self.unit_prices[(product_id, supplier_id)]
+                amount = unit_price * quantity
+                total += amount
+                assignments.append({
+                    "product_id": product_id,
+                    "supplier_id": supplier_id,
+                    "quantity": quantity,
+                    "unit_price": unit_price,
+                    "amount": amount,
+                })
+                summary = suppliers.setdefault(supplier_id, {"supplier_id": supplier_id, "amount": Decimal('0.00'),
+                                                             "lines": 0})
+                summary["amount"] += amount
+                summary["lines"] += 1
+            missing = int(self.quantity[i] - take[i].sum())
+            if missing:
+                unfilled.append({"product_id": product_id, "quantity": missing})
+
+        return {
+            "assignments": assignments,
+            "suppliers": list(suppliers.values()),
+            "unfilled": unfilled,
+            "total": total,
+            # The cheapest-first fill is only provably optimal without constraints.
+            "optimal": max_suppliers is None and not min_order,
+        }
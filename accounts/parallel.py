@@ -0,0 +1,47 @@
+"""
+Independent ORM reads run at the same time from async views.
+
+Django's async ORM (aget, acount, ...) sends every query through
+sync_to_async(thread_sensitive=True), i.e. through one thread and one database
+connection per request, so gathering a* calls still runs them one after
+another. gather_queries runs each sync query function on a worker thread of
+its own, and so on that thread's own connection, and awaits them together.
+
+Worker connections are looked after as at the end of a request: reused up to
+CONN_MAX_AGE (or handed back to the pool) and dropped once unusable. Inside a
+transaction (ATOMIC_REQUESTS, TestCase) the functions run in turn on the
+request's connection instead, since another connection wouldn't see its
+uncommitted writes.
+
+Coroutine functions may be mixed in; they are awaited alongside.
+"""
+import asyncio
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.db import close_old_connections, connection
+
+
+def _in_transaction():
+    return connection.in_atomic_block
+
+
+def _on_worker(fn):
+    def run(*args):
+        close_old_connections()
+        try:
+            return fn(*args)
+        finally:
+            close_old_connections()
+    return sync_to_async(run, thread_sensitive=False)
+
+
+async def gather_queries(*calls):
+    """Run calls, (function, *args) tuples, concurrently and return their results in order."""
+    def coroutine(fn, in_transaction):
+        if iscoroutinefunction(fn):
+            return fn
+        return sync_to_async(fn) if in_transaction else _on_worker(fn)
+
+    if await sync_to_async(_in_transaction)():
+        return [await coroutine(fn, True)(*args) for fn, *args in calls]
+    return await asyncio.gather(*(coroutine(fn, False)(*args) for fn, *args in calls))
@@ -0,0 +1,334 @@
+"""
+Monthly range partitions of the order tables on PostgreSQL, with old months
+archived to Parquet files.
+
+Migration 0013 turns accounts_order and accounts_sharedorder into tables
+partitioned by RANGE (date): one partition per calendar month, plus a DEFAULT
+partition that catches rows outside them. PostgreSQL requires the partition
+key in the primary key, so the key becomes (id, date). Ids still come from one
+sequence per table. A query with a date condition only scans the matching
+months; the dashboards list only the completed orders of the last
+ORDER_HOT_DAYS days (hot_since()).
+
+ensure_partitions() creates partitions ORDER_PARTITIONS_AHEAD months ahead. It
+also gives a partition of its own to any month that has rows in the DEFAULT
+partition. Run it daily via `manage.py maintain_order_partitions`.
+
+Orders in progress stay on the vendor dashboard however old they are; a
+partial index on each partition (order_in_progress_idx) holds just those, so
+finding them doesn't read the old months.
+
+close_months() rolls each supplier's shared-order count and revenue per closed
+month up into MonthlyOrderTotal. The supplier dashboard's lifetime totals then
+add those rows to an aggregate over the months since live_totals_since() only.
+
+archive_partition() writes one month to a zstd-compressed Parquet file under
+ORDER_ARCHIVE_DIR, then detaches and drops the partition. read_archive()
+queries those files.
+
+On other databases the tables stay plain; hot_since(), the partial index and
+the rollup apply all the same.
+"""
+import datetime
+import os
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import MonthlyOrderTotal, Order, SharedOrder
+
+PARTITIONED_MODELS = (Order, SharedOrder)
+PARTITION_KEY = 'date'
+EXPORT_BATCH_SIZE = 50_000
+_PARTITION_NAME = re.compile(r'_p(\d{4})(\d{2})$')
+_ARCHIVE_NAME = re.compile(r'^(\d{4})-(\d{2})\.parquet$')
+ARROW_TYPES = {
+    'AutoField': 'int64',
+    'BigAutoField': 'int64',
+    'ForeignKey': 'int64',
+    'IntegerField': 'int64',
+    'PositiveIntegerField': 'int64',
+    'CharField': 'string',
+    'DateField': 'date32',
+}
+
+
+class ArchiveError(Exception):
+    pass
+
+
+def hot_since():
+    """The oldest date of the completed orders the dashboards list; see ORDER_HOT_DAYS."""
+    return timezone.localdate() - datetime.timedelta(days=settings.ORDER_HOT_DAYS)
+
+
+def add_months(month, count):
+    years, index = divmod(month.month - 1 + count, 12)
+    return datetime.date(month.year + years, index + 1, 1)
+
+
+def this_month():
+    return timezone.localdate().replace(day=1)
+
+
+def live_totals_since():
+    """
+    The first month whose shared orders the supplier totals aggregate live.
+    It's the month before the last one: a month is closed (and can be rolled
+    up) once the next one is over, and this leaves close_months() a month to
+    run before its rows are needed.
+    """
+    return add_months(this_month(), -2)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y%m}"
+
+
+def default_partition(table):
+    return f"{table}_default"
+
+
+# DDL. Each takes a cursor and a table name; migration 0013 has its own copies.
+
+def is_partitioned(cursor, table):
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))", [table])
+    return cursor.fetchone()[0]
+
+
+def _partition_months(cursor, table):
+    cursor.execute(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = %s::regclass",
+        [table],
+    )
+    return sorted(
+        datetime.date(int(match[1]), int(match[2]), 1)
+        for (name,) in cursor.fetchall()
+        if (match := _PARTITION_NAME.search(name))
+    )
+
+
+def create_partition(cursor, table, month):
+    """
+    Attach the partition of table for month, unless it exists. Rows of that
+    month sitting in the DEFAULT partition are moved into it first, as
+    PostgreSQL won't attach a partition for rows the default one still holds.
+    """
+    qn = cursor.db.ops.quote_name
+    name = partition_name(table, month)
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+    if cursor.fetchone()[0]:
+        return False
+    start, end = month, add_months(month, 1)
+    cursor.execute(f"CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {qn(default_partition(table))} "
+        f"WHERE {PARTITION_KEY} >= %s AND {PARTITION_KEY} < %s RETURNING *) "
+        f"INSERT INTO {qn(name)} SELECT * FROM moved",
+        [start, end],
+    )
+    cursor.execute(
+        f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} FOR VALUES FROM ('{start}') TO ('{end}')"
+    )
+    return True
+
+
+# Maintenance
+
+def partition_months(model):
+    """The months model's table has a partition for, oldest first ([] if it isn't partitioned)."""
+    if connection.vendor != 'postgresql':
+        return []
+    with connection.cursor() as cursor:
+        table = model._meta.db_table
+        return _partition_months(cursor, table) if is_partitioned(cursor, table) else []
+
+
+def ensure_partitions(months_ahead=None):
+    """
+    Create the partitions through months_ahead (default ORDER_PARTITIONS_AHEAD)
+    months from now, and for every month found in a DEFAULT partition.
+    Returns the names of the partitions created.
+    """
+    if connection.vendor != 'postgresql':
+        return []
+    months_ahead = settings.ORDER_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+    qn = connection.ops.quote_name
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for model in PARTITIONED_MODELS:
+            table = model._meta.db_table
+            if not is_partitioned(cursor, table):
+                continue
+            cursor.execute(f"SELECT DISTINCT date_trunc('month', {PARTITION_KEY})::date "
+                           f"FROM {qn(default_partition(table))}")
+            months = {row[0] for row in cursor.fetchall()}
+            months.update(add_months(this_month(), count) for count in range(months_ahead + 1))
+            created.extend(partition_name(table, month) for month in sorted(months)
+                           if create_partition(cursor, table, month))
+    return created
+
+
+# Monthly totals
+
+def _latest_rolled_up():
+    return MonthlyOrderTotal.objects.aggregate(latest=Max('month'))['latest']
+
+
+def close_months(recount=False):
+    """
+    Roll up the shared orders of the closed months (those before last month)
+    that aren't rolled up yet into MonthlyOrderTotal. recount also counts the
+    months rolled up already again, after rows were bulk-loaded into them.
+    Returns the months.
+    """
+    orders = SharedOrder.objects.filter(date__lt=add_months(this_month(), -1))
+    latest = _latest_rolled_up()
+    if latest is not None and not recount:
+        orders = orders.filter(date__gte=add_months(latest, 1))
+    rows = list(
+        orders.annotate(month=TruncMonth('date')).values('supplier_id', 'month')
+        .annotate(orders=Count('id'), revenue=Sum('amount')).order_by()
+    )
+    totals = [MonthlyOrderTotal(**row) for row in rows]
+    if recount:
+        MonthlyOrderTotal.objects.bulk_create(totals, update_conflicts=True, unique_fields=['supplier', 'month'],
+                                              update_fields=['orders', 'revenue'])
+    else:
+        # Concurrent runs count the same rows; the first one's stay.
+        MonthlyOrderTotal.objects.bulk_create(totals, ignore_conflicts=True)
+    return sorted({row['month'] for row in rows})
+
+
+def recount_month(supplier_id, month):
+    """
+    Recount supplier_id's rolled-up total for month after one of its shared
+    orders changed. Months not rolled up yet, or archived, are left alone.
+    """
+    month = month.replace(day=1)
+    latest = _latest_rolled_up()
+    if latest is None or month > latest or archive_path(SharedOrder, month).exists():
+        return
+    totals = SharedOrder.objects.filter(
+        supplier_id=supplier_id, date__gte=month, date__lt=add_months(month, 1),
+    ).aggregate(orders=Count('id'), revenue=Sum('amount'))
+    if totals['orders']:
+        MonthlyOrderTotal.objects.update_or_create(supplier_id=supplier_id, month=month, defaults=totals)
+    else:
+        MonthlyOrderTotal.objects.filter(supplier_id=supplier_id, month=month).delete()
+
+
+# Archive
+
+def archive_path(model, month):
+    return settings.ORDER_ARCHIVE_DIR / model._meta.db_table / f"{month:%Y-%m}.parquet"
+
+
+def _arrow_schema(model):
+    import pyarrow as pa
+
+    return pa.schema([
+        (field.attname, pa.decimal128(field.max_digits, field.decimal_places)
+         if field.get_internal_type() == 'DecimalField' else pa.type_for_alias(ARROW_TYPES[field.get_internal_type()]))
+        for field in model._meta.concrete_fields
+    ])
+
+
+def archive_partition(model, month, force=False):
+    """
+    Write model's rows of month to a Parquet file, then detach and drop their
+    partition. Partitions with orders still in progress are refused unless
+    force is set. Returns the path of the file.
+    """
+    # pyarrow is imported here and in read_archive only, to keep it out of the web processes.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    qn = connection.ops.quote_name
+    table, name = model._meta.db_table, partition_name(model._meta.db_table, month)
+    if month not in partition_months(model):
+        raise ArchiveError(f"{table} has no partition for {month:%Y-%m}")
+    if month >= add_months(this_month(), -1):
+        raise ArchiveError(f"{name} is still current")
+    if connection.in_atomic_block:
+        raise ArchiveError("archive_partition() commits its own transaction; don't call it inside one")
+    path = archive_path(model, month)
+    if path.exists():
+        raise ArchiveError(f"{path} already exists")
+
+    schema = _arrow_schema(model)
+    columns = ', '.join(qn(field.column) for field in model._meta.concrete_fields)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + '.partial')
+    try:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                # Writes to the month would otherwise be lost between the export and the drop.
+                cursor.execute(f"LOCK TABLE {qn(name)} IN SHARE MODE")
+                cursor.execute(f"SELECT COUNT(*) FROM {qn(name)} WHERE progress < 3")
+                in_progress = cursor.fetchone()[0]
+                if in_progress and not force:
+                    raise ArchiveError(f"{name} still has {in_progress} orders in progress")
+            if model is SharedOrder:
+                close_months()  # the month's totals outlive its rows
+            with connection.chunked_cursor() as cursor, pq.ParquetWriter(partial, schema, compression='zstd') as writer:
+                cursor.execute(f"SELECT {columns} FROM {qn(name)} ORDER BY id")
+                while rows := cursor.fetchmany(EXPORT_BATCH_SIZE):
+                    writer.write_batch(pa.record_batch(
+                        [pa.array(values, type=type_) for values, type_ in zip(zip(*rows), schema.types)],
+                        schema=schema,
+                    ))
+            # On disk before the partition is dropped.
+            with open(partial, 'rb') as f:
+                os.fsync(f.fileno())
+            with connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}")
+                cursor.execute(f"DROP TABLE {qn(name)}")
+    except BaseException:
+        # The partition is still there; the file isn't needed.
+        partial.unlink(missing_ok=True)
+        raise
+    # Named only once the drop is committed, so a failed commit never leaves
+    # a file behind for a month that's still in the database.
+    os.replace(partial, path)
+    return path
+
+
+def archived_months(model):
+    directory = settings.ORDER_ARCHIVE_DIR / model._meta.db_table
+    if not directory.is_dir():
+        return []
+    return sorted(
+        datetime.date(int(match[1]), int(match[2]), 1)
+        for path in directory.iterdir()
+        if (match := _ARCHIVE_NAME.match(path.name))
+    )
+
+
+def read_archive(model, start=None, end=None, **values):
+    """
+    Archived rows of model dated start..end (inclusive, either may be None)
+    whose fields equal the given values, as unsaved instances ordered by id.
+    Only the files of the months in range are read.
+    """
+    import pyarrow.dataset as ds
+
+    files = [
+        str(archive_path(model, month)) for month in archived_months(model)
+        if (start is None or month >= start.replace(day=1)) and (end is None or month <= end)
+    ]
+    if not files:
+        return []
+    condition = ds.scalar(True)
+    if start is not None:
+        condition &= ds.field(PARTITION_KEY) >= start
+    if end is not None:
+        condition &= ds.field(PARTITION_KEY) <= end
+    for name, value in values.items():
+        condition &= ds.field(name) == value
+    rows = ds.dataset(files, format='parquet').to_table(filter=condition).sort_by('id').to_pylist()
+    return [model(**row) for row in rows]
@@ -0,0 +1,123 @@
+"""
+Server-side cart pricing.
+
+A line's effective unit price is the chosen supplier's SupplierInventory
+custom_price, falling back to Product.price when that supplier has none or the
+line names no supplier; naming a supplier that doesn't stock the product is a
+PricingError. Price tables (per product: name, list price and every stocking
+supplier's custom price) are cached in-process and in the shared cache under
+the "prices" version, which product and inventory writes bump (see
+accounts.signals). Whatever isn't cached is loaded with a single IN query, so
+a checkout costs at most one query however many lines it has.
+"""
+import threading
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.core.cache import cache
+
+from .models import Product
+from .versioning import get_version
+
+PRICES_SCOPE = 'prices'
+CACHE_TIMEOUT = 60 * 60
+LOCAL_MAX_ENTRIES = 50_000
+CENT = Decimal('0.01')
+
+_local_lock = threading.Lock()
+_local_version = None
+_local_tables = {}  # product id -> (name, list price, {supplier id: custom price or None})
+
+
+class PricingError(ValueError):
+    pass
+
+
+def _money(value):
+    # Product.price is a float column; go through str() to keep 420.1 as 420.10.
+    return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def _cache_key(version, product_id):
+    return f"price-table:{version}:{product_id}"
+
+
+def _load_tables(product_ids):
+    tables = {}
+    rows = Product.objects.filter(id__in=product_ids).values_list(
+        'id', 'name', 'price', 'supplier_inventories__supplier_id', 'supplier_inventories__custom_price'
+    )
+    for product_id, name, price, supplier_id, custom_price in rows:
+        table = tables.setdefault(product_id, (name, _money(price), {}))
+        if supplier_id is not None:
+            table[2][supplier_id] = _money(custom_price) if custom_price is not None else None
+    return tables
+
+
+def price_tables(product_ids):
+    """Price tables for the given products, keyed by product id. Unknown ids are left out."""
+    global _local_version
+    version = get_version(PRICES_SCOPE)
+    product_ids = set(product_ids)
+
+    with _local_lock:
+        if _local_version != version or len(_local_tables) > LOCAL_MAX_ENTRIES:
+            _local_tables.clear()
+            _local_version = version
+        tables = {pid: _local_tables[pid] for pid in product_ids if pid in _local_tables}
+
+    missing = product_ids - tables.keys()
+    if missing:
+        cached = cache.get_many([_cache_key(version, pid) for pid in missing])
+        found = {pid: cached[_cache_key(version, pid)] for pid in missing if _cache_key(version, pid) in cached}
+        missing -= found.keys()
+        if missing:
+            loaded = _load_tables(missing)
+            cache.set_many({_cache_key(version, pid): table for pid, table in loaded.items()}, CACHE_TIMEOUT)
+            found.update(loaded)
+        tables.update(found)
+        with _local_lock:
+            if _local_version == version:
+                _local_tables.update(found)
+    return tables
+
+
+def price_cart(items):
+    """
+    Price cart lines of the form {"id": product id, "quantity": n, "supplier_id": optional}.
+    Client-sent prices are ignored. Returns {"lines": [...], "total": Decimal}.
+    """
+    lines = []
+    for item in items:
+        try:
+            product_id = int(item['id'])
+            quantity = int(item.get('quantity', 1))
+            supplier_id = item.get('supplier_id')
+            supplier_id = int(supplier_id) if supplier_id is not None else None
+        except (KeyError, TypeError, ValueError):
+            raise PricingError("Each cart line needs a numeric product id and quantity")
+        if quantity < 1:
+            raise PricingError(f"Invalid quantity for product {product_id}")
+        lines.append((product_id, quantity, supplier_id))
+
+    tables = price_tables(product_id for product_id, _, _ in lines)
+    priced, total = [], Decimal('0.00')
+    for product_id, quantity, supplier_id in lines:
+        if product_id not in tables:
+            raise PricingError(f"Product {product_id} not found")
+        name, list_price, offers = tables[product_id]
+        if supplier_id is not None and supplier_id not in offers:
+            raise PricingError(f"Supplier {supplier_id} does not offer product {product_id}")
+        unit_price = offers.get(supplier_id)
+        if unit_price is None:
+            unit_price = list_price
+        amount = unit_price * quantity
+        total += amount
+        priced.append({
+            "product_id": product_id,
+            "name": name,
+            "supplier_id": supplier_id,
+            "quantity": quantity,
+            "unit_price": unit_price,
+            "amount": amount,
+        })
+    return {"lines": priced, "total": total}
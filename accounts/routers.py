@@ -0,0 +1,143 @@
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.urls import Resolver404, resolve
+
+# True while serving a safe (GET/HEAD/OPTIONS) request, or a POST to a
+# @read_only view, from a client that has not written recently. Everything
+# else - writes, management commands, shells, reads made in the middle of a
+# POST - stays on the primary.
+_replica_reads_allowed = ContextVar('replica_reads_allowed', default=False)
+
+PIN_COOKIE_NAME = 'db_primary_until'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_round_robin = itertools.count()
+_lag_lock = threading.Lock()
+_lag_cache = {}  # alias -> (checked_at, lag seconds or None when unreachable)
+
+
+def replica_lag(alias):
+    """
+    Seconds the replica is behind the primary, or None if it can't be reached.
+    Non-PostgreSQL databases (e.g. two local sqlite files) report no lag.
+    """
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+            )
+            return float(cursor.fetchone()[0] or 0)
+    except DatabaseError:
+        return None
+
+
+def _cached_lag(alias):
+    now = time.monotonic()
+    checked_at, lag = _lag_cache.get(alias, (None, None))
+    if checked_at is not None and now - checked_at < settings.DB_REPLICA_LAG_CHECK_INTERVAL:
+        return lag
+    with _lag_lock:
+        checked_at, lag = _lag_cache.get(alias, (None, None))
+        if checked_at is None or now - checked_at >= settings.DB_REPLICA_LAG_CHECK_INTERVAL:
+            lag = replica_lag(alias)
+            _lag_cache[alias] = (time.monotonic(), lag)
+    return lag
+
+
+def healthy_replicas():
+    return [
+        alias for alias in settings.DATABASE_REPLICAS
+        if (lag := _cached_lag(alias)) is not None and lag <= settings.DB_REPLICA_MAX_LAG
+    ]
+
+
+def replica_status():
+    """Lag per replica as last measured, for the health endpoint."""
+    return {alias: _lag_cache.get(alias, (None, None))[1] for alias in settings.DATABASE_REPLICAS}
+
+
+@contextmanager
+def pin_to_primary():
+    """Force every read inside the block to the primary."""
+    token = _replica_reads_allowed.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads_allowed.reset(token)
+
+
+def read_only(view):
+    """
+    Mark a view that only reads although it isn't called with GET (e.g. the
+    batch API). Its reads may go to replicas and it doesn't pin the client.
+    """
+    view.read_only = True
+    return view
+
+
+def is_read_only(request):
+    if not hasattr(request, '_read_only'):
+        if request.method in SAFE_METHODS:
+            request._read_only = True
+        else:
+            try:
+                request._read_only = getattr(resolve(request.path_info).func, 'read_only', False)
+            except Resolver404:
+                request._read_only = False
+    return request._read_only
+
+
+def is_pinned(request):
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE_NAME, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def begin_request(request):
+    allowed = bool(settings.DATABASE_REPLICAS) and not is_pinned(request) and is_read_only(request)
+    return _replica_reads_allowed.set(allowed)
+
+
+def end_request(token, request, response):
+    _replica_reads_allowed.reset(token)
+    if response is None or not settings.DATABASE_REPLICAS or is_read_only(request):
+        return response
+    if response.status_code < 400:
+        # Read-your-writes: keep this client on the primary until the replicas
+        # have had time to catch up with what it just wrote.
+        window = settings.DB_READ_YOUR_WRITES_SECONDS
+        response.set_cookie(PIN_COOKIE_NAME, f"{time.time() + window:.3f}", max_age=window,
+                            httponly=True, samesite='Lax')
+    return response
+
+
+class PrimaryReplicaRouter:
+    """
+    Route safe request reads to a healthy replica, everything else to default.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads_allowed.get() or connections['default'].in_atomic_block:
+            return 'default'
+        replicas = healthy_replicas()
+        if not replicas:
+            return 'default'
+        return replicas[next(_round_robin) % len(replicas)]
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
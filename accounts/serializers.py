@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from .models import VendorProfile, SupplierProfile, Product, Order, SupplierInventory
+from .sparse import SparseFieldsMixin
 
 
 # --------- Registration ----------
@@ -55,7 +56,7 @@ class UserLoginSerializer(serializers.Serializer):
 
 
 # --------- Vendor & Supplier Profiles ----------
-class VendorProfileSerializer(serializers.ModelSerializer):
+class VendorProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user_email = serializers.CharField(source='user.email', read_only=True)
     user_name = serializers.SerializerMethodField()
 
@@ -63,12 +64,13 @@ class VendorProfileSerializer(serializers.ModelSerializer):
         model = VendorProfile
         fields = '__all__'
         read_only_fields = ['user', 'created_at', 'updated_at']
+        sparse_sources = {'user_name': ['user__first_name', 'user__last_name']}
 
     def get_user_name(self, obj):
         return f"{obj.user.first_name} {obj.user.last_name}".strip()
 
 
-class SupplierProfileSerializer(serializers.ModelSerializer):
+class SupplierProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user_email = serializers.CharField(source='user.email', read_only=True)
     user_name = serializers.SerializerMethodField()
 
@@ -76,13 +78,14 @@ class SupplierProfileSerializer(serializers.ModelSerializer):
         model = SupplierProfile
         fields = '__all__'
         read_only_fields = ['user', 'created_at', 'updated_at']
+        sparse_sources = {'user_name': ['user__first_name', 'user__last_name']}
 
     def get_user_name(self, obj):
         return f"{obj.user.first_name} {obj.user.last_name}".strip()
 
 
 # --------- User Profile (Unified) ----------
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user_type = serializers.SerializerMethodField()
     profile_data = serializers.SerializerMethodField()
 
@@ -101,21 +104,45 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
     def get_profile_data(self, obj):
         if hasattr(obj, 'vendor_profile'):
-            return VendorProfileSerializer(obj.vendor_profile).data
+            return VendorProfileSerializer(obj.vendor_profile, **self.nested_sparse('profile_data')).data
         elif hasattr(obj, 'supplier_profile'):
-            return SupplierProfileSerializer(obj.supplier_profile).data
+            return SupplierProfileSerializer(obj.supplier_profile, **self.nested_sparse('profile_data')).data
         return None
 
 
 # --------- Products ----------
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    best_offer = serializers.SerializerMethodField()
+
     class Meta:
         model = Product
-        fields = '__all__'
+        exclude = ['name_hash']
+        sparse_sources = {'best_offer': ['best_offer']}
+
+    def get_best_offer(self, obj):
+        # Querysets should select_related('best_offer'); see accounts.offers.
+        best_offer = getattr(obj, 'best_offer', None)
+        if best_offer is None:
+            return None
+        return {
+            "price": best_offer.best_price,
+            "supplier_id": best_offer.supplier_id,
+            "total_stock": best_offer.total_stock,
+        }
+
+
+class ProductListSerializer(ProductSerializer):
+    """
+    Catalog listings. Leaves out the description and supplier image; the
+    product detail endpoint has every field.
+    """
+
+    class Meta(ProductSerializer.Meta):
+        exclude = ['name_hash', 'description', 'supplier_image']
 
 
 # --------- Orders ----------
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     vendor_name = serializers.CharField(source='vendor.company_name', read_only=True)  # <-- add vendor name
     class Meta:
         model = Order
@@ -0,0 +1,166 @@
+import functools
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import dedupe, events, snapshots, swr
+from .offers import refresh_best_offers
+from .models import (
+    Order, Product, ProductTombstone, SharedOrder, SupplierInventory, SupplierProfile, VendorProfile,
+)
+from .partitions import add_months, recount_month, this_month
+from .pricing import PRICES_SCOPE
+from .versioning import CATALOG_SCOPE, bump_version, inventory_scope, orders_scope, profile_scope
+
+
+@receiver(post_save, sender=Order)
+def order_saved(sender, instance, created, **kwargs):
+    payload = events.order_payload(instance)
+    transaction.on_commit(lambda: events.publish(
+        [events.vendor_channel(instance.vendor_id)],
+        'order.created' if created else 'order.updated',
+        payload,
+    ))
+
+
+@receiver(post_save, sender=SharedOrder)
+def shared_order_saved(sender, instance, created, **kwargs):
+    payload = events.shared_order_payload(instance)
+    transaction.on_commit(lambda: events.publish(
+        [events.supplier_channel(instance.supplier_id), events.vendor_channel(instance.vendor_id)],
+        'shared_order.created' if created else 'shared_order.updated',
+        payload,
+    ))
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=SupplierInventory)
+def prices_changed(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version(PRICES_SCOPE))
+
+
+def _catalog_changed():
+    # Called once BestOffer is up to date: a request between a bump and the
+    # refresh would cache the old offers under the new version.
+    bump_version(CATALOG_SCOPE)
+    snapshots.schedule_snapshot()
+
+
+def _bump_user_scope(scope, profile_model, profile_id):
+    """
+    Bump scope(user id) on commit for the user of a vendor or supplier
+    profile. The profiles of one transaction are looked up together on
+    commit, so a cascade delete of many rows costs one query, and a profile
+    deleted along the way is skipped.
+    """
+    connection = transaction.get_connection()
+    if not hasattr(connection, 'pending_user_scopes'):
+        connection.pending_user_scopes = {}
+    connection.pending_user_scopes.setdefault((scope, profile_model), set()).add(profile_id)
+    # One callback per call, as a rolled-back savepoint drops its callbacks;
+    # the first to run takes everything pending.
+    transaction.on_commit(functools.partial(_flush_user_scopes, connection))
+
+
+def _flush_user_scopes(connection):
+    pending, connection.pending_user_scopes = connection.pending_user_scopes, {}
+    for (scope, profile_model), profile_ids in pending.items():
+        for user_id in profile_model.objects.filter(pk__in=profile_ids).values_list('user_id', flat=True):
+            bump_version(scope(user_id))
+
+
+@receiver([post_save, post_delete], sender=Order)
+def orders_changed(sender, instance, **kwargs):
+    _bump_user_scope(orders_scope, VendorProfile, instance.vendor_id)
+
+
+@receiver([post_save, post_delete], sender=SupplierInventory)
+def supplier_inventory_changed(sender, instance, **kwargs):
+    _bump_user_scope(inventory_scope, SupplierProfile, instance.supplier_id)
+    supplier_id = instance.supplier_id
+
+    def invalidate():
+        # The supplier dashboard aggregates cached in accounts.views.
+        swr.invalidate('supplier-stats', supplier_id)
+        swr.invalidate('supplier-categories', supplier_id)
+    transaction.on_commit(invalidate)
+
+
+@receiver([post_save, post_delete], sender=SharedOrder)
+def supplier_orders_changed(sender, instance, **kwargs):
+    supplier_id, date = instance.supplier_id, instance.date
+
+    def changed():
+        if date < add_months(this_month(), -1):
+            recount_month(supplier_id, date)  # a closed month's rolled-up total
+        swr.invalidate('supplier-stats', supplier_id)
+    transaction.on_commit(changed)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_version(profile_scope(instance.pk)))
+
+
+@receiver(post_save, sender=VendorProfile)
+@receiver(post_save, sender=SupplierProfile)
+def profile_saved(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: bump_version(profile_scope(user_id)))
+    if sender is VendorProfile:
+        # Serialized orders carry the vendor's company name.
+        transaction.on_commit(lambda: bump_version(orders_scope(user_id)))
+
+
+@receiver([post_save, post_delete], sender=SupplierInventory)
+def inventory_changed(sender, instance, **kwargs):
+    def refresh():
+        refresh_best_offers([instance.product_id])
+        # The best offer is part of the catalog entry, so delta sync must resend it.
+        Product.objects.filter(pk=instance.product_id).update(updated_at=timezone.now())
+        _catalog_changed()
+    transaction.on_commit(refresh)
+
+
+@receiver(post_delete, sender=Product)
+def product_deleted(sender, instance, **kwargs):
+    ProductTombstone.objects.create(product_id=instance.pk)
+    transaction.on_commit(_catalog_changed)
+
+
+@receiver(post_save, sender=Product)
+def product_saved(sender, instance, **kwargs):
+    # A new list price changes the effective price of offers without a custom one.
+    def refresh():
+        refresh_best_offers([instance.pk])
+        _catalog_changed()
+    transaction.on_commit(refresh)
+
+
+@receiver(post_save, sender=SupplierProfile)
+def supplier_profile_saved(sender, instance, created, **kwargs):
+    # Product.supplier is a display copy of the organization name; keep it current.
+    if not created and instance.organization_name:
+        renamed = Product.objects.filter(supplier_profile=instance).exclude(supplier=instance.organization_name).update(
+            supplier=instance.organization_name, updated_at=timezone.now())
+        if renamed:
+            transaction.on_commit(lambda: bump_version(CATALOG_SCOPE))
+
+
+def _name_changed(update_fields):
+    return update_fields is None or 'name' in update_fields
+
+
+@receiver(pre_save, sender=Product)
+def product_name_hash(sender, instance, update_fields=None, **kwargs):
+    if _name_changed(update_fields):
+        instance.name_hash = dedupe.name_hash(instance.name)
+
+
+@receiver(post_save, sender=Product)
+def product_name_buckets(sender, instance, update_fields=None, **kwargs):
+    if _name_changed(update_fields):
+        dedupe.replace_buckets([instance])
@@ -0,0 +1,147 @@
+"""
+Static catalog snapshots.
+
+The full catalog and one file per category are written as JSON (the same
+bytes /api/products/ returns) under STATIC_ROOT/<CATALOG_SNAPSHOT_DIR>/, with
+the content hash in the file name and .gz / .br siblings next to each, so the
+web server can send them precompressed with immutable cache headers and no
+Python involved. manifest.json, which must be served with a short max-age,
+points at the current files and carries the delta-sync token to continue from
+(see accounts.changes). For nginx:
+
+    location /static/catalog/ {
+        alias <STATIC_ROOT>/catalog/;
+        gzip_static on;
+        brotli_static on;
+        add_header Cache-Control "public, max-age=31536000, immutable";
+        location = /static/catalog/manifest.json { add_header Cache-Control "no-cache"; }
+    }
+
+Without nginx in front, accounts.middleware.StaticFilesMiddleware serves them
+the same way.
+
+Catalog writes flag the snapshots as stale (see accounts.signals), and
+`manage.py build_catalog_snapshots --watch`, run as a process of its own,
+rebuilds them at most once per CATALOG_SNAPSHOT_DEBOUNCE seconds. Web workers
+never build them.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+
+import brotli
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.text import slugify
+from rest_framework.renderers import JSONRenderer
+
+from .changes import OVERLAP, encode_token
+from .models import Product
+from .serializers import ProductListSerializer
+from .sparse import narrow
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+STALE_KEY = 'catalog-snapshot:stale'
+# Superseded files stay this long for clients still holding the old manifest.
+KEEP_OLD_SECONDS = 60 * 60
+
+
+def snapshot_dir():
+    return os.path.join(settings.STATIC_ROOT, settings.CATALOG_SNAPSHOT_DIR)
+
+
+def snapshot_url(name):
+    return f"{settings.STATIC_URL}{settings.CATALOG_SNAPSHOT_DIR}/{name}"
+
+
+def _write(path, content):
+    # Write then rename, so the web server never serves a half-written file.
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, 'wb') as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+def _write_snapshot(directory, stem, content):
+    name = f"{stem}.{hashlib.sha256(content).hexdigest()[:16]}.json"
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):  # same content, same name: nothing to do
+        _write(f"{path}.gz", gzip.compress(content, compresslevel=9, mtime=0))
+        _write(f"{path}.br", brotli.compress(content, quality=11))
+        _write(path, content)
+    return name
+
+
+def _remove_stale(directory, keep):
+    cutoff = time.time() - KEEP_OLD_SECONDS
+    for entry in os.scandir(directory):
+        base = entry.name.removesuffix('.gz').removesuffix('.br')
+        if base != MANIFEST_NAME and base not in keep and entry.stat().st_mtime < cutoff:
+            os.remove(entry.path)
+
+
+def build_snapshots():
+    """Write the current catalog snapshots and manifest. Returns the manifest."""
+    directory = snapshot_dir()
+    os.makedirs(directory, exist_ok=True)
+    # Taken before reading, so clients resume delta sync from a point the snapshot covers.
+    token = encode_token(timezone.now() - OVERLAP)
+    products = ProductListSerializer(narrow(Product.objects.order_by('id'), ProductListSerializer), many=True).data
+
+    renderer = JSONRenderer()
+    by_category = defaultdict(list)
+    for product in products:
+        by_category[product['category'].strip().lower()].append(product)
+
+    full = _write_snapshot(directory, 'products', renderer.render(products))
+    categories = {
+        category: _write_snapshot(directory, f"products-{slugify(category) or 'other'}", renderer.render(rows))
+        for category, rows in sorted(by_category.items())
+    }
+    manifest = {
+        "generated_at": timezone.now().isoformat(),
+        "changes_token": token,
+        "count": len(products),
+        "all": snapshot_url(full),
+        "categories": {category: snapshot_url(name) for category, name in categories.items()},
+    }
+    _write(os.path.join(directory, MANIFEST_NAME), json.dumps(manifest).encode())
+    _remove_stale(directory, {full, *categories.values()})
+    return manifest
+
+
+def schedule_snapshot():
+    """Flag the snapshots for a rebuild by the build_catalog_snapshots --watch process."""
+    if settings.CATALOG_SNAPSHOTS:
+        cache.set(STALE_KEY, True, timeout=None)
+
+
+def build_if_stale():
+    """Rebuild the snapshots if a catalog write flagged them. Returns the manifest, or None."""
+    if not cache.get(STALE_KEY):
+        return None
+    # Cleared first: a write committed from here on flags the next build.
+    cache.delete(STALE_KEY)
+    return build_snapshots()
+
+
+def watch(log=None):
+    """Rebuild flagged snapshots every CATALOG_SNAPSHOT_DEBOUNCE seconds, until interrupted."""
+    while True:
+        try:
+            manifest = build_if_stale()
+            if manifest and log:
+                log(manifest)
+        except Exception:
+            logger.exception("Catalog snapshot rebuild failed")
+        finally:
+            close_old_connections()
+        time.sleep(settings.CATALOG_SNAPSHOT_DEBOUNCE)
@@ -0,0 +1,89 @@
+"""
+Sparse fieldsets for the read APIs.
+
+?fields=a,b returns only those fields, ?exclude=c,d all but those. Unknown
+names are ignored. Dotted names narrow a nested representation, e.g.
+/api/profile/?fields=email,profile_data&exclude=profile_data.address.
+
+Serializers mixing in SparseFieldsMixin drop the fields not asked for, and
+narrow() restricts the queryset to the columns the remaining fields read, so
+unused columns are never fetched. Fields the model can't tell us about
+(SerializerMethodField) name their columns in Meta.sparse_sources.
+"""
+
+
+def _split(value):
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+def sparse_fields(params):
+    """The ?fields= / ?exclude= query parameters, as serializer keyword arguments."""
+    return {'fields': _split(params.get('fields')) or None, 'exclude': _split(params.get('exclude'))}
+
+
+def select_names(available, fields=None, exclude=()):
+    """The names out of available that fields and exclude leave, in their original order."""
+    keep = {name.partition('.')[0] for name in fields} if fields is not None else None
+    return [name for name in available if (keep is None or name in keep) and name not in exclude]
+
+
+class SparseFieldsMixin:
+    """Accepts fields= and exclude= lists of field names; see module docstring."""
+
+    def __init__(self, *args, fields=None, exclude=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self._nested_sparse = {}
+        for name in set(self.fields) - set(select_names(self.fields, fields, exclude)):
+            self.fields.pop(name)
+        for name in fields or ():
+            head, _, rest = name.partition('.')
+            if rest:
+                nested = self._nested_sparse.setdefault(head, {'fields': None, 'exclude': []})
+                nested['fields'] = (nested['fields'] or []) + [rest]
+        for name in exclude:
+            head, _, rest = name.partition('.')
+            if rest:
+                self._nested_sparse.setdefault(head, {'fields': None, 'exclude': []})['exclude'].append(rest)
+
+    def nested_sparse(self, name):
+        """Keyword arguments narrowing the serializer nested under the given field."""
+        return self._nested_sparse.get(name, {})
+
+
+def source_columns(serializer):
+    """
+    The model columns (QuerySet.only() paths) the serializer's fields read, or
+    None when some field's columns are unknown.
+    """
+    sources = getattr(serializer.Meta, 'sparse_sources', {})
+    columns = set()
+    for name, field in serializer.fields.items():
+        if name in sources:
+            columns.update(sources[name])
+        elif field.source == '*':
+            return None
+        else:
+            columns.add(field.source.replace('.', '__'))
+    return columns
+
+
+def narrow(queryset, serializer_class, fields=None, exclude=(), also=()):
+    """
+    Restrict queryset to the columns serializer_class(fields=..., exclude=...)
+    reads, plus also, joining only the relations those columns need.
+    """
+    columns = source_columns(serializer_class(fields=fields, exclude=exclude))
+    if columns is None:
+        return queryset
+    columns.update(also)
+    opts = queryset.model._meta
+    related = set()
+    for column in columns:
+        path = column.rpartition('__')[0] if '__' in column else column
+        field = opts.get_field(path.split('__')[0])
+        if field.is_relation and ('__' in column or not field.concrete):
+            related.add(path)
+    queryset = queryset.select_related(None)
+    if related:
+        queryset = queryset.select_related(*related)
+    return queryset.only(*columns)
@@ -0,0 +1,181 @@
+"""
+Stale-while-revalidate caching for expensive per-scope computations, such as
+the supplier dashboard aggregates.
+
+    @stale_while_revalidate('supplier-stats', fresh_for=60)
+    def supplier_stats(supplier_id): ...
+
+The result is cached per argument tuple. Within fresh_for seconds it is served
+as is; for stale_for seconds after that it is still served, while a single
+background recomputation (guarded by a cache.add lock, i.e. SET NX in Redis)
+replaces it. Recomputation also starts early, with a probability that grows
+as expiry nears and with how long the last computation took ("XFetch"), so
+hot keys are usually refreshed before they ever go stale and the tabs of a
+big supplier never all recompute at once. On a cold miss one caller computes
+and the others wait up to WAIT_SECONDS for its result.
+
+Writers call invalidate(name, *args) once the data behind a result changed.
+That bumps a version counter (accounts.versioning) folded into the cache key,
+so the next call recomputes, and a refresh already running stores its result
+under the old key, where nobody looks for it.
+
+Coroutine functions are supported too. Their background refresh runs on an
+event loop of its own in the refresh thread, as the request's loop may be
+gone (async views under WSGI, the test client) before it finishes.
+"""
+import asyncio
+import functools
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.db import connections
+
+from .versioning import bump_version, get_version
+
+logger = logging.getLogger(__name__)
+
+WAIT_SECONDS = 5
+POLL_SECONDS = 0.05
+
+
+def _scope(name, args):
+    return f"swr:{name}:{':'.join(str(arg) for arg in args)}"
+
+
+def _keys(name, args):
+    scope = _scope(name, args)
+    key = f"{scope}:{get_version(scope)}"
+    return key, f"swr-lock:{key}"
+
+
+def invalidate(name, *args):
+    """Make the next call of the function cached under name with args recompute."""
+    bump_version(_scope(name, args))
+
+
+def _needs_refresh(entry, beta):
+    # XFetch: expiry is brought forward by the last computation time times an
+    # exponentially distributed factor.
+    return time.time() - entry['delta'] * beta * math.log(1.0 - random.random()) >= entry['expires']
+
+
+def _entry(value, started, fresh_for):
+    return {'value': value, 'delta': time.monotonic() - started, 'expires': time.time() + fresh_for}
+
+
+def _in_background(target, *args):
+    def run():
+        try:
+            target(*args)
+        finally:
+            connections.close_all()
+    threading.Thread(target=run, daemon=True).start()
+
+
+def stale_while_revalidate(name, fresh_for=60, stale_for=600, beta=1.0, lock_timeout=60):
+    """Decorator; see module docstring. Arguments must have stable str() values."""
+    timeout = fresh_for + stale_for
+
+    def decorator(fn):
+        if iscoroutinefunction(fn):
+            return _async_wrapper(fn, name, fresh_for, timeout, beta, lock_timeout)
+
+        def compute(key, args):
+            started = time.monotonic()
+            value = fn(*args)
+            cache.set(key, _entry(value, started, fresh_for), timeout)
+            return value
+
+        def release(lock_key, token):
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+        def refresh(key, lock_key, token, args):
+            try:
+                compute(key, args)
+            except Exception:
+                logger.exception("Background refresh of %s failed", key)
+            finally:
+                release(lock_key, token)
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            key, lock_key = _keys(name, args)
+            entry = cache.get(key)
+            if entry is not None and not _needs_refresh(entry, beta):
+                return entry['value']
+            token = uuid.uuid4().hex
+            locked = cache.add(lock_key, token, lock_timeout)
+            if entry is not None:
+                if locked:
+                    _in_background(refresh, key, lock_key, token, args)
+                return entry['value']
+            if not locked:
+                deadline = time.monotonic() + WAIT_SECONDS
+                while time.monotonic() < deadline:
+                    time.sleep(POLL_SECONDS)
+                    entry = cache.get(key)
+                    if entry is not None:
+                        return entry['value']
+            try:
+                return compute(key, args)
+            finally:
+                if locked:
+                    release(lock_key, token)
+
+        return wrapper
+    return decorator
+
+
+def _async_wrapper(fn, name, fresh_for, timeout, beta, lock_timeout):
+
+    async def compute(key, args):
+        started = time.monotonic()
+        value = await fn(*args)
+        await cache.aset(key, _entry(value, started, fresh_for), timeout)
+        return value
+
+    async def release(lock_key, token):
+        if await cache.aget(lock_key) == token:
+            await cache.adelete(lock_key)
+
+    async def refresh(key, lock_key, token, args):
+        try:
+            await compute(key, args)
+        except Exception:
+            logger.exception("Background refresh of %s failed", key)
+        finally:
+            await release(lock_key, token)
+
+    @functools.wraps(fn)
+    async def wrapper(*args):
+        key, lock_key = await sync_to_async(_keys)(name, args)
+        entry = await cache.aget(key)
+        if entry is not None and not _needs_refresh(entry, beta):
+            return entry['value']
+        token = uuid.uuid4().hex
+        locked = await cache.aadd(lock_key, token, lock_timeout)
+        if entry is not None:
+            if locked:
+                _in_background(async_to_sync(refresh), key, lock_key, token, args)
+            return entry['value']
+        if not locked:
+            deadline = time.monotonic() + WAIT_SECONDS
+            while time.monotonic() < deadline:
+                await asyncio.sleep(POLL_SECONDS)
+                entry = await cache.aget(key)
+                if entry is not None:
+                    return entry['value']
+        try:
+            return await compute(key, args)
+        finally:
+            if locked:
+                await release(lock_key, token)
+
+    return wrapper
@@ -0,0 +1,87 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from accounts.admin import EstimatedCountPaginator
+from accounts.models import VendorProfile
+from accounts.versioning import get_version, profile_scope
+
+from .utils import make_supplier, make_vendor
+
+
+@override_settings(STORAGES={**settings.STORAGES, 'staticfiles': {
+    'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}})  # no collectstatic manifest here
+class AdminTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+        cls.vendors = [make_vendor(f'shop{i}') for i in range(3)]
+        make_supplier('mill')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def test_changelists(self):
+        for model in ('vendorprofile', 'supplierprofile', 'product', 'supplierinventory', 'order', 'sharedorder',
+                      'supplieranalytics'):
+            with self.subTest(model=model):
+                self.assertEqual(self.client.get(f'/admin/accounts/{model}/').status_code, 200)
+        self.assertEqual(self.client.get('/admin/auth/user/').status_code, 200)
+
+    def test_queries_do_not_grow_with_rows(self):
+        few = self.changelist_queries('/admin/accounts/vendorprofile/')
+        for i in range(3, 10):
+            make_vendor(f'shop{i}')
+        self.assertEqual(self.changelist_queries('/admin/accounts/vendorprofile/'), few)
+
+    def test_search_each_field(self):
+        body = self.client.get('/admin/accounts/vendorprofile/?q=shop1@example').content.decode()
+        self.assertIn('shop1@example.com', body)
+        self.assertNotIn('shop2@example.com', body)
+        body = self.client.get('/admin/accounts/vendorprofile/?q=shop2').content.decode()
+        self.assertIn('shop2@example.com', body)
+
+    def test_mark_verified_in_one_update(self):
+        versions = [get_version(profile_scope(vendor.user_id)) for vendor in self.vendors]
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/admin/accounts/vendorprofile/', {
+                'action': 'mark_verified', '_selected_action': [vendor.pk for vendor in self.vendors[:2]],
+            })
+        self.assertEqual(sum(q['sql'].startswith('UPDATE') for q in queries), 1)
+        self.assertEqual(list(VendorProfile.objects.order_by('id').values_list('is_verified', flat=True)),
+                         [True, True, False])
+        self.assertGreater(get_version(profile_scope(self.vendors[0].user_id)), versions[0])
+        self.assertEqual(get_version(profile_scope(self.vendors[2].user_id)), versions[2])
+
+    def test_user_inlines(self):
+        body = self.client.get(f'/admin/auth/user/{self.vendors[0].user_id}/change/').content.decode()
+        self.assertIn('Vendor Profile', body)
+        self.assertNotIn('Supplier Profile', body)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+
+    def test_exact_count_for_filtered_or_small_tables(self):
+        make_vendor('shop')
+        self.assertEqual(EstimatedCountPaginator(VendorProfile.objects.all(), 10).count, 1)
+        self.assertEqual(EstimatedCountPaginator(VendorProfile.objects.filter(is_verified=True), 10).count, 0)
+
+    def test_estimate_for_large_tables(self):
+        if connection.vendor != 'postgresql':
+            self.skipTest("row estimates come from pg_class")
+        cursor = mock.MagicMock()
+        cursor.__enter__.return_value.fetchone.return_value = (2_000_000,)
+        with mock.patch.object(connection, 'cursor', return_value=cursor):
+            self.assertEqual(EstimatedCountPaginator(VendorProfile.objects.all(), 10).count, 2_000_000)
@@ -0,0 +1,94 @@
+import json
+import threading
+from decimal import Decimal
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import AsyncRequestFactory, TestCase, TransactionTestCase
+from django.utils import timezone
+
+from accounts.models import Order, SharedOrder, SupplierInventory
+from accounts.parallel import gather_queries
+from accounts.views import (
+    order_list_async, product_list_async, profile_view_async, supplier_dashboard_api_async,
+)
+
+from .utils import make_product, make_supplier, make_vendor, with_session
+
+
+async def call(view, user, path):
+    request = with_session(AsyncRequestFactory().get(path), user.id)
+
+    async def auser():
+        return user
+    request.auser = auser
+    response = await view(request)
+    return response.status_code, json.loads(response.content)
+
+
+class AsyncViewTests(TestCase):
+    """The async twins answer exactly like the sync views the URLconf serves in tests."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendor = make_vendor('shop')
+        cls.supplier = make_supplier('mill')
+        product = make_product('Bolt', 20)
+        SupplierInventory.objects.create(supplier=cls.supplier, product=product, stock_quantity=5,
+                                         custom_price=Decimal('18.00'))
+        Order.objects.create(vendor=cls.vendor, order_id='ORD001', customer='Shop', item_name='Bolt', progress=1,
+                             amount=Decimal('18.00'), date=timezone.localdate())
+        SharedOrder.objects.create(supplier=cls.supplier, vendor=cls.vendor, order_id='SO1', item_name='Bolt',
+                                   quantity=1, amount=Decimal('18.00'))
+
+    def setUp(self):
+        cache.clear()
+
+    def assertSameAsSync(self, view, user, path):
+        self.client.force_login(user)
+        expected = self.client.get(path)
+        self.assertEqual(async_to_sync(call)(view, user, path), (expected.status_code, expected.json()))
+
+    def test_product_list(self):
+        self.assertSameAsSync(product_list_async, self.vendor.user, '/api/products/')
+        self.assertSameAsSync(product_list_async, self.vendor.user, '/api/products/?fields=id,name')
+
+    def test_order_list(self):
+        self.assertSameAsSync(order_list_async, self.vendor.user, '/api/orders/')
+
+    def test_profile(self):
+        self.assertSameAsSync(profile_view_async, self.vendor.user, '/api/profile/')
+        self.assertSameAsSync(profile_view_async, self.supplier.user, '/api/profile/')
+
+    def test_supplier_dashboard(self):
+        self.assertSameAsSync(supplier_dashboard_api_async, self.supplier.user, '/supplier/api/dashboard/')
+        self.assertSameAsSync(supplier_dashboard_api_async, self.supplier.user,
+                              '/supplier/api/dashboard/?fields=stats')
+        status_code, body = async_to_sync(call)(
+            supplier_dashboard_api_async, self.supplier.user, '/supplier/api/dashboard/?fields=stats')
+        self.assertEqual(body["stats"]["activeProducts"], 1)
+
+
+class GatherQueriesTests(TransactionTestCase):
+
+    def test_runs_concurrently_on_separate_connections(self):
+        barrier = threading.Barrier(2)
+
+        def used():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            barrier.wait(timeout=5)  # both are running at once
+            return id(connection.connection)
+
+        first, second = async_to_sync(gather_queries)((used,), (used,))
+        self.assertNotEqual(first, second)
+
+    def test_runs_in_turn_inside_a_transaction(self):
+        def ident(value):
+            return value, threading.get_ident()
+
+        with transaction.atomic():
+            results = async_to_sync(gather_queries)((ident, 1), (ident, 2))
+        self.assertEqual([value for value, _ in results], [1, 2])
+        self.assertEqual({thread for _, thread in results}, {threading.get_ident()})
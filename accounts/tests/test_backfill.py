@@ -0,0 +1,49 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from accounts.backfill import backfill_product_suppliers
+from accounts.models import Product, SupplierProfile
+
+from .utils import make_product, make_supplier
+
+
+class SupplierBackfillTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.mill = make_supplier('mill')
+        cls.mill.organization_name = 'Acme Mill'
+        cls.mill.save()
+        cls.products = [make_product(f'Bolt {i}', 10, supplier=name) for i, name in
+                        enumerate(['Acme Mill', '  acme mill ', 'Unknown Ltd', ''])]
+
+    def setUp(self):
+        cache.clear()
+
+    def linked(self):
+        return list(Product.objects.order_by('id').values_list('supplier_profile_id', flat=True))
+
+    def test_matches_names_in_batches(self):
+        self.assertEqual(backfill_product_suppliers(Product, SupplierProfile, batch_size=1, pause=0), 2)
+        self.assertEqual(self.linked(), [self.mill.id, self.mill.id, None, None])
+
+    def test_resumes_with_unlinked_rows_only(self):
+        Product.objects.filter(pk=self.products[0].pk).update(supplier_profile=self.mill)
+        self.assertEqual(backfill_product_suppliers(Product, SupplierProfile, pause=0), 1)
+        self.assertEqual(backfill_product_suppliers(Product, SupplierProfile, pause=0), 0)
+
+    def test_catalog_filter_by_supplier(self):
+        backfill_product_suppliers(Product, SupplierProfile, pause=0)
+        self.client.force_login(self.mill.user)
+        body = self.client.get(f'/api/products/?supplier={self.mill.id}').json()
+        self.assertEqual({p['id'] for p in body}, {p.id for p in self.products[:2]})
+
+    def test_rename_updates_display_copy(self):
+        backfill_product_suppliers(Product, SupplierProfile, pause=0)
+        with mock.patch('accounts.events.publish'), self.captureOnCommitCallbacks(execute=True):
+            self.mill.organization_name = 'Acme Works'
+            self.mill.save()
+        self.assertEqual(list(Product.objects.filter(supplier_profile=self.mill).values_list('supplier', flat=True)),
+                         ['Acme Works', 'Acme Works'])
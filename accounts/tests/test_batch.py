@@ -0,0 +1,54 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from accounts.views import MAX_BATCH_REQUESTS, gather_queries
+
+from .utils import make_product, make_vendor
+
+
+class BatchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendor = make_vendor('shop')
+        cls.product = make_product('Bolt', 20)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.vendor.user)
+
+    def batch(self, paths, **headers):
+        return self.client.post('/api/batch/', json.dumps({"requests": paths}), content_type='application/json',
+                                headers=headers)
+
+    def test_responses_in_order(self):
+        with mock.patch('accounts.views.gather_queries', wraps=gather_queries) as gathered:
+            response = self.batch(['/api/profile/', '/nowhere/', '/api/batch/', f'/api/products/{self.product.id}/'])
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['responses']
+        self.assertEqual([r['status'] for r in results], [200, 404, 400, 200])
+        self.assertEqual(results[0]['body']['email'], self.vendor.user.email)
+        self.assertEqual(results[3]['body']['id'], self.product.id)
+        self.assertEqual(len(gathered.call_args.args), 2)  # only the resolved, non-nested paths
+
+    def test_query_string(self):
+        results = self.batch(['/api/products/?fields=id,name']).json()['responses']
+        self.assertEqual(results[0]['body'], [{"id": self.product.id, "name": "Bolt"}])
+
+    def test_conditional_headers_not_passed_on(self):
+        etag = self.client.get('/api/products/').headers['ETag']
+        results = self.batch(['/api/products/'], if_none_match=etag).json()['responses']
+        self.assertEqual(results[0]['status'], 200)
+        self.assertEqual(results[0]['body'][0]['id'], self.product.id)
+
+    def test_limits(self):
+        self.assertEqual(self.batch(['/api/profile/'] * (MAX_BATCH_REQUESTS + 1)).status_code, 400)
+        self.assertEqual(self.client.post('/api/batch/', 'nope', content_type='application/json').status_code, 400)
+        self.assertEqual(self.client.get('/api/batch/').status_code, 405)
+
+    def test_needs_login(self):
+        self.client.logout()
+        self.assertEqual(self.batch(['/api/profile/']).status_code, 403)
@@ -0,0 +1,68 @@
+import io
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from accounts.dataset import DatasetGenerator
+from accounts.management.commands.benchmark import BENCHMARK_SETTINGS, END_DATE, Command
+
+
+def measurement(p50_ms=10.0, queries=3, peak_kb=100.0):
+    return {'p50_ms': p50_ms, 'p95_ms': p50_ms, 'p99_ms': p50_ms, 'queries': queries, 'peak_kb': peak_kb}
+
+
+class CompareTests(TestCase):
+
+    def setUp(self):
+        self.command = Command(stdout=io.StringIO())
+        self.baselines = {'0.1': {'product-list': measurement()}}
+
+    def compare(self, **measured):
+        return self.command._compare(self.baselines, {'0.1': {'product-list': measurement(**measured)}}, 0.5)
+
+    def test_within_tolerance(self):
+        self.assertEqual(self.compare(p50_ms=14.9, peak_kb=150.0), [])
+
+    def test_more_queries(self):
+        self.assertEqual(self.compare(queries=4), ["product-list at scale 0.1: 4 queries, baseline 3"])
+
+    def test_latency_needs_an_absolute_difference(self):
+        self.baselines['0.1']['product-list'] = measurement(p50_ms=2.0)
+        self.assertEqual(self.compare(p50_ms=6.9), [])
+        self.assertEqual(len(self.compare(p50_ms=7.1)), 1)
+
+    def test_memory(self):
+        self.assertEqual(len(self.compare(peak_kb=151.0)), 1)
+
+    def test_missing_baseline_is_only_a_warning(self):
+        regressions = self.command._compare({}, {'0.1': {'product-list': measurement()}}, 0.5)
+        self.assertEqual(regressions, [])
+        self.assertIn("No baseline for product-list", self.command.stdout.getvalue())
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'], **BENCHMARK_SETTINGS)
+class MeasureTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        DatasetGenerator(0.02, seed=0, end_date=END_DATE).generate()
+
+    def setUp(self):
+        cache.clear()
+        self.command = Command(stdout=io.StringIO())
+        self.command._prepare()
+
+    def test_queries_are_measured_cold(self):
+        measured = self.command._measure('supplier-dashboard-api', requests=2, warmup=1)
+        self.assertEqual(set(measured), {'p50_ms', 'p95_ms', 'p99_ms', 'queries', 'peak_kb'})
+        # Warm, the dashboard aggregates come from the cache.
+        with CaptureQueriesContext(connection) as warm:
+            self.command._send('supplier-dashboard-api')
+        self.assertGreater(measured['queries'], len(warm))
+
+    def test_writes(self):
+        for route in ('create-order', 'supplier-inventory-add-api', 'supplier-inventory-delete-api'):
+            with self.subTest(route=route):
+                self.assertGreater(self.command._measure(route, requests=2, warmup=0)['queries'], 0)
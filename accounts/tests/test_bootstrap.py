@@ -0,0 +1,68 @@
+import datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.changes import decode_token
+from accounts.models import Order
+
+from .utils import make_product, make_supplier, make_vendor
+
+
+@override_settings(REST_FRAMEWORK={'PAGE_SIZE': 2})
+class VendorBootstrapTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendor = make_vendor('shop')
+        cls.products = [make_product(f'Product {i}', 10 + i) for i in range(3)]
+        today = timezone.localdate()
+
+        def order(number, progress, days_ago):
+            return Order.objects.create(vendor=cls.vendor, order_id=f'ORD{number:03d}', customer='Shop',
+                                        item_name='Bolt', progress=progress, amount=Decimal('10.00'),
+                                        date=today - datetime.timedelta(days=days_ago))
+        cls.in_progress = order(1, 1, 400)  # stays current however old
+        cls.done = [order(n, 3, n) for n in range(2, 9)]
+        cls.cold = order(9, 3, 400)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.vendor.user)
+
+    def test_sections(self):
+        body = self.client.get('/api/vendor/bootstrap/').json()
+        self.assertEqual(body['profile']['email'], self.vendor.user.email)
+
+        catalog = body['catalog']
+        self.assertEqual([p['id'] for p in catalog['results']], [p.id for p in self.products[:2]])
+        self.assertEqual(catalog['next_offset'], 2)
+        decode_token(catalog['changes_token'])
+
+        orders = body['orders']
+        self.assertEqual([o['id'] for o in orders['currentOrders']], [self.in_progress.id])
+        self.assertEqual([o['id'] for o in orders['recentOrders']], [o.id for o in self.done[:5]])
+
+    def test_next_page_follows_offset(self):
+        body = self.client.get('/api/vendor/bootstrap/').json()
+        rest = self.client.get(f"/api/products/?offset={body['catalog']['next_offset']}").json()
+        self.assertEqual([p['id'] for p in rest], [self.products[2].id])
+
+    def test_repeat_load_is_cached_until_orders_change(self):
+        first = self.client.get('/api/vendor/bootstrap/').json()
+        with self.assertNumQueries(2):  # the user and the vendor profile
+            self.assertEqual(self.client.get('/api/vendor/bootstrap/').json(), first)
+
+        with mock.patch('accounts.events.publish'), self.captureOnCommitCallbacks(execute=True):
+            self.in_progress.progress = 2
+            self.in_progress.save()
+        body = self.client.get('/api/vendor/bootstrap/').json()
+        self.assertEqual(body['orders']['currentOrders'][0]['progress'], 2)
+        self.assertEqual(body['catalog'], first['catalog'])
+
+    def test_vendors_only(self):
+        self.client.force_login(make_supplier('mill').user)
+        self.assertEqual(self.client.get('/api/vendor/bootstrap/').status_code, 403)
@@ -0,0 +1,85 @@
+import datetime
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from accounts.changes import (
+    TOMBSTONE_RETENTION, InvalidToken, catalog_changes, decode_token, encode_token, prune_tombstones,
+)
+from accounts.models import Product, ProductTombstone, SupplierInventory
+
+from .utils import make_product, make_supplier
+
+
+class TokenTests(SimpleTestCase):
+
+    def test_round_trip(self):
+        moment = datetime.datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc)
+        self.assertEqual(decode_token(encode_token(moment, 42)), (moment, 42))
+
+    def test_invalid(self):
+        for token in ('', 'abc', '1-2-3', '99999999999999999999999-1'):
+            with self.subTest(token=token), self.assertRaises(InvalidToken):
+                decode_token(token)
+
+
+class CatalogChangesTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = [make_product(f'Product {i}', 10) for i in range(3)]
+        # Older than the overlap, so a fresh token sees nothing.
+        Product.objects.update(updated_at=timezone.now() - datetime.timedelta(hours=1))
+
+    def setUp(self):
+        publish = mock.patch('accounts.events.publish')
+        publish.start()
+        self.addCleanup(publish.stop)
+
+    def changes(self, since=None):
+        response = self.client.get('/api/products/changes/', {'since': since} if since else {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_full_load_in_pages(self):
+        changed, deleted, token, more = catalog_changes(page_size=2)
+        self.assertEqual((changed, deleted, more), (self.products[:2], [], True))
+        changed, deleted, token, more = catalog_changes(token, page_size=2)
+        self.assertEqual((changed, more), (self.products[2:], False))
+        self.assertEqual(catalog_changes(token)[0], [])
+
+    def test_updates_and_deletions(self):
+        token = self.changes()['token']
+        self.assertEqual(self.changes(token)['changed'], [])
+
+        supplier = make_supplier('mill')
+        deleted_id = self.products[0].id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.products[0].delete()
+            SupplierInventory.objects.create(supplier=supplier, product=self.products[1], stock_quantity=2)
+        body = self.changes(token)
+        self.assertEqual([p['id'] for p in body['changed']], [self.products[1].id])
+        self.assertEqual(body['deleted'], [deleted_id])
+
+    def test_sparse_fields(self):
+        body = self.changes()
+        self.assertEqual(set(self.client.get('/api/products/changes/?fields=id,name').json()['changed'][0]),
+                         {'id', 'name'})
+        self.assertGreater(len(body['changed'][0]), 2)
+
+    def test_bad_and_expired_tokens(self):
+        self.assertEqual(self.client.get('/api/products/changes/?since=nope').status_code, 400)
+        expired = encode_token(timezone.now() - TOMBSTONE_RETENTION - datetime.timedelta(days=1))
+        response = self.client.get(f'/api/products/changes/?since={expired}')
+        self.assertEqual(response.status_code, 410)
+        self.assertTrue(response.json()['resync'])
+
+    def test_prune_tombstones(self):
+        deleted_id = self.products[0].id
+        self.products[0].delete()
+        old = ProductTombstone.objects.create(product_id=999)
+        ProductTombstone.objects.filter(pk=old.pk).update(
+            deleted_at=timezone.now() - TOMBSTONE_RETENTION - datetime.timedelta(days=1))
+        self.assertEqual(prune_tombstones(), 1)
+        self.assertEqual(list(ProductTombstone.objects.values_list('product_id', flat=True)), [deleted_id])
@@ -0,0 +1,97 @@
+import gzip
+import json
+import zlib
+
+import brotli
+from django.core.cache import cache
+from django.http import HttpResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from accounts import compression
+from accounts.compression import StreamCompressor, compress_response, negotiate
+
+from .utils import make_product
+
+BODY = json.dumps([{"id": i, "name": f"Product {i}", "category": "Hardware"} for i in range(100)]).encode()
+
+
+@override_settings(COMPRESSION_MIN_BYTES=1024)
+class CompressResponseTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def compressed(self, response, accept='br, gzip'):
+        return compress_response(self.factory.get('/', headers={'accept-encoding': accept}), response)
+
+    def test_negotiate(self):
+        self.assertEqual(negotiate('gzip, deflate, br'), 'br')
+        self.assertEqual(negotiate('gzip;q=1.0, br;q=0.5'), 'gzip')
+        self.assertEqual(negotiate('br;q=0, gzip;q=0'), None)
+        self.assertEqual(negotiate('*'), 'br')
+        self.assertEqual(negotiate('identity'), None)
+        self.assertEqual(negotiate(''), None)
+
+    def test_json_compressed(self):
+        response = self.compressed(HttpResponse(BODY, content_type='application/json'))
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), BODY)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        response = self.compressed(HttpResponse(BODY, content_type='application/json'), accept='gzip')
+        self.assertEqual(gzip.decompress(response.content), BODY)
+
+    def test_left_alone(self):
+        cases = {
+            'small': HttpResponse(b'{"ok": true}', content_type='application/json'),
+            'binary': HttpResponse(BODY, content_type='image/png'),
+            'encoded': HttpResponse(BODY, content_type='application/json', headers={'Content-Encoding': 'br'}),
+        }
+        for name, response in cases.items():
+            with self.subTest(name):
+                self.assertIs(self.compressed(response).content, response.content)
+        self.assertFalse(self.compressed(HttpResponse(BODY, content_type='application/json'),
+                                         accept='identity').has_header('Content-Encoding'))
+
+    def test_csrf_token_responses_not_compressed(self):
+        request = self.factory.get('/', headers={'accept-encoding': 'br'})
+        get_token(request)
+        response = compress_response(request, HttpResponse(BODY, content_type='text/html'))
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_etag_weakened_and_compressed_body_reused(self):
+        compression._cache.clear()
+        response = self.compressed(HttpResponse(BODY, content_type='application/json', headers={'ETag': '"abc"'}))
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        again = self.compressed(HttpResponse(BODY, content_type='application/json', headers={'ETag': '"abc"'}))
+        self.assertIs(again.content, response.content)
+
+    def test_streaming_chunks_decode_as_they_arrive(self):
+        response = self.compressed(StreamingHttpResponse(iter([b'data: one\n\n', b'data: two\n\n']),
+                                                         content_type='text/event-stream'), accept='gzip')
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        chunks = iter(response.streaming_content)
+        self.assertEqual(decoder.decompress(next(chunks)), b'data: one\n\n')
+        self.assertEqual(decoder.decompress(next(chunks)), b'data: two\n\n')
+
+    def test_brotli_stream_compressor(self):
+        compressor = StreamCompressor('br')
+        data = compressor.chunk(b'a' * 100) + compressor.chunk(b'b' * 100) + compressor.finish()
+        self.assertEqual(brotli.decompress(data), b'a' * 100 + b'b' * 100)
+
+
+class CompressionMiddlewareTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_catalog_compressed(self):
+        for i in range(30):
+            make_product(f'Product {i}', i)
+        plain = self.client.get('/api/products/')
+        response = self.client.get('/api/products/', headers={'accept-encoding': 'gzip, br'})
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+        self.assertLess(len(response.content), len(plain.content) / 3)
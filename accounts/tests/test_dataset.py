@@ -0,0 +1,60 @@
+import datetime
+import io
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from accounts.dataset import ACTIVE_DAYS, DatasetGenerator
+from accounts.models import BestOffer, Order, Product, SharedOrder, SupplierInventory, SupplierProfile, VendorProfile
+
+END_DATE = datetime.date(2025, 6, 30)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class DatasetTests(TestCase):
+
+    def test_generate(self):
+        counts = DatasetGenerator(0.02, seed=3, end_date=END_DATE, password='pw').generate()
+        self.assertEqual(counts, {'vendors': 2, 'suppliers': 1, 'products': 20, 'inventory': 40, 'orders': 200,
+                                  'shared_orders': 100})
+        self.assertEqual([model.objects.count() for model in (VendorProfile, SupplierProfile, Product, Order,
+                                                               SharedOrder)], [2, 1, 20, 200, 100])
+        # One supplier can list each product only once.
+        self.assertLessEqual(SupplierInventory.objects.count(), 20)
+        self.assertEqual(BestOffer.objects.count(), 20)
+        self.assertTrue(User.objects.get(username='vendor-3-0@example.com').check_password('pw'))
+
+        self.assertLessEqual(max(Order.objects.values_list('date', flat=True)), END_DATE)
+        active_since = END_DATE - datetime.timedelta(days=ACTIVE_DAYS)
+        self.assertFalse(Order.objects.filter(progress__lt=3, date__lte=active_since).exists())
+
+    def test_deterministic(self):
+        def rows(seed):
+            loaded = {}
+
+            def load(generator, model, attnames, rows):
+                loaded[model.__name__] = list(rows)
+                return len(loaded[model.__name__])
+            with mock.patch.object(DatasetGenerator, '_load', load):
+                generator = DatasetGenerator(0.02, seed=seed, end_date=END_DATE)
+                generator.vendors()
+                generator.suppliers()
+                generator.products()
+                generator.inventory()
+                generator.orders()
+            loaded.pop('User')  # salted password hashes
+            return loaded
+
+        self.assertEqual(rows(1), rows(1))
+        self.assertNotEqual(rows(1)['Order'], rows(2)['Order'])
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('generate_dataset', scale=0.01, seed=5, end_date=END_DATE, stdout=out)
+        self.assertIn('Log in as vendor-5-0@example.com', out.getvalue())
+        with self.assertRaisesMessage(CommandError, 'already exists'):
+            call_command('generate_dataset', scale=0.01, seed=5, stdout=out)
+        with self.assertRaises(CommandError):
+            call_command('generate_dataset', scale=0, seed=6, stdout=out)
@@ -0,0 +1,106 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from accounts.dedupe import duplicate_groups, find_canonical, merge_products, normalize, similarity
+from accounts.models import Product, ProductTombstone, SupplierInventory
+
+from .utils import make_product, make_supplier
+
+
+class NameMatchingTests(SimpleTestCase):
+
+    def test_normalize(self):
+        self.assertEqual(normalize('Premium Wheat Flour (10 Kgs)'), '10kg flour premium wheat')
+        self.assertEqual(normalize('Salt & Pepper'), normalize('pepper and salt'))
+
+    def test_quantities_must_agree(self):
+        self.assertEqual(similarity(normalize('Rice 10kg'), normalize('Rice 5kg')), 0.0)
+        self.assertEqual(similarity(normalize('Rice 10 kilos'), normalize('rice 10KG')), 1.0)
+
+    def test_duplicate_groups(self):
+        rows = [(1, 'Basmati Rice 5kg', 'Grains'), (2, 'basmati rice (5 kgs)', 'grains'),
+                (3, 'Basmati Rice 10kg', 'Grains'), (4, 'Basmati Rice 5kg', 'Spices'),
+                (5, 'Basmati Rices 5kg', 'Grains')]
+        self.assertEqual(duplicate_groups(rows), {1: [2, 5]})
+
+
+class CanonicalProductTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.rice = make_product('Basmati Rice 5kg', 20, category='Grains')
+        cls.owner = make_supplier('owner')
+        cls.other = make_supplier('other')
+        Product.objects.filter(pk=cls.rice.pk).update(supplier_profile=cls.owner)
+        SupplierInventory.objects.create(supplier=cls.owner, product=cls.rice, stock_quantity=5)
+
+    def setUp(self):
+        cache.clear()
+        publish = mock.patch('accounts.events.publish')
+        publish.start()
+        self.addCleanup(publish.stop)
+
+    def add(self, supplier, **data):
+        self.client.force_login(supplier.user)
+        data = {"name": 'basmati rice (5 kgs)', "category": 'grains', "price": '18.00', "stock_quantity": 3, **data}
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/supplier/api/inventory/add/', data, content_type='application/json')
+
+    def test_find_canonical(self):
+        self.assertEqual(find_canonical('basmati rice (5 kgs)', 'grains'), self.rice)
+        self.assertEqual(find_canonical('Basmati Rices 5kg', 'Grains'), self.rice)
+        self.assertIsNone(find_canonical('Basmati Rice 10kg', 'Grains'))
+        self.assertIsNone(find_canonical('Basmati Rice 5kg', 'Spices'))
+
+    def test_add_reuses_canonical_product(self):
+        response = self.add(self.other)
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual((body['id'], body['matched_existing']), (self.rice.id, True))
+        self.assertEqual(Decimal(str(body['price'])), Decimal('18.00'))  # the supplier's own price
+        self.assertEqual(SupplierInventory.objects.get(supplier=self.other).custom_price, Decimal('18.00'))
+        self.assertEqual(Product.objects.count(), 1)
+
+    def test_add_new_product(self):
+        body = self.add(self.other, name='Jasmine Rice 5kg').json()
+        self.assertFalse(body['matched_existing'])
+        self.assertEqual(Product.objects.get(pk=body['id']).supplier_profile, self.other)
+
+    def delete(self, supplier):
+        inventory = SupplierInventory.objects.get(supplier=supplier, product=self.rice)
+        self.client.force_login(supplier.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.delete(f'/supplier/api/inventory/delete/{inventory.id}/')
+
+    def test_delete_keeps_shared_product(self):
+        self.add(self.other)
+        self.assertEqual(self.delete(self.owner).status_code, 200)
+        self.assertEqual(self.delete(self.other).status_code, 200)
+        # Nobody stocks it any more, but it wasn't the last remover's product.
+        self.assertTrue(Product.objects.filter(pk=self.rice.pk).exists())
+        self.assertFalse(ProductTombstone.objects.exists())
+
+    def test_delete_removes_own_unshared_product(self):
+        self.assertEqual(self.delete(self.owner).status_code, 200)
+        self.assertFalse(Product.objects.filter(pk=self.rice.pk).exists())
+        self.assertTrue(ProductTombstone.objects.filter(product_id=self.rice.pk).exists())
+
+    def test_delete_keeps_imported_product(self):
+        Product.objects.filter(pk=self.rice.pk).update(supplier_profile=None)
+        self.delete(self.owner)
+        self.assertTrue(Product.objects.filter(pk=self.rice.pk).exists())
+
+    def test_merge_products(self):
+        duplicate = make_product('basmati rice (5 kgs)', 22, category='Grains', rating=2.0, rating_count=30)
+        SupplierInventory.objects.create(supplier=self.owner, product=duplicate, stock_quantity=2,
+                                         custom_price=Decimal('19.00'))
+        SupplierInventory.objects.create(supplier=self.other, product=duplicate, stock_quantity=4)
+        canonical = merge_products(self.rice.pk, [duplicate.pk])
+        self.assertFalse(Product.objects.filter(pk=duplicate.pk).exists())
+        self.assertEqual((canonical.rating, canonical.rating_count), (2.5, 40))
+        stock = dict(SupplierInventory.objects.filter(product=self.rice).values_list('supplier_id', 'stock_quantity'))
+        self.assertEqual(stock, {self.owner.id: 7, self.other.id: 4})
+        self.assertEqual(SupplierInventory.objects.get(supplier=self.owner).custom_price, Decimal('19.00'))
@@ -0,0 +1,82 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from accounts.etags import versioned_etag
+from accounts.models import Order
+from accounts.partitions import hot_since
+from accounts.versioning import CATALOG_SCOPE, bump_version, orders_scope
+from accounts.views import product_list, product_list_async
+
+from .utils import make_vendor, with_session
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def test_etag_follows_versions(self):
+        etag = versioned_etag(CATALOG_SCOPE)
+        request = with_session(self.factory.get('/api/products/'))
+        first = etag(request)
+        self.assertEqual(etag(request), first)
+        bump_version(CATALOG_SCOPE)
+        self.assertNotEqual(etag(request), first)
+
+    def test_per_user_scope(self):
+        etag = versioned_etag(orders_scope)
+        self.assertIsNone(etag(with_session(self.factory.get('/api/orders/'))))
+        mine = etag(with_session(self.factory.get('/api/orders/'), user_id=1))
+        theirs = etag(with_session(self.factory.get('/api/orders/'), user_id=2))
+        self.assertNotEqual(mine, theirs)
+        bump_version(orders_scope(2))
+        self.assertEqual(etag(with_session(self.factory.get('/api/orders/'), user_id=1)), mine)
+
+    def test_unsafe_method_has_no_etag(self):
+        request = with_session(self.factory.post('/api/orders/'), user_id=1)
+        self.assertIsNone(versioned_etag(orders_scope)(request))
+
+    def test_window_changes_etag(self):
+        etag = versioned_etag(orders_scope, window=hot_since)
+        request = with_session(self.factory.get('/api/orders/'), user_id=1)
+        first = etag(request)
+        with override_settings(ORDER_HOT_DAYS=settings.ORDER_HOT_DAYS + 1):
+            self.assertNotEqual(etag(request), first)
+
+    def test_not_modified(self):
+        response = product_list(with_session(self.factory.get('/api/products/')))
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        response = product_list(with_session(self.factory.get('/api/products/', headers={'If-None-Match': etag})))
+        self.assertEqual(response.status_code, 304)
+        bump_version(CATALOG_SCOPE)
+        response = product_list(with_session(self.factory.get('/api/products/', headers={'If-None-Match': etag})))
+        self.assertEqual(response.status_code, 200)
+
+    async def test_not_modified_async(self):
+        factory = AsyncRequestFactory()
+        response = await product_list_async(with_session(factory.get('/api/products/')))
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        response = await product_list_async(with_session(factory.get('/api/products/', headers={'If-None-Match': etag})))
+        self.assertEqual(response.status_code, 304)
+
+    def test_unchanged_poll_needs_no_query(self):
+        vendor = make_vendor('shop')
+        self.client.force_login(vendor.user)
+        etag = self.client.get('/api/orders/')['ETag']
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/orders/', headers={'If-None-Match': etag}).status_code, 304)
+
+        with mock.patch('accounts.events.publish'), self.captureOnCommitCallbacks(execute=True):
+            Order.objects.create(vendor=vendor, order_id='ORD001', customer='Shop', item_name='Bolt', progress=1,
+                                 amount=Decimal('1.00'), date=timezone.localdate())
+        response = self.client.get('/api/orders/', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['currentOrders']), 1)
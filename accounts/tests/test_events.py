@@ -0,0 +1,93 @@
+import asyncio
+import json
+from decimal import Decimal
+from unittest import mock
+
+import redis
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+
+from accounts import events
+from accounts.models import Order, SharedOrder
+
+from .utils import make_supplier, make_vendor
+
+
+def as_json(payload):
+    return json.loads(json.dumps(payload, cls=JSONEncoder))
+
+
+class FakeHub:
+    def __init__(self, *messages):
+        self.queue = asyncio.Queue()
+        for message in messages:
+            self.queue.put_nowait(message)
+        self.unsubscribed = False
+
+    async def subscribe(self, channels):
+        return self.queue
+
+    async def unsubscribe(self, channels, queue):
+        self.unsubscribed = True
+
+
+class OrderEventTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendor = make_vendor('shop')
+        cls.supplier = make_supplier('mill')
+
+    def test_stream_refused_under_wsgi(self):
+        self.client.force_login(self.vendor.user)
+        self.assertEqual(self.client.get('/api/orders/stream/').status_code, 204)
+
+    async def test_stream_needs_a_profile(self):
+        response = await self.async_client.get('/api/orders/stream/')
+        self.assertEqual(response.status_code, 401)
+        await self.async_client.aforce_login(await User.objects.acreate(username='nobody'))
+        response = await self.async_client.get('/api/orders/stream/')
+        self.assertEqual(response.status_code, 403)
+
+    def test_order_event_matches_order_list(self):
+        with mock.patch('accounts.events.publish') as publish, self.captureOnCommitCallbacks(execute=True):
+            order = Order.objects.create(vendor=self.vendor, order_id='ORD001', customer='Shop', item_name='Bolt',
+                                         progress=1, amount=Decimal('12.50'), date=timezone.localdate())
+        channels, event, payload = publish.call_args.args
+        self.assertEqual(channels, [events.vendor_channel(self.vendor.id)])
+        self.assertEqual(event, 'order.created')
+
+        self.client.force_login(self.vendor.user)
+        listed = self.client.get('/api/orders/').json()['currentOrders']
+        self.assertEqual([as_json(payload)], listed)
+        self.assertEqual(listed[0]['id'], order.id)
+
+    def test_shared_order_event_matches_supplier_list(self):
+        with mock.patch('accounts.events.publish') as publish, self.captureOnCommitCallbacks(execute=True):
+            SharedOrder.objects.create(supplier=self.supplier, vendor=self.vendor, order_id='SO1',
+                                       item_name='Bolt', quantity=3, amount=Decimal('30.00'))
+        channels, event, payload = publish.call_args.args
+        self.assertEqual(channels, [events.supplier_channel(self.supplier.id), events.vendor_channel(self.vendor.id)])
+        self.assertEqual(event, 'shared_order.created')
+
+        self.client.force_login(self.supplier.user)
+        self.assertEqual([as_json(payload)], self.client.get('/supplier/api/orders/').json())
+
+    def test_publish_survives_redis_errors(self):
+        publisher = mock.MagicMock()
+        publisher.pipeline.side_effect = redis.ConnectionError("down")
+        with mock.patch('accounts.events._publisher', publisher), self.assertLogs('accounts.events', 'WARNING'):
+            events.publish(['orders:vendor:1'], 'order.created', {"id": 1})
+
+    async def test_stream_frames(self):
+        message = json.dumps({"event": "order.updated", "data": {"id": 7, "progress": 2}})
+        hub = FakeHub(message, None)
+        with mock.patch('accounts.events._hub', return_value=hub):
+            frames = [frame async for frame in events.stream(['orders:vendor:1'])]
+        self.assertEqual(frames, [
+            f"retry: {events.RETRY_MILLISECONDS}\n\n",
+            'event: order.updated\ndata: {"id": 7, "progress": 2}\n\n',
+        ])
+        self.assertTrue(hub.unsubscribed)
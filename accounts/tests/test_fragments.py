@@ -0,0 +1,66 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.fragments import cached_fragment
+from accounts.models import Order
+from accounts.versioning import CATALOG_SCOPE, bump_version, get_version, get_versions, orders_scope
+
+from .utils import make_product, make_vendor
+
+
+class VersionTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_bump(self):
+        version = get_version(CATALOG_SCOPE)
+        self.assertEqual(get_version(CATALOG_SCOPE), version)
+        self.assertEqual(bump_version(CATALOG_SCOPE), version + 1)
+        self.assertEqual(get_versions(CATALOG_SCOPE, 'other'), [version + 1, get_version('other')])
+
+    def test_bump_after_eviction_moves_forward(self):
+        version = get_version(CATALOG_SCOPE)
+        cache.clear()
+        self.assertGreaterEqual(bump_version(CATALOG_SCOPE), version)
+
+    def test_writes_bump_their_scopes(self):
+        vendor = make_vendor('shop')
+        catalog, orders = get_version(CATALOG_SCOPE), get_version(orders_scope(vendor.user_id))
+        with mock.patch('accounts.events.publish'), self.captureOnCommitCallbacks(execute=True):
+            make_product('Bolt', 1)
+        self.assertGreater(get_version(CATALOG_SCOPE), catalog)
+        self.assertEqual(get_version(orders_scope(vendor.user_id)), orders)
+        with mock.patch('accounts.events.publish'), self.captureOnCommitCallbacks(execute=True):
+            Order.objects.create(vendor=vendor, order_id='ORD001', customer='Shop', item_name='Bolt', progress=1,
+                                 amount=Decimal('1.00'), date=timezone.localdate())
+        self.assertGreater(get_version(orders_scope(vendor.user_id)), orders)
+
+
+class CachedFragmentTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_built_once_per_version(self):
+        build = mock.Mock(side_effect=['first', 'second'])
+        self.assertEqual(cached_fragment('section', [CATALOG_SCOPE, 'other'], build), 'first')
+        self.assertEqual(cached_fragment('section', [CATALOG_SCOPE, 'other'], build), 'first')
+        bump_version('other')
+        self.assertEqual(cached_fragment('section', [CATALOG_SCOPE, 'other'], build), 'second')
+        self.assertEqual(build.call_count, 2)
+
+    @override_settings(STORAGES={**settings.STORAGES, 'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'}})  # no collectstatic manifest here
+    def test_vendor_dashboard_renders_without_catalog_queries(self):
+        make_product('Bolt', 1)
+        self.client.force_login(make_vendor('shop').user)
+        with self.assertNumQueries(2):  # the user and the vendor profile
+            response = self.client.get('/vendor/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'Bolt')
@@ -0,0 +1,35 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import DatabaseError, connections
+from django.test import TestCase
+
+from accounts.views import connection_stats
+
+
+class HealthCheckTests(TestCase):
+
+    def test_public_status_only(self):
+        response = self.client.get('/api/health/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+
+    def test_staff_get_details(self):
+        self.client.force_login(User.objects.create_user('ops', 'ops@example.com', 'x', is_staff=True))
+        body = self.client.get('/api/health/').json()
+        self.assertEqual(body["status"], "ok")
+        self.assertIn("replica_lag_seconds", body["database"])
+        self.assertIn("cache", body)
+
+    def test_database_error_is_not_disclosed(self):
+        with mock.patch.object(connections['default'], 'cursor', side_effect=DatabaseError("password=hunter2")):
+            response = self.client.get('/api/health/')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {"status": "error"})
+
+    def test_connection_stats(self):
+        stats = connection_stats()
+        self.assertEqual(stats["vendor"], connections['default'].vendor)
+        self.assertIn("conn_max_age", stats)
+        if getattr(connections['default'], 'pool', None) is None:
+            self.assertIsNone(stats["pool"])
@@ -0,0 +1,65 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from accounts.models import BestOffer, SupplierInventory
+from accounts.offers import rebuild_best_offers, refresh_best_offers
+
+from .utils import make_product, make_supplier
+
+
+class BestOfferTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.product = make_product('Bolt', 20)
+        cls.cheap = make_supplier('cheap')
+        cls.dear = make_supplier('dear')
+
+    def setUp(self):
+        cache.clear()
+
+    def stock(self, supplier, quantity, price=None):
+        with mock.patch('accounts.events.publish'), self.captureOnCommitCallbacks(execute=True):
+            return SupplierInventory.objects.create(supplier=supplier, product=self.product,
+                                                    stock_quantity=quantity, custom_price=price)
+
+    def best(self):
+        offer = BestOffer.objects.get(product=self.product)
+        return offer.best_price, offer.supplier_id, offer.total_stock
+
+    def test_cheapest_supplier_with_stock(self):
+        self.stock(self.dear, 3, Decimal('15.00'))
+        self.stock(self.cheap, 0, Decimal('10.00'))
+        self.assertEqual(self.best(), (Decimal('15.00'), self.dear.id, 3))
+
+        inventory = self.stock(self.cheap, 2)  # falls back to the list price
+        self.assertEqual(self.best(), (Decimal('15.00'), self.dear.id, 5))
+        with self.captureOnCommitCallbacks(execute=True):
+            inventory.custom_price = Decimal('12.00')
+            inventory.save()
+        self.assertEqual(self.best(), (Decimal('12.00'), self.cheap.id, 5))
+
+    def test_removed_inventory(self):
+        inventory = self.stock(self.cheap, 2, Decimal('10.00'))
+        with self.captureOnCommitCallbacks(execute=True):
+            inventory.delete()
+        self.assertEqual(self.best(), (None, None, 0))
+
+    def test_refresh_in_two_queries(self):
+        with self.assertNumQueries(2):
+            refresh_best_offers([self.product.id])
+
+    def test_rebuild(self):
+        make_product('Nut', 1)
+        BestOffer.objects.all().delete()
+        self.assertEqual(rebuild_best_offers(batch_size=1), 2)
+        self.assertEqual(BestOffer.objects.count(), 2)
+
+    def test_serialized_with_products(self):
+        self.stock(self.cheap, 4, Decimal('10.00'))
+        self.client.force_login(self.cheap.user)
+        body = self.client.get(f'/api/products/{self.product.id}/').json()
+        self.assertEqual(body['best_offer'], {"price": 10.0, "supplier_id": self.cheap.id, "total_stock": 4})
@@ -0,0 +1,59 @@
+import io
+import os
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from accounts.models import SupplierProfile, VendorProfile
+from accounts.onboarding import bulk_onboard
+
+from .utils import make_vendor
+
+CSV = """email,user_type,password,first_name,company_name,organization_name,gst_number
+a@example.com,vendor,secret1,Ann,Ann's Shop,,GST1
+b@example.com,Supplier,,Bob,,Bob's Mill,
+taken@example.com,vendor,secret2,,Taken,,
+a@example.com,supplier,secret3,,,Again,
+,vendor,secret4,,,,
+c@example.com,customer,secret5,,,,
+d@example.com,supplier,secret6,Dee,,Dee's Farm,
+"""
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class BulkOnboardTests(TestCase):
+
+    def setUp(self):
+        user = make_vendor('taken').user
+        user.username = 'taken@example.com'
+        user.save()
+
+    def test_creates_accounts_in_chunks(self):
+        report = bulk_onboard(io.StringIO(CSV), chunk_size=2, workers=2)
+        self.assertEqual(report.created, {'vendor': 1, 'supplier': 2})
+        self.assertEqual(report.invites, 1)
+        self.assertEqual(sorted(report.duplicates), [(4, 'taken@example.com'), (5, 'a@example.com')])
+        self.assertEqual([line for line, _ in report.invalid], [6, 7])
+
+        ann = User.objects.get(username='a@example.com')
+        self.assertTrue(ann.check_password('secret1'))
+        self.assertEqual((ann.first_name, ann.vendor_profile.company_name, ann.vendor_profile.gst_number),
+                         ('Ann', "Ann's Shop", 'GST1'))
+        bob = User.objects.get(username='b@example.com')
+        self.assertFalse(bob.has_usable_password())
+        self.assertEqual(bob.supplier_profile.organization_name, "Bob's Mill")
+        self.assertEqual(SupplierProfile.objects.count(), 2)
+        self.assertEqual(VendorProfile.objects.count(), 2)
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write(CSV)
+        self.addCleanup(os.remove, f.name)
+        out = io.StringIO()
+        call_command('bulk_onboard', f.name, workers=1, stdout=out)
+        self.assertIn('Created 1 vendors and 2 suppliers (1 invite-only)', out.getvalue())
+        self.assertIn('Line 4: taken@example.com is already registered, skipped', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('bulk_onboard', f'{f.name}.missing', stdout=out)
@@ -0,0 +1,70 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from accounts.models import SupplierInventory
+from accounts.optimizer import CartOptimizer
+from accounts.pricing import PricingError
+
+from .utils import make_product, make_supplier
+
+
+class CartOptimizerTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.product = make_product('Bolt', 20)
+        cls.cheap = make_supplier('cheap')
+        cls.dear = make_supplier('dear')
+        SupplierInventory.objects.create(supplier=cls.cheap, product=cls.product, stock_quantity=5,
+                                         custom_price=Decimal('10.00'))
+        SupplierInventory.objects.create(supplier=cls.dear, product=cls.product, stock_quantity=10,
+                                         custom_price=Decimal('12.00'))
+
+    def split(self, result):
+        return {a['supplier_id']: (a['quantity'], a['unit_price']) for a in result['assignments']}
+
+    def test_fills_cheapest_first(self):
+        result = CartOptimizer([{"id": self.product.id, "quantity": 8}]).solve()
+        self.assertEqual(self.split(result), {self.cheap.id: (5, Decimal('10.00')),
+                                              self.dear.id: (3, Decimal('12.00'))})
+        self.assertEqual(result['total'], Decimal('86.00'))
+        self.assertEqual(result['unfilled'], [])
+        self.assertTrue(result['optimal'])
+
+    def test_reports_unfilled_quantity(self):
+        result = CartOptimizer([{"id": self.product.id, "quantity": 20}]).solve()
+        self.assertEqual(result['unfilled'], [{"product_id": self.product.id, "quantity": 5}])
+
+    def test_max_suppliers(self):
+        result = CartOptimizer([{"id": self.product.id, "quantity": 8}]).solve(max_suppliers=1)
+        self.assertEqual(self.split(result), {self.dear.id: (8, Decimal('12.00'))})
+        self.assertFalse(result['optimal'])
+
+    def test_min_order(self):
+        # 1 unit from the dear supplier falls short of the minimum, so it is dropped.
+        result = CartOptimizer([{"id": self.product.id, "quantity": 6}]).solve(min_order=Decimal('30'))
+        self.assertEqual(self.split(result), {self.cheap.id: (5, Decimal('10.00'))})
+        self.assertEqual(result['unfilled'], [{"product_id": self.product.id, "quantity": 1}])
+
+    def test_duplicate_rows_pool_stock(self):
+        SupplierInventory.objects.create(supplier=self.cheap, product=self.product, stock_quantity=4,
+                                         custom_price=Decimal('11.00'))
+        result = CartOptimizer([{"id": self.product.id, "quantity": 9}]).solve()
+        self.assertEqual(self.split(result), {self.cheap.id: (9, Decimal('10.00'))})
+
+    def test_invalid_quantity(self):
+        with self.assertRaises(PricingError):
+            CartOptimizer([{"id": self.product.id, "quantity": -1}])
+
+    def test_endpoint(self):
+        self.client.force_login(self.cheap.user)
+        response = self.client.post('/api/cart/optimize/', {"cart": [{"id": self.product.id, "quantity": 8}],
+                                                            "max_suppliers": 1}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([a['supplier_id'] for a in response.json()['assignments']], [self.dear.id])
+        for body in ({"cart": []}, {"cart": [{"id": self.product.id, "quantity": 1}], "max_suppliers": 0},
+                     {"cart": [{"id": self.product.id, "quantity": 1}], "min_order": "lots"}):
+            with self.subTest(body=body):
+                response = self.client.post('/api/cart/optimize/', body, content_type='application/json')
+                self.assertEqual(response.status_code, 400)
@@ -0,0 +1,103 @@
+import datetime
+import io
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import MonthlyOrderTotal, Order, SharedOrder
+from accounts.partitions import add_months, close_months, hot_since, live_totals_since, this_month
+
+from .utils import make_supplier, make_vendor
+
+
+class PartitionHelperTests(SimpleTestCase):
+
+    def test_add_months(self):
+        self.assertEqual(add_months(datetime.date(2024, 11, 1), 3), datetime.date(2025, 2, 1))
+        self.assertEqual(add_months(datetime.date(2024, 1, 1), -1), datetime.date(2023, 12, 1))
+        self.assertEqual(add_months(datetime.date(2024, 5, 1), -24), datetime.date(2022, 5, 1))
+        self.assertEqual(add_months(datetime.date(2024, 5, 1), 0), datetime.date(2024, 5, 1))
+
+    @override_settings(ORDER_HOT_DAYS=90)
+    def test_hot_since(self):
+        self.assertEqual(hot_since(), timezone.localdate() - datetime.timedelta(days=90))
+
+    def test_live_totals_since(self):
+        with mock.patch('accounts.partitions.timezone.localdate', return_value=datetime.date(2025, 1, 15)):
+            self.assertEqual(live_totals_since(), datetime.date(2024, 11, 1))
+
+
+class MonthlyOrderTotalTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendor = make_vendor('shop')
+        cls.supplier = make_supplier('mill')
+        cls.months = [add_months(this_month(), -count) for count in range(5)]  # this month first
+        with mock.patch('accounts.events.publish'):
+            for n, month in enumerate(cls.months):
+                cls.shared_order(month, n + 1)
+                cls.shared_order(month, 10)
+
+    @classmethod
+    def shared_order(cls, month, amount):
+        order = SharedOrder.objects.create(supplier=cls.supplier, vendor=cls.vendor, order_id=f'SO{month:%Y%m}',
+                                           item_name='Bolt', quantity=1, amount=Decimal(amount))
+        SharedOrder.objects.filter(id=order.id).update(date=month + datetime.timedelta(days=3))
+        return order
+
+    def setUp(self):
+        cache.clear()
+
+    def totals(self):
+        return {total.month: (total.orders, total.revenue) for total in MonthlyOrderTotal.objects.all()}
+
+    def test_close_months(self):
+        closed = self.months[2:]  # not this month or last month
+        self.assertEqual(close_months(), sorted(closed))
+        self.assertEqual(self.totals(), {
+            month: (2, Decimal(n + 1 + 10)) for n, month in enumerate(self.months) if month in closed})
+        self.assertEqual(close_months(), [])
+
+    def test_recount(self):
+        close_months()
+        SharedOrder.objects.filter(date__lt=self.months[1]).update(amount=Decimal('1.00'))
+        close_months(recount=True)
+        self.assertEqual(set(self.totals().values()), {(2, Decimal('2.00'))})
+
+    def test_changed_order_of_a_closed_month_is_recounted(self):
+        close_months()
+        order = SharedOrder.objects.filter(date__lt=self.months[2]).order_by('-date', 'amount').first()
+        with mock.patch('accounts.events.publish'), self.captureOnCommitCallbacks(execute=True):
+            order.delete()
+        self.assertEqual(self.totals()[self.months[3]], (1, Decimal('10.00')))
+
+    def test_supplier_stats(self):
+        close_months()
+        self.client.force_login(self.supplier.user)
+        stats = self.client.get('/supplier/api/dashboard/?fields=stats').json()['stats']
+        self.assertEqual(stats['newOrders'], 10)
+        self.assertEqual(Decimal(str(stats['revenue'])), Decimal(1 + 2 + 3 + 4 + 5 + 50))
+
+    def test_maintenance_rolls_up_on_any_database(self):
+        out = io.StringIO()
+        call_command('maintain_order_partitions', stdout=out)
+        self.assertIn(f"Rolled up the shared orders of {self.months[2]:%Y-%m}", out.getvalue())
+        if connection.vendor != 'postgresql':
+            with self.assertRaises(CommandError):
+                call_command('maintain_order_partitions', '--archive', stdout=io.StringIO())
+
+
+class InProgressOrderTests(TestCase):
+
+    def test_partial_index(self):
+        vendor = make_vendor('shop')
+        Order.objects.create(vendor=vendor, order_id='ORD001', customer='Shop', item_name='Bolt', progress=1,
+                             amount=Decimal('10.00'), date=timezone.localdate())
+        plan = Order.objects.filter(vendor=vendor, progress__lt=3).explain()
+        self.assertIn('order_in_progress_idx', plan)
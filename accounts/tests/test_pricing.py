@@ -0,0 +1,67 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from accounts import pricing
+from accounts.models import SupplierInventory
+from accounts.pricing import PricingError, price_cart
+
+from .utils import make_product, make_supplier
+
+
+class PriceCartTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.product = make_product('Widget', 420.1)
+        cls.discounter = make_supplier('discounter')
+        cls.reseller = make_supplier('reseller')
+        cls.stranger = make_supplier('stranger')
+        cls.offer = SupplierInventory.objects.create(supplier=cls.discounter, product=cls.product, stock_quantity=5,
+                                                     custom_price=Decimal('99.50'))
+        SupplierInventory.objects.create(supplier=cls.reseller, product=cls.product, stock_quantity=5)
+
+    def setUp(self):
+        cache.clear()  # price tables are cached under the "prices" version
+        pricing._local_tables.clear()
+
+    def test_supplier_custom_price(self):
+        priced = price_cart([{"id": self.product.id, "quantity": 2, "supplier_id": self.discounter.id}])
+        self.assertEqual(priced['lines'][0]['unit_price'], Decimal('99.50'))
+        self.assertEqual(priced['total'], Decimal('199.00'))
+
+    def test_list_price_without_custom_price_or_supplier(self):
+        for line in ({"id": self.product.id, "supplier_id": self.reseller.id}, {"id": self.product.id}):
+            self.assertEqual(price_cart([line])['total'], Decimal('420.10'))
+
+    def test_supplier_not_offering_product(self):
+        with self.assertRaisesMessage(PricingError, "does not offer"):
+            price_cart([{"id": self.product.id, "supplier_id": self.stranger.id}])
+
+    def test_client_price_is_ignored(self):
+        priced = price_cart([{"id": self.product.id, "quantity": 1, "price": "0.01"}])
+        self.assertEqual(priced['total'], Decimal('420.10'))
+
+    def test_invalid_lines(self):
+        for items in ([{"id": self.product.id + 1000}], [{"id": self.product.id, "quantity": 0}],
+                      [{"quantity": 1}], [{"id": "abc"}]):
+            with self.subTest(items=items), self.assertRaises(PricingError):
+                price_cart(items)
+
+    def test_one_query_then_cached(self):
+        other = make_product('Gadget', 5)
+        items = [{"id": self.product.id}, {"id": other.id, "quantity": 3}]
+        with self.assertNumQueries(1):
+            price_cart(items)
+        with self.assertNumQueries(0):
+            self.assertEqual(price_cart(items)['total'], Decimal('435.10'))
+
+    def test_price_change_is_picked_up(self):
+        line = {"id": self.product.id, "supplier_id": self.discounter.id}
+        price_cart([line])
+        with mock.patch('accounts.events.publish'), self.captureOnCommitCallbacks(execute=True):
+            self.offer.custom_price = Decimal('89.50')
+            self.offer.save()
+        self.assertEqual(price_cart([line])['total'], Decimal('89.50'))
@@ -0,0 +1,108 @@
+import json
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import Product
+from accounts.routers import PIN_COOKIE_NAME, PrimaryReplicaRouter, _lag_cache, begin_request, end_request
+
+
+# replica_1 always exists under `manage.py test`, mirroring the test database
+# (see DATABASES in settings); the override makes the router use it.
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class ReplicaRoutingTests(TransactionTestCase):
+    # Not TestCase: the router keeps reads on the primary inside a transaction,
+    # and TestCase runs every test in one.
+    databases = {'default', 'replica_1'}
+
+    def setUp(self):
+        cache.clear()
+        _lag_cache.clear()
+        self.addCleanup(_lag_cache.clear)
+        self.factory = RequestFactory()
+
+    def read_alias(self, request):
+        token = begin_request(request)
+        try:
+            return PrimaryReplicaRouter().db_for_read(Product)
+        finally:
+            end_request(token, request, None)
+
+    def queries_by_alias(self, send):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica_1']) as replica:
+            response = send()
+        return response, len(primary), len(replica)
+
+    def test_safe_read_goes_to_replica(self):
+        self.assertEqual(self.read_alias(self.factory.get('/api/products/')), 'replica_1')
+        self.assertEqual(self.read_alias(self.factory.head('/api/products/')), 'replica_1')
+
+    def test_get_request_queries_replica(self):
+        response, primary, replica = self.queries_by_alias(lambda: self.client.get('/api/products/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+
+    def test_write_request_reads_from_primary(self):
+        self.assertEqual(self.read_alias(self.factory.post('/api/create-order/')), 'default')
+        self.assertEqual(PrimaryReplicaRouter().db_for_write(Product), 'default')
+
+    def test_write_sets_pin_cookie(self):
+        request = self.factory.post('/api/create-order/')
+        token = begin_request(request)
+        response = end_request(token, request, HttpResponse(status=201))
+        self.assertGreater(float(response.cookies[PIN_COOKIE_NAME].value), time.time())
+
+        request = self.factory.post('/api/create-order/')
+        token = begin_request(request)
+        response = end_request(token, request, HttpResponse(status=400))
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+
+    def test_pin_cookie_forces_primary(self):
+        request = self.factory.get('/api/products/')
+        request.COOKIES[PIN_COOKIE_NAME] = f"{time.time() + 60:.3f}"
+        self.assertEqual(self.read_alias(request), 'default')
+
+        self.client.cookies[PIN_COOKIE_NAME] = f"{time.time() + 60:.3f}"
+        response, primary, replica = self.queries_by_alias(lambda: self.client.get('/api/products/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_expired_pin_cookie_is_ignored(self):
+        request = self.factory.get('/api/products/')
+        request.COOKIES[PIN_COOKIE_NAME] = f"{time.time() - 1:.3f}"
+        self.assertEqual(self.read_alias(request), 'replica_1')
+
+    def test_read_only_post_uses_replica_without_pinning(self):
+        self.assertEqual(self.read_alias(self.factory.post('/api/batch/')), 'replica_1')
+
+        self.client.force_login(User.objects.create_user('batcher', 'batcher@example.com', 'x'))
+        response, primary, replica = self.queries_by_alias(lambda: self.client.post(
+            '/api/batch/', json.dumps({"requests": ['/api/products/']}), content_type='application/json'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['responses'][0]['status'], 200)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_reads_from_primary(self):
+        self.assertEqual(self.read_alias(self.factory.get('/api/products/')), 'default')
+
+    def test_lagging_replica_is_skipped(self):
+        with mock.patch('accounts.routers.replica_lag', return_value=settings.DB_REPLICA_MAX_LAG + 1):
+            self.assertEqual(self.read_alias(self.factory.get('/api/products/')), 'default')
+
+    def test_unreachable_replica_is_skipped(self):
+        with mock.patch('accounts.routers.replica_lag', return_value=None):
+            self.assertEqual(self.read_alias(self.factory.get('/api/products/')), 'default')
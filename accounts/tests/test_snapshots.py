@@ -0,0 +1,76 @@
+import gzip
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+import brotli
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from accounts import snapshots
+from accounts.snapshots import MANIFEST_NAME, build_if_stale, build_snapshots, schedule_snapshot, snapshot_dir
+
+from .utils import make_product, make_vendor
+
+
+class CatalogSnapshotTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.products = [make_product('Bolt', 1, category='Hardware'), make_product('Flour', 2, category='Grains'),
+                        make_product('Nut', 3, category='Hardware')]
+
+    def setUp(self):
+        cache.clear()
+        static_root = tempfile.TemporaryDirectory()
+        self.addCleanup(static_root.cleanup)
+        settings = override_settings(STATIC_ROOT=static_root.name, CATALOG_SNAPSHOTS=True)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def read(self, url):
+        with open(os.path.join(snapshot_dir(), url.rsplit('/', 1)[-1]), 'rb') as f:
+            return f.read()
+
+    def test_build(self):
+        manifest = build_snapshots()
+        self.assertEqual(json.loads(self.read(MANIFEST_NAME)), manifest)
+        self.assertEqual((manifest['count'], sorted(manifest['categories'])), (3, ['grains', 'hardware']))
+
+        content = self.read(manifest['all'])
+        self.client.force_login(make_vendor('shop').user)
+        self.assertEqual(json.loads(content), self.client.get('/api/products/').json())
+        self.assertEqual(gzip.decompress(self.read(manifest['all'] + '.gz')), content)
+        self.assertEqual(brotli.decompress(self.read(manifest['all'] + '.br')), content)
+        hardware = json.loads(self.read(manifest['categories']['hardware']))
+        self.assertEqual([p['name'] for p in hardware], ['Bolt', 'Nut'])
+
+    def test_unchanged_catalog_keeps_file_names(self):
+        self.assertEqual(build_snapshots()['all'], build_snapshots()['all'])
+
+    def test_catalog_writes_flag_a_rebuild(self):
+        self.assertIsNone(build_if_stale())
+        with mock.patch('accounts.events.publish'), self.captureOnCommitCallbacks(execute=True):
+            make_product('Washer', 4, category='Hardware')
+        self.assertEqual(build_if_stale()['count'], 4)
+        self.assertIsNone(build_if_stale())
+
+    def test_disabled(self):
+        with override_settings(CATALOG_SNAPSHOTS=False):
+            schedule_snapshot()
+        self.assertIsNone(build_if_stale())
+
+    def test_watch(self):
+        schedule_snapshot()
+        built = []
+        with mock.patch.object(snapshots.time, 'sleep', side_effect=KeyboardInterrupt), \
+                self.assertRaises(KeyboardInterrupt):
+            snapshots.watch(log=built.append)
+        self.assertEqual([manifest['count'] for manifest in built], [3])
+
+    def test_command(self):
+        call_command('build_catalog_snapshots', stdout=io.StringIO())
+        self.assertTrue(os.path.exists(os.path.join(snapshot_dir(), MANIFEST_NAME)))
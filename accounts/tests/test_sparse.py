@@ -0,0 +1,63 @@
+from django.core.cache import cache
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase
+
+from accounts.models import Product
+from accounts.serializers import ProductListSerializer, ProductSerializer
+from accounts.sparse import narrow, select_names, sparse_fields
+
+from .utils import make_product, make_vendor
+
+
+class SparseParamsTests(SimpleTestCase):
+
+    def test_sparse_fields(self):
+        self.assertEqual(sparse_fields(QueryDict('fields=id, name,&exclude=price')),
+                         {'fields': ['id', 'name'], 'exclude': ['price']})
+        self.assertEqual(sparse_fields(QueryDict('')), {'fields': None, 'exclude': []})
+
+    def test_select_names(self):
+        available = ['id', 'name', 'price', 'profile_data']
+        self.assertEqual(select_names(available, ['price', 'id', 'nope']), ['id', 'price'])
+        self.assertEqual(select_names(available, exclude=['name']), ['id', 'price', 'profile_data'])
+        self.assertEqual(select_names(available, ['profile_data.address']), ['profile_data'])
+
+
+class SparseFieldsetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.product = make_product('Bolt', 2, description='A very long description')
+        cls.vendor = make_vendor('shop')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.vendor.user)
+
+    def test_list_leaves_out_heavy_fields(self):
+        listed = self.client.get('/api/products/').json()[0]
+        self.assertNotIn('description', listed)
+        self.assertNotIn('supplier_image', listed)
+        detail = self.client.get(f'/api/products/{self.product.id}/').json()
+        self.assertEqual(detail['description'], 'A very long description')
+        self.assertEqual(set(detail) - set(listed), {'description', 'supplier_image'})
+
+    def test_fields_and_exclude(self):
+        self.assertEqual(self.client.get('/api/products/?fields=id,price').json(), [{"id": self.product.id,
+                                                                                     "price": 2.0}])
+        listed = self.client.get('/api/products/?exclude=best_offer,image').json()[0]
+        self.assertNotIn('best_offer', listed)
+        self.assertIn('name', listed)
+
+    def test_unused_columns_not_fetched(self):
+        sql = str(narrow(Product.objects.all(), ProductListSerializer, fields=['id', 'name']).query)
+        self.assertNotIn('"price"', sql)
+        self.assertNotIn('best_offer', sql)
+        sql = str(narrow(Product.objects.all(), ProductSerializer).query)
+        self.assertIn('"description"', sql)
+
+    def test_nested_fields(self):
+        body = self.client.get('/api/profile/?fields=email,profile_data&exclude=profile_data.address').json()
+        self.assertEqual(set(body), {'email', 'profile_data'})
+        self.assertNotIn('address', body['profile_data'])
+        self.assertIn('company_name', body['profile_data'])
@@ -0,0 +1,54 @@
+import gzip
+import os
+import re
+import shutil
+import tempfile
+
+import brotli
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from .utils import make_vendor
+
+STATIC_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(STATIC_ROOT=STATIC_ROOT)
+class StaticPipelineTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.addClassCleanup(shutil.rmtree, STATIC_ROOT, ignore_errors=True)
+        # Only the project's own assets; the admin's and DRF's only slow the test down.
+        call_command('collectstatic', interactive=False, verbosity=0, ignore_patterns=['admin', 'rest_framework'])
+
+    def read(self, name):
+        with open(os.path.join(STATIC_ROOT, name), 'rb') as f:
+            return f.read()
+
+    def test_minified_fingerprinted_and_compressed(self):
+        hashed = staticfiles_storage.stored_name('dashboard/vendor.js')
+        self.assertRegex(hashed, r'^dashboard/vendor\.[0-9a-f]{12}\.js$')
+        content = self.read(hashed)
+        with open(os.path.join('static', 'dashboard', 'vendor.js'), 'rb') as f:
+            self.assertLess(len(content), len(f.read()))
+        self.assertEqual(gzip.decompress(self.read(f'{hashed}.gz')), content)
+        self.assertEqual(brotli.decompress(self.read(f'{hashed}.br')), content)
+
+    def test_dashboard_links_hashed_bundles(self):
+        self.client.force_login(make_vendor('shop').user)
+        html = self.client.get('/vendor/dashboard/').content.decode()
+        self.assertIn(staticfiles_storage.url('dashboard/vendor.js'), html)
+        self.assertIn(staticfiles_storage.url('dashboard/vendor.css'), html)
+        self.assertNotIn('<style>', html)
+
+    def test_served_with_far_future_headers(self):
+        url = staticfiles_storage.url('dashboard/vendor.css')
+        response = self.client.get(url, headers={'accept-encoding': 'br'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'br')
+        max_age = int(re.search(r'max-age=(\d+)', response.headers['Cache-Control']).group(1))
+        self.assertGreaterEqual(max_age, 365 * 24 * 60 * 60)
+        self.assertIn('immutable', response.headers['Cache-Control'])
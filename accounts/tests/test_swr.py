@@ -0,0 +1,122 @@
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from accounts import swr
+from accounts.models import SharedOrder, SupplierInventory
+from accounts.swr import _keys, invalidate, stale_while_revalidate
+
+from .utils import make_product, make_supplier, make_vendor
+
+
+def inline(target, *args):
+    target(*args)
+
+
+class StaleWhileRevalidateTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def counter(self, *args):
+        self.calls += 1
+        return self.calls
+
+    def expire(self, name, *args):
+        key, _ = _keys(name, args)
+        entry = cache.get(key)
+        entry['expires'] = 0
+        cache.set(key, entry)
+
+    def test_fresh_value_is_cached_per_arguments(self):
+        cached = stale_while_revalidate('count')(self.counter)
+        self.assertEqual([cached(1), cached(1), cached(2)], [1, 1, 2])
+
+    def test_stale_value_served_while_refreshing(self):
+        cached = stale_while_revalidate('count')(self.counter)
+        cached(1)
+        self.expire('count', 1)
+        with mock.patch('accounts.swr._in_background', side_effect=inline) as background:
+            self.assertEqual(cached(1), 1)
+        background.assert_called_once()
+        self.assertEqual(cached(1), 2)
+
+    def test_single_refresh_per_key(self):
+        cached = stale_while_revalidate('count')(self.counter)
+        cached(1)
+        self.expire('count', 1)
+        with mock.patch('accounts.swr._in_background') as background:
+            cached(1)
+            cached(1)
+        background.assert_called_once()
+
+    def test_cold_miss_waits_for_the_computing_caller(self):
+        cached = stale_while_revalidate('count')(self.counter)
+        key, lock_key = _keys('count', (1,))
+        cache.add(lock_key, 'someone else')
+
+        def sleep(seconds):
+            cache.set(key, {'value': 'theirs', 'delta': 0, 'expires': float('inf')})
+        with mock.patch('accounts.swr.time.sleep', side_effect=sleep):
+            self.assertEqual(cached(1), 'theirs')
+        self.assertEqual(self.calls, 0)
+
+    def test_invalidate(self):
+        cached = stale_while_revalidate('count')(self.counter)
+        cached(1)
+        cached(2)
+        invalidate('count', 1)
+        self.assertEqual([cached(1), cached(2)], [3, 2])
+
+    def test_coroutine_functions(self):
+        async def counter(*args):
+            return self.counter(*args)
+        cached = stale_while_revalidate('acount')(counter)
+        self.assertEqual([async_to_sync(cached)(1), async_to_sync(cached)(1)], [1, 1])
+        invalidate('acount', 1)
+        self.assertEqual(async_to_sync(cached)(1), 2)
+
+    def test_early_refresh_probability(self):
+        entry = {'expires': 1000.0, 'delta': 1.0}
+        with mock.patch('accounts.swr.time.time', return_value=990.0):
+            with mock.patch('accounts.swr.random.random', return_value=0.0):
+                self.assertFalse(swr._needs_refresh(entry, beta=1.0))
+            with mock.patch('accounts.swr.random.random', return_value=1 - 1e-6):  # -log(1e-6) ~ 13.8 > 10
+                self.assertTrue(swr._needs_refresh(entry, beta=1.0))
+
+
+class SupplierDashboardInvalidationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.supplier = make_supplier('mill')
+        cls.vendor = make_vendor('shop')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.supplier.user)
+        publish = mock.patch('accounts.events.publish')
+        publish.start()
+        self.addCleanup(publish.stop)
+
+    def dashboard(self):
+        return self.client.get('/supplier/api/dashboard/?fields=stats,categoryChart').json()
+
+    def test_inventory_and_orders_refresh_the_aggregates(self):
+        self.assertEqual(self.dashboard()['stats'], {"newOrders": 0, "activeProducts": 0, "revenue": 0})
+
+        product = make_product('Bolt', 2, category='Hardware')
+        with self.captureOnCommitCallbacks(execute=True):
+            SupplierInventory.objects.create(supplier=self.supplier, product=product, stock_quantity=3)
+        body = self.dashboard()
+        self.assertEqual(body['stats']['activeProducts'], 1)
+        self.assertEqual(body['categoryChart'], {"labels": ['Hardware'], "data": [1]})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SharedOrder.objects.create(supplier=self.supplier, vendor=self.vendor, order_id='SO1', item_name='Bolt',
+                                       quantity=1, amount=Decimal('2.00'))
+        self.assertEqual(self.dashboard()['stats']['newOrders'], 1)
@@ -0,0 +1,85 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from accounts.tiered_cache import _CLEAR_ALL, _MISSING, LocalTier, tier_stats
+
+
+class LocalTierTests(SimpleTestCase):
+
+    def tier(self, max_entries=3, max_bytes=10_000, max_item_bytes=1_000, timeout=30):
+        tier = LocalTier(max_entries, max_bytes, max_item_bytes, timeout)
+        tier.set_connected(True)
+        return tier
+
+    def test_put_and_get(self):
+        tier = self.tier()
+        tier.put('a', {'x': 1}, tier.generation)
+        self.assertEqual(tier.get('a'), {'x': 1})
+        self.assertIs(tier.get('b'), _MISSING)
+        self.assertEqual(tier.stats()['l1_hits'], 1)
+
+    def test_least_recently_used_evicted(self):
+        tier = self.tier()
+        for key in 'abc':
+            tier.put(key, key, tier.generation)
+        tier.get('a')
+        tier.put('d', 'd', tier.generation)
+        self.assertEqual(list(tier.entries), ['c', 'a', 'd'])
+        self.assertEqual(tier.stats()['evictions'], 1)
+
+    def test_byte_limits(self):
+        tier = self.tier(max_entries=100, max_bytes=300, max_item_bytes=200)
+        tier.put('big', 'x' * 500, tier.generation)
+        self.assertIs(tier.get('big'), _MISSING)
+        for key in 'abc':
+            tier.put(key, 'x' * 100, tier.generation)
+        self.assertLessEqual(tier.size, 300)
+        self.assertIs(tier.get('a'), _MISSING)
+
+    def test_expiry(self):
+        tier = self.tier(timeout=30)
+        with mock.patch('accounts.tiered_cache.time.monotonic', return_value=1000.0):
+            tier.put('a', 1, tier.generation)
+        with mock.patch('accounts.tiered_cache.time.monotonic', return_value=1031.0):
+            self.assertIs(tier.get('a'), _MISSING)
+        self.assertEqual(tier.size, 0)
+
+    def test_invalidation(self):
+        tier = self.tier()
+        tier.put('a', 1, tier.generation)
+        tier.put('b', 2, tier.generation)
+        tier.drop(['a'])
+        self.assertIs(tier.get('a'), _MISSING)
+        self.assertEqual(tier.get('b'), 2)
+        tier.drop([_CLEAR_ALL])
+        self.assertEqual((len(tier.entries), tier.size), (0, 0))
+
+    def test_value_read_before_an_invalidation_is_not_kept(self):
+        tier = self.tier()
+        generation = tier.generation
+        tier.drop(['a'])
+        tier.put('a', 'stale', generation)
+        self.assertIs(tier.get('a'), _MISSING)
+
+    def test_bypassed_while_disconnected(self):
+        tier = self.tier()
+        tier.put('a', 1, tier.generation)
+        tier.set_connected(False)
+        self.assertIs(tier.get('a'), _MISSING)
+        tier.put('a', 1, tier.generation)
+        self.assertIs(tier.get('a'), _MISSING)
+        self.assertFalse(tier.stats()['l1_connected'])
+
+    def test_hit_rates(self):
+        tier = self.tier()
+        tier.put('a', 1, tier.generation)
+        tier.get('a')
+        tier.count('l2_hits')
+        tier.count('misses', 2)
+        stats = tier.stats()
+        self.assertEqual((stats['l1_hit_rate'], stats['l2_hit_rate']), (0.25, 0.3333))
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_tier_stats_for_other_backends(self):
+        self.assertIsNone(tier_stats())
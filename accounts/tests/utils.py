@@ -0,0 +1,34 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.auth.models import User
+
+from accounts.models import Product, SupplierProfile, VendorProfile
+
+SessionStore = import_module(settings.SESSION_ENGINE).SessionStore
+
+
+def make_product(name, price, **fields):
+    fields = {
+        'rating': 4.0, 'rating_count': 10, 'category': 'Test', 'image': 'https://example.com/p.png',
+        'supplier': '', 'supplier_image': 'https://example.com/s.png', 'description': '', **fields,
+    }
+    return Product.objects.create(name=name, price=price, **fields)
+
+
+def make_supplier(username):
+    user = User.objects.create_user(username, f'{username}@example.com', 'x')
+    return SupplierProfile.objects.create(user=user, organization_name=username)
+
+
+def make_vendor(username):
+    user = User.objects.create_user(username, f'{username}@example.com', 'x')
+    return VendorProfile.objects.create(user=user, company_name=username)
+
+
+def with_session(request, user_id=None):
+    request.session = SessionStore()
+    if user_id is not None:
+        request.session[SESSION_KEY] = str(user_id)
+    return request
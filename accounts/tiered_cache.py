@@ -0,0 +1,309 @@
+"""
+Two-tier cache backend.
+
+TwoTierCache is django_redis's RedisCache (L2) with a bounded in-process LRU
+(L1) in front of it for keys starting with one of OPTIONS["L1_PREFIXES"]: the
+small, very hot values such as version counters (accounts.versioning),
+response fragments and price tables. An L1 hit costs no network round trip.
+Everything else, sessions included, goes straight to Redis; sessions are
+written on every request (SESSION_SAVE_EVERY_REQUEST), so caching them locally
+would only add invalidation traffic.
+
+L1 holds pickled values, evicting the least recently used ones beyond
+L1_MAX_ENTRIES entries or L1_MAX_BYTES bytes, and keeps each for at most
+L1_TIMEOUT seconds. Every write through this backend drops the key from L1 and
+publishes it on L1_CHANNEL; each process has a subscriber thread that drops
+the keys other processes wrote, so a change is seen everywhere within
+milliseconds. While that subscription is down L1 is emptied and bypassed,
+because invalidations could be missed.
+
+Hit counters are per process; see tier_stats() and /api/health/.
+"""
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django_redis.cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_SECONDS = 1.0
+_MISSING = object()
+_CLEAR_ALL = '*'
+
+
+class LocalTier:
+    """The per-process L1 shared by every thread's backend instance."""
+
+    def __init__(self, max_entries, max_bytes, max_item_bytes, timeout):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (expires at, pickled value)
+        self.size = 0
+        # Bumped by every invalidation, so a value read from L2 before one is
+        # not stored in L1 after it.
+        self.generation = 0
+        self.connected = False
+        self.pid = None
+        self.counts = dict.fromkeys(('l1_hits', 'l2_hits', 'misses', 'evictions', 'invalidations'), 0)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return _MISSING
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                return _MISSING
+            self.entries.move_to_end(key)
+            self.counts['l1_hits'] += 1
+        return pickle.loads(entry[1])
+
+    def put(self, key, value, generation):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_item_bytes:
+            return
+        with self.lock:
+            if not self.connected or generation != self.generation:
+                return
+            self._remove(key)
+            self.entries[key] = (time.monotonic() + self.timeout, data)
+            self.size += len(data)
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.counts['evictions'] += 1
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+
+    def drop(self, keys):
+        with self.lock:
+            self.generation += 1
+            self.counts['invalidations'] += 1
+            if _CLEAR_ALL in keys:
+                self.entries.clear()
+                self.size = 0
+            else:
+                for key in keys:
+                    self._remove(key)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counts[name] += n
+
+    def set_connected(self, connected):
+        # Whatever was published while (dis)connecting may have been missed.
+        with self.lock:
+            self.connected = connected
+            self.generation += 1
+            self.entries.clear()
+            self.size = 0
+
+    def listen(self, redis_client, channel):
+        while True:
+            try:
+                pubsub = redis_client.pubsub()
+                pubsub.subscribe(channel)
+                pubsub.get_message(timeout=RECONNECT_SECONDS * 5)  # the subscribe confirmation
+                self.set_connected(True)
+                for message in pubsub.listen():
+                    if message['type'] == 'message':
+                        self.drop(json.loads(message['data']))
+            except Exception:
+                logger.warning("Cache invalidation subscription lost; L1 disabled until it reconnects",
+                               exc_info=True)
+            self.set_connected(False)
+            time.sleep(RECONNECT_SECONDS)
+
+    def stats(self):
+        with self.lock:
+            counts = dict(self.counts)
+            lookups = counts['l1_hits'] + counts['l2_hits'] + counts['misses']
+            l2_lookups = lookups - counts['l1_hits']
+            return {
+                **counts,
+                "l1_hit_rate": round(counts['l1_hits'] / lookups, 4) if lookups else None,
+                "l2_hit_rate": round(counts['l2_hits'] / l2_lookups, 4) if l2_lookups else None,
+                "l1_entries": len(self.entries),
+                "l1_bytes": self.size,
+                "l1_connected": self.connected,
+            }
+
+
+_tiers = {}
+_tiers_lock = threading.Lock()
+
+
+class TwoTierCache(RedisCache):
+
+    def __init__(self, server, params):
+        options = dict(params.get('OPTIONS', {}))
+        self.l1_prefixes = tuple(options.pop('L1_PREFIXES', ()))
+        self.l1_channel = options.pop('L1_CHANNEL', 'cache:l1-invalidate')
+        tier_options = (
+            options.pop('L1_MAX_ENTRIES', 10_000),
+            options.pop('L1_MAX_BYTES', 32 * 1024 * 1024),
+            options.pop('L1_MAX_ITEM_BYTES', 256 * 1024),
+            options.pop('L1_TIMEOUT', 30),
+        )
+        super().__init__(server, {**params, 'OPTIONS': options})
+        with _tiers_lock:
+            key = (server if isinstance(server, str) else ','.join(server), self.l1_channel)
+            if key not in _tiers:
+                _tiers[key] = LocalTier(*tier_options)
+            self.tier = _tiers[key]
+
+    def _tier(self):
+        """The L1 tier with its subscriber running in this process (forks don't inherit threads)."""
+        tier = self.tier
+        if tier.pid != os.getpid():
+            with _tiers_lock:
+                if tier.pid != os.getpid():
+                    tier.pid = os.getpid()
+                    tier.set_connected(False)
+                    threading.Thread(target=tier.listen, daemon=True, name='cache-l1-invalidation',
+                                     args=(self.client.get_client(write=True), self.l1_channel)).start()
+        return tier
+
+    def _local(self, key):
+        return isinstance(key, str) and key.startswith(self.l1_prefixes)
+
+    def _full_key(self, key, version):
+        return str(self.client.make_key(key, version=version))
+
+    def _invalidate(self, full_keys):
+        if not self.l1_prefixes:
+            return
+        self._tier().drop(full_keys)
+        try:
+            self.client.get_client(write=True).publish(self.l1_channel, json.dumps(list(full_keys)))
+        except Exception:
+            # The write itself went through; other processes drop the key
+            # when it expires from their L1 instead.
+            logger.warning("Could not publish cache invalidation for %s", full_keys, exc_info=True)
+
+    # Reads
+
+    def get(self, key, default=None, version=None, client=None):
+        if not self._local(key):
+            value = super().get(key, _MISSING, version=version, client=client)
+            self.tier.count('misses' if value is _MISSING else 'l2_hits')
+            return default if value is _MISSING else value
+        tier = self._tier()
+        full_key = self._full_key(key, version)
+        value = tier.get(full_key)
+        if value is not _MISSING:
+            return value
+        generation = tier.generation
+        value = super().get(key, _MISSING, version=version, client=client)
+        if value is _MISSING:
+            tier.count('misses')
+            return default
+        tier.count('l2_hits')
+        tier.put(full_key, value, generation)
+        return value
+
+    def get_many(self, keys, version=None, client=None):
+        keys = list(keys)
+        found, remote = {}, []
+        tier = self._tier() if any(self._local(key) for key in keys) else self.tier
+        generation = tier.generation
+        for key in keys:
+            value = tier.get(self._full_key(key, version)) if self._local(key) else _MISSING
+            if value is _MISSING:
+                remote.append(key)
+            else:
+                found[key] = value
+        if remote:
+            fetched = super().get_many(remote, version=version, client=client)
+            tier.count('l2_hits', len(fetched))
+            tier.count('misses', len(remote) - len(fetched))
+            for key, value in fetched.items():
+                if self._local(key):
+                    tier.put(self._full_key(key, version), value, generation)
+            found.update(fetched)
+        return {key: found[key] for key in keys if key in found}
+
+    # Writes
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, client=None, nx=False, xx=False):
+        result = super().set(key, value, timeout, version=version, client=client, nx=nx, xx=xx)
+        if self._local(key):
+            self._invalidate([self._full_key(key, version)])
+        return result
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        added = super().add(key, value, timeout, version=version, client=client)
+        if added and self._local(key):
+            self._invalidate([self._full_key(key, version)])
+        return added
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        result = super().set_many(data, timeout, version=version, client=client)
+        self._invalidate_keys(data, version)
+        return result
+
+    def delete(self, key, version=None, prefix=None, client=None):
+        result = super().delete(key, version=version, prefix=prefix, client=client)
+        if self._local(key):
+            self._invalidate([str(self.client.make_key(key, version=version, prefix=prefix))])
+        return result
+
+    def delete_many(self, keys, version=None, client=None):
+        keys = list(keys)
+        result = super().delete_many(keys, version=version, client=client)
+        self._invalidate_keys(keys, version)
+        return result
+
+    def incr(self, key, delta=1, version=None, client=None, ignore_key_check=False):
+        value = super().incr(key, delta, version=version, client=client, ignore_key_check=ignore_key_check)
+        if self._local(key):
+            self._invalidate([self._full_key(key, version)])
+        return value
+
+    def decr(self, key, delta=1, version=None, client=None):
+        value = super().decr(key, delta, version=version, client=client)
+        if self._local(key):
+            self._invalidate([self._full_key(key, version)])
+        return value
+
+    def incr_version(self, key, delta=1, version=None, client=None):
+        new_version = super().incr_version(key, delta, version=version, client=client)
+        if self._local(key):
+            self._invalidate([self._full_key(key, version)])
+        return new_version
+
+    def delete_pattern(self, *args, **kwargs):
+        result = super().delete_pattern(*args, **kwargs)
+        self._invalidate([_CLEAR_ALL])
+        return result
+
+    def clear(self):
+        result = super().clear()
+        self._invalidate([_CLEAR_ALL])
+        return result
+
+    def _invalidate_keys(self, keys, version):
+        full_keys = [self._full_key(key, version) for key in keys if self._local(key)]
+        if full_keys:
+            self._invalidate(full_keys)
+
+    def tier_stats(self):
+        return self.tier.stats()
+
+
+def tier_stats(alias=DEFAULT_CACHE_ALIAS):
+    """L1/L2 hit counts and rates of this process, or None if the cache isn't a TwoTierCache."""
+    backend = caches[alias]
+    return backend.tier_stats() if isinstance(backend, TwoTierCache) else None
@@ -1,5 +1,7 @@
+from django.conf import settings
 from django.urls import path
 from .views import (
+    health_check,
     login_view,
     logout_view,
     signup_page,
@@ -7,16 +9,31 @@ from .views import (
     supplier_dashboard,
     import_products_view,
     product_list,
+    product_detail,
+    product_changes,
     order_list,
+    order_events,
     profile_view,
+    vendor_bootstrap,
     create_order,
+    cart_optimize,
     supplier_dashboard_api,
     supplier_inventory_api,
     supplier_orders_api,
     supplier_inventory_update_api, supplier_inventory_add_api, supplier_inventory_delete_api,
+    product_list_async, product_detail_async, order_list_async, supplier_dashboard_api_async, profile_view_async,
+    batch_api,
 )
 
+if settings.ASYNC_API_VIEWS:
+    product_list, product_detail, order_list = product_list_async, product_detail_async, order_list_async
+    supplier_dashboard_api, profile_view = supplier_dashboard_api_async, profile_view_async
+
 urlpatterns = [
+    # Health
+    path('api/health/', health_check, name='health-check'),
+    path('api/batch/', batch_api, name='batch-api'),
+
     # Auth & Dashboards
     path('login/', login_view, name='login'),
     path('logout/', logout_view, name='logout'),
@@ -29,9 +46,14 @@ urlpatterns = [
 
     # Vendor APIs (unchanged)
     path('api/products/', product_list, name='product-list'),
+    path('api/products/<int:product_id>/', product_detail, name='product-detail'),
+    path('api/products/changes/', product_changes, name='product-changes'),
     path('api/orders/', order_list, name='order-list'),
+    path('api/orders/stream/', order_events, name='order-events'),
     path('api/profile/', profile_view, name='profile-api'),
+    path('api/vendor/bootstrap/', vendor_bootstrap, name='vendor-bootstrap'),
     path('api/create-order/', create_order, name='create-order'),
+    path('api/cart/optimize/', cart_optimize, name='cart-optimize'),
 
     # Supplier APIs (cleaned)
     path('supplier/api/dashboard/', supplier_dashboard_api, name='supplier-dashboard-api'),
@@ -0,0 +1,59 @@
+"""
+Version counters for cached data, kept in the shared cache.
+
+Writers bump a scope's version; readers fold the version into their cache keys,
+so entries built from older data are simply never asked for again.
+"""
+import time
+
+from django.core.cache import cache
+
+
+def _key(scope):
+    return f"version:{scope}"
+
+
+def _initial():
+    # Start from the clock so a counter lost from the cache never restarts at a
+    # value whose old entries may still be cached.
+    return int(time.time() * 1000)
+
+
+def get_version(scope):
+    version = cache.get(_key(scope))
+    if version is None:
+        cache.add(_key(scope), _initial(), timeout=None)
+        version = cache.get(_key(scope))
+    return version
+
+
+def get_versions(*scopes):
+    """Versions of several scopes in one cache round trip."""
+    found = cache.get_many([_key(scope) for scope in scopes])
+    return [found[_key(scope)] if _key(scope) in found else get_version(scope) for scope in scopes]
+
+
+def bump_version(scope):
+    try:
+        return cache.incr(_key(scope))
+    except ValueError:  # not set yet, or evicted
+        version = _initial()
+        cache.set(_key(scope), version, timeout=None)
+        return version
+
+
+CATALOG_SCOPE = 'catalog'
+
+
+# Per-user scopes are keyed by user id, which the session holds, so checking
+# them never needs a query (see accounts.etags).
+def orders_scope(user_id):
+    return f"orders:{user_id}"
+
+
+def profile_scope(user_id):
+    return f"profile:{user_id}"
+
+
+def inventory_scope(user_id):
+    return f"inventory:{user_id}"
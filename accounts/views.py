@@ -1,27 +1,53 @@
+import asyncio
+import copy
 import json, os
+from decimal import Decimal
+from urllib.parse import urlsplit
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIRequest
+from django.core.handlers.exception import response_for_exception
+from django.db import connections, DatabaseError
 from django.db.models import Sum, Count
 from django.db.models.functions import TruncMonth
-from django.http import JsonResponse, HttpResponse
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.http import JsonResponse, HttpResponse, QueryDict, StreamingHttpResponse
 from django.shortcuts import render, redirect
+from django.urls import Resolver404, resolve
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
+from . import events
+from .changes import InvalidToken, TokenExpired, catalog_changes, encode_token
+from .changes import OVERLAP as CHANGES_OVERLAP
+from .dedupe import find_canonical
+from .etags import conditional
+from .fragments import cached_fragment
+from .optimizer import CartOptimizer
+from .parallel import gather_queries
+from .partitions import hot_since, live_totals_since
+from .pricing import PricingError, price_cart
+from .routers import read_only, replica_status
+from .snapshots import MANIFEST_NAME as SNAPSHOT_MANIFEST, snapshot_url
+from .sparse import narrow, select_names, sparse_fields
+from .swr import stale_while_revalidate
+from .tiered_cache import tier_stats
+from .versioning import CATALOG_SCOPE, inventory_scope, orders_scope, profile_scope
 from .models import (
     VendorProfile, SupplierProfile, Product, Order,
-    SupplierInventory, SharedOrder, get_user_type
+    SupplierInventory, SharedOrder, MonthlyOrderTotal, get_user_type
 )
 from .serializers import (
-    ProductSerializer, OrderSerializer, UserProfileSerializer, VendorProfileSerializer
+    ProductSerializer, ProductListSerializer, OrderSerializer, UserProfileSerializer, VendorProfileSerializer
 )
-from django.views.decorators.csrf import ensure_csrf_cookie
+from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
 from django.middleware.csrf import get_token
 
 @ensure_csrf_cookie
@@ -30,6 +56,64 @@ def get_csrf_token(request):
     Returns the CSRF token for use in frontend fetch() calls.
     """
     return JsonResponse({'csrfToken': get_token(request)})
+
+
+# -------------------- HEALTH --------------------
+def connection_stats(alias='default'):
+    """
+    Describe how a database alias reuses connections. When the psycopg 3 pool
+    is enabled this includes checkout counts and accumulated wait time.
+    """
+    connection = connections[alias]
+    stats = {
+        "vendor": connection.vendor,
+        "conn_max_age": connection.settings_dict.get('CONN_MAX_AGE'),
+        "conn_health_checks": connection.settings_dict.get('CONN_HEALTH_CHECKS'),
+        "pool": None,
+    }
+    pool = getattr(connection, 'pool', None)  # only the postgresql backend has one
+    if pool is not None:
+        raw = pool.get_stats()  # psycopg_pool omits counters that are still zero
+        checkouts = raw.get('requests_num', 0)
+        wait_ms = raw.get('requests_wait_ms', 0)
+        stats["pool"] = {
+            "min_size": raw.get('pool_min', 0),
+            "max_size": raw.get('pool_max', 0),
+            "size": raw.get('pool_size', 0),
+            "available": raw.get('pool_available', 0),
+            "checkouts": checkouts,
+            "waiting": raw.get('requests_waiting', 0),
+            "queued": raw.get('requests_queued', 0),
+            "wait_ms_total": wait_ms,
+            "wait_ms_avg": round(wait_ms / checkouts, 3) if checkouts else 0,
+            "errors": raw.get('requests_errors', 0),
+            "connections_opened": raw.get('connections_num', 0),
+            "connections_lost": raw.get('connections_lost', 0),
+        }
+    return stats
+
+
+def health_check(request):
+    """
+    Liveness probe. Anyone gets the status; staff users also get the database
+    error, connection reuse/pool stats, replica lag and this process's cache
+    hit rates.
+    """
+    try:
+        with connections['default'].cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError as e:
+        body, status_code = {"status": "error", "error": str(e)}, 503
+    else:
+        body, status_code = {"status": "ok"}, 200
+    if not request.user.is_staff:
+        return JsonResponse({"status": body["status"]}, status=status_code)
+    body["database"] = connection_stats()
+    body["database"]["replica_lag_seconds"] = replica_status()
+    body["cache"] = tier_stats()
+    return JsonResponse(body, status=status_code)
+
+
 # -------------------- AUTH & SIGNUP --------------------
 def signup_page(request):
     if request.method == "POST":
@@ -110,12 +194,10 @@ def vendor_dashboard(request):
     vendor_profile = VendorProfile.objects.filter(user=request.user).first()
     if not vendor_profile:
         return render(request, 'error.html', {"message": "You are not a vendor!"})
-    orders = Order.objects.filter(vendor=vendor_profile).order_by('-date')
-    products = Product.objects.all()
+    # Catalog, orders and profile are loaded client-side from /api/vendor/bootstrap/.
     return render(request, 'dashboard.html', {
         'vendor': vendor_profile,
-        'orders': orders,
-        'products': products,
+        'catalog_manifest_url': snapshot_url(SNAPSHOT_MANIFEST),
     })
 
 
@@ -151,17 +233,72 @@ def import_products_view(request):
     return HttpResponse("Products imported successfully!")
 
 
+def catalog_queryset(params):
+    """
+    Products matching the catalog query parameters shared by the list endpoints:
+    ?category=, ?supplier= (a SupplierProfile id) and ?offset= (skip rows the
+    vendor bootstrap already sent).
+    """
+    products = Product.objects.select_related('best_offer')
+    category = params.get('category')
+    if category:
+        products = products.filter(category__iexact=category)
+    supplier = params.get('supplier', '')
+    if supplier.isdigit():
+        products = products.filter(supplier_profile_id=int(supplier))
+    offset = params.get('offset', '')
+    if offset.isdigit():
+        products = products.order_by('id')[int(offset):]
+    return products
+
+
+@conditional(CATALOG_SCOPE)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def product_list(request):
-    category = request.GET.get('category')
-    products = Product.objects.all()
-    if category:
-        products = products.filter(category__iexact=category)
-    serializer = ProductSerializer(products, many=True)
+    fields = sparse_fields(request.GET)
+    products = narrow(catalog_queryset(request.GET), ProductListSerializer, **fields)
+    serializer = ProductListSerializer(products, many=True, **fields)
     return Response(serializer.data)
 
 
+@conditional(CATALOG_SCOPE)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def product_detail(request, product_id):
+    """One product with every field, including those the catalog listing leaves out."""
+    fields = sparse_fields(request.GET)
+    try:
+        product = narrow(Product.objects.select_related('best_offer'), ProductSerializer, **fields).get(id=product_id)
+    except Product.DoesNotExist:
+        return Response({"error": "Product not found."}, status=status.HTTP_404_NOT_FOUND)
+    return Response(ProductSerializer(product, **fields).data)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def product_changes(request):
+    """
+    Catalog delta since ?since=<token> (everything when omitted). Call again
+    with the returned token; "more" means another page is ready right away.
+    """
+    fields = sparse_fields(request.GET)
+    products = narrow(Product.objects.all(), ProductListSerializer, **fields, also=['updated_at'])
+    try:
+        changed, deleted, token, more = catalog_changes(request.GET.get('since'), products=products)
+    except InvalidToken as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except TokenExpired:
+        return Response({"error": "Change token expired, reload the full catalog", "resync": True},
+                        status=status.HTTP_410_GONE)
+    return Response({
+        "changed": ProductListSerializer(changed, many=True, **fields).data,
+        "deleted": deleted,
+        "token": token,
+        "more": more,
+    })
+
+
 # -------------------- VENDOR APIs --------------------
 @login_required
 def orders_api(request):
@@ -177,32 +314,122 @@ def profile_api(request):
     return JsonResponse({"error": "Not authenticated"}, status=401)
 
 
+@conditional(orders_scope, window=hot_since)
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def order_list(request):
     vendor_profile = request.user.vendor_profile
     if request.method == 'POST':
         items = request.data.get('items', [])
+        try:
+            priced = price_cart(items)
+        except PricingError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         created_orders = []
-        for item in items:
+        for line in priced['lines']:
             order = Order.objects.create(
                 vendor=vendor_profile,
                 order_id=f"ORD{Order.objects.count() + 1:03d}",
                 customer=f"{request.user.first_name} {request.user.last_name}".strip(),
-                item_name=item['name'],
-                amount=item['price'] * item['quantity'],
+                item_name=line['name'],
+                amount=line['amount'],
                 progress=1,
-                date=timezone.now()
+                date=timezone.localdate()
             )
             created_orders.append(order)
-        return Response({"success": True, "message": "Orders created successfully."})
+        return Response({"success": True, "message": "Orders created successfully.", "total": priced['total']})
 
-    orders = Order.objects.filter(vendor=vendor_profile).order_by('-date')
+    fields = sparse_fields(request.GET)
+    orders = narrow(Order.objects.filter(vendor=vendor_profile).order_by('-date'), OrderSerializer, **fields)
     current_orders = orders.filter(progress__lt=3)
-    recent_orders = orders.filter(progress=3)[:5]
+    # Only completed orders are limited to the hot window; orders in progress
+    # show however old they are (and keep their month from being archived).
+    recent_orders = orders.filter(progress=3, date__gte=hot_since())[:5]
     return Response({
+        "currentOrders": OrderSerializer(current_orders, many=True, **fields).data,
+        "recentOrders": OrderSerializer(recent_orders, many=True, **fields).data
+    })
+
+
+def order_event_channels(user):
+    if hasattr(user, 'vendor_profile'):
+        return [events.vendor_channel(user.vendor_profile.id)]
+    if hasattr(user, 'supplier_profile'):
+        return [events.supplier_channel(user.supplier_profile.id)]
+    return []
+
+
+async def order_events(request):
+    """
+    Server-Sent Events stream of order created/progress events for the
+    logged-in vendor or supplier. Replaces re-fetching the order lists.
+    """
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI the stream would tie up a worker per open tab and never
+        # flush. 204 tells EventSource not to reconnect; the dashboards poll.
+        return HttpResponse(status=204)
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse({"error": "Not authenticated"}, status=401)
+    channels = await sync_to_async(order_event_channels)(user)
+    if not channels:
+        return JsonResponse({"error": "Profile not found"}, status=403)
+
+    response = StreamingHttpResponse(events.stream(channels), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # don't let nginx buffer the stream
+    return response
+
+
+def _bootstrap_catalog(page_size):
+    # Taken before the catalog is read, so nothing changed meanwhile is missed.
+    changes_token = encode_token(timezone.now() - CHANGES_OVERLAP)
+    products = list(narrow(Product.objects.order_by('id'), ProductListSerializer)[:page_size + 1])
+    return {
+        "results": ProductListSerializer(products[:page_size], many=True).data,
+        "next_offset": page_size if len(products) > page_size else None,
+        "changes_token": changes_token,
+    }
+
+
+def _bootstrap_orders(vendor_profile):
+    # Current orders plus the five most recent completed ones in the hot
+    # window. Two queries rather than one with an OR, so that the first
+    # uses order_in_progress_idx and the second reads the hot months only.
+    orders = Order.objects.filter(vendor=vendor_profile).order_by('-date')
+    current_orders = list(orders.filter(progress__lt=3))
+    recent_orders = list(orders.filter(progress=3, date__gte=hot_since())[:5])
+    for order in current_orders + recent_orders:
+        order.vendor = vendor_profile
+    return {
         "currentOrders": OrderSerializer(current_orders, many=True).data,
-        "recentOrders": OrderSerializer(recent_orders, many=True).data
+        "recentOrders": OrderSerializer(recent_orders, many=True).data,
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def vendor_bootstrap(request):
+    """
+    Everything the vendor dashboard needs on load - profile, first catalog page,
+    current and recent orders - in one response. The catalog and orders
+    sections are cached until a product or one of the vendor's orders changes,
+    so a repeat load costs only the profile lookup.
+    """
+    user = request.user
+    vendor_profile = VendorProfile.objects.filter(user=user).first()
+    if not vendor_profile:
+        return Response({"error": "Only vendors have a dashboard"}, status=status.HTTP_403_FORBIDDEN)
+    vendor_profile.user = user
+    User._meta.get_field('vendor_profile').set_cached_value(user, vendor_profile)
+
+    page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+    return Response({
+        "profile": UserProfileSerializer(user).data,
+        "catalog": cached_fragment(f"bootstrap-catalog:{page_size}", [CATALOG_SCOPE],
+                                   lambda: _bootstrap_catalog(page_size)),
+        "orders": cached_fragment(f"bootstrap-orders:{user.id}:{hot_since()}", [orders_scope(user.id)],
+                                  lambda: _bootstrap_orders(vendor_profile)),
     })
 
 
@@ -233,6 +460,62 @@ def update_profile(request):
 
 
 # -------------------- SUPPLIER APIs --------------------
+DASHBOARD_SECTIONS = ["stats", "revenueChart", "categoryChart"]
+# The dashboard aggregates are served from cache for up to a minute and
+# refreshed in the background after that; see accounts.swr.
+DASHBOARD_FRESH_SECONDS = 60
+
+
+# The dashboard aggregates are plain query functions shared by the sync view
+# and its async twin, which runs them concurrently (accounts.parallel).
+def _live_order_totals(supplier_id):
+    # Only the latest months' partitions; the rest are rolled up.
+    return SharedOrder.objects.filter(supplier_id=supplier_id, date__gte=live_totals_since()).aggregate(
+        count=Count('id'), revenue=Sum('amount'))
+
+
+def _closed_order_totals(supplier_id):
+    return MonthlyOrderTotal.objects.filter(supplier_id=supplier_id, month__lt=live_totals_since()).aggregate(
+        count=Sum('orders'), revenue=Sum('revenue'))
+
+
+def _active_products(supplier_id):
+    return SupplierInventory.objects.filter(supplier_id=supplier_id).count()
+
+
+SUPPLIER_STATS_QUERIES = (_live_order_totals, _closed_order_totals, _active_products)
+
+
+def _supplier_stats(live, closed, active_products):
+    # Lifetime totals: the latest months' orders plus the rolled-up months.
+    return {
+        "newOrders": live['count'] + (closed['count'] or 0),
+        "activeProducts": active_products,
+        "revenue": (live['revenue'] or 0) + (closed['revenue'] or 0)
+    }
+
+
+def _category_chart(supplier_id):
+    # Category breakdown (handle missing product safely)
+    categories = SupplierInventory.objects.filter(supplier_id=supplier_id, product__isnull=False).values(
+        'product__category'
+    ).annotate(count=Count('id'))
+    return {
+        "labels": [c['product__category'] for c in categories],
+        "data": [c['count'] for c in categories],
+    }
+
+
+@stale_while_revalidate('supplier-stats', fresh_for=DASHBOARD_FRESH_SECONDS)
+def supplier_stats(supplier_id):
+    return _supplier_stats(*(query(supplier_id) for query in SUPPLIER_STATS_QUERIES))
+
+
+@stale_while_revalidate('supplier-categories', fresh_for=DASHBOARD_FRESH_SECONDS)
+def supplier_category_chart(supplier_id):
+    return _category_chart(supplier_id)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def supplier_dashboard_api(request):
@@ -241,56 +524,61 @@ def supplier_dashboard_api(request):
         return Response({"error": "No supplier profile found"}, status=status.HTTP_403_FORBIDDEN)
 
     supplier = request.user.supplier_profile
+    sections = select_names(DASHBOARD_SECTIONS, **sparse_fields(request.GET))
+    data = {}
 
-    # Stats
-    new_orders = SharedOrder.objects.filter(supplier=supplier).count()
-    active_products = SupplierInventory.objects.filter(supplier=supplier).count()
-    total_revenue = SharedOrder.objects.filter(supplier=supplier).aggregate(Sum('amount'))['amount__sum'] or 0
-
-    # Category breakdown (handle missing product safely)
-    categories = SupplierInventory.objects.filter(supplier=supplier, product__isnull=False).values(
-        'product__category'
-    ).annotate(count=Count('id'))
-    category_labels = [c['product__category'] for c in categories]
-    category_data = [c['count'] for c in categories]
+    if "stats" in sections:
+        data["stats"] = supplier_stats(supplier.id)
 
     # Revenue chart (we can later make it dynamic based on order dates)
-    revenue_labels = ["Jan", "Feb", "Mar", "Apr", "May", "Jun"]
-    revenue_data = [15000, 19000, 22000, 18000, 24000, 28000]  # Placeholder
+    if "revenueChart" in sections:
+        revenue_labels = ["Jan", "Feb", "Mar", "Apr", "May", "Jun"]
+        revenue_data = [15000, 19000, 22000, 18000, 24000, 28000]  # Placeholder
+        data["revenueChart"] = {"labels": revenue_labels, "data": revenue_data}
 
-    return Response({
-        "stats": {
-            "newOrders": new_orders,
-            "activeProducts": active_products,
-            "revenue": total_revenue
-        },
-        "revenueChart": {"labels": revenue_labels, "data": revenue_data},
-        "categoryChart": {"labels": category_labels, "data": category_data}
-    })
+    if "categoryChart" in sections:
+        data["categoryChart"] = supplier_category_chart(supplier.id)
+
+    return Response(data)
 
 
-@login_required
+# Response field -> the columns it is built from; "price" falls back to the list price.
+INVENTORY_COLUMNS = {
+    "id": ["id"],
+    "product_name": ["product__name"],
+    "category": ["product__category"],
+    "price": ["custom_price", "product__price"],
+    "stock_quantity": ["stock_quantity"],
+    "image": ["product__image"],
+    "description": ["product__description"],
+}
+
+
+@conditional(inventory_scope, CATALOG_SCOPE)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
 def supplier_inventory_api(request):
     supplier = request.user.supplier_profile
-    inventory = SupplierInventory.objects.filter(supplier=supplier).select_related('product')
+    names = select_names(INVENTORY_COLUMNS, **sparse_fields(request.GET))
+    rows = SupplierInventory.objects.filter(supplier=supplier).values(
+        *{column for name in names for column in INVENTORY_COLUMNS[name]}
+    )
     data = [
         {
-            "id": inv.id,
-            "product_name": inv.product.name,
-            "category": inv.product.category,
-            "price": inv.custom_price or inv.product.price,
-            "stock_quantity": inv.stock_quantity,
-            "image": inv.product.image,
-            "description": inv.product.description
+            name: (row['custom_price'] or row['product__price']) if name == 'price' else row[INVENTORY_COLUMNS[name][0]]
+            for name in names
         }
-        for inv in inventory
+        for row in rows
     ]
     return Response(data)
 
-@login_required
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
 def supplier_orders_api(request):
     supplier = request.user.supplier_profile
-    orders = SharedOrder.objects.filter(supplier=supplier).values()
+    columns = select_names([field.attname for field in SharedOrder._meta.concrete_fields],
+                           **sparse_fields(request.GET))
+    orders = SharedOrder.objects.filter(supplier=supplier).values(*columns)
     return Response(list(orders))
 
 @api_view(['POST'])
@@ -343,22 +631,55 @@ def create_order(request):
     if not cart_items:
         return Response({"error": "Cart is empty"}, status=status.HTTP_400_BAD_REQUEST)
 
+    # Prices come from the catalog and supplier inventory, never from the client.
+    try:
+        priced = price_cart(cart_items)
+    except PricingError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
     created_orders = []
-    for item in cart_items:
+    for line in priced['lines']:
         order = Order.objects.create(
             vendor=vendor_profile,
             order_id=f"ORD{Order.objects.count() + 1:03d}",
             customer=vendor_profile.company_name or request.user.get_full_name(),
-            item_name=item['name'],
+            item_name=line['name'],
             progress=1,
-            amount=item['price'] * item['quantity'],
-            date=timezone.now()
+            amount=line['amount'],
+            date=timezone.localdate()
         )
         created_orders.append(order)
 
     return Response(OrderSerializer(created_orders, many=True).data, status=status.HTTP_201_CREATED)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def cart_optimize(request):
+    """
+    Split a cart across suppliers at minimum cost.
+    Body: {"cart": [{"id", "quantity"}], "max_suppliers": optional int, "min_order": optional amount}
+    """
+    cart_items = request.data.get('cart', [])
+    if not cart_items:
+        return Response({"error": "Cart is empty"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        max_suppliers = request.data.get('max_suppliers')
+        max_suppliers = int(max_suppliers) if max_suppliers is not None else None
+        min_order = request.data.get('min_order')
+        min_order = Decimal(str(min_order)) if min_order is not None else None
+    except (TypeError, ValueError, ArithmeticError):
+        return Response({"error": "max_suppliers and min_order must be numbers"}, status=status.HTTP_400_BAD_REQUEST)
+    if max_suppliers is not None and max_suppliers < 1:
+        return Response({"error": "max_suppliers must be at least 1"}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        optimizer = CartOptimizer(cart_items)
+    except PricingError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(optimizer.solve(max_suppliers=max_suppliers, min_order=min_order))
+
+
 # @api_view(['GET'])
 # @permission_classes([IsAuthenticated])
 # def profile_view(request):
@@ -393,6 +714,7 @@ def create_order(request):
 #         return Response({"error": "Profile not found"}, status=404)
 #
 #     return Response(profile)
+@conditional(profile_scope)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def profile_view(request):
@@ -400,15 +722,9 @@ def profile_view(request):
     Unified profile view for vendors and suppliers.
     Returns user info + vendor/supplier profile data.
     """
-    serializer = UserProfileSerializer(request.user)
+    serializer = UserProfileSerializer(request.user, **sparse_fields(request.GET))
     return Response(serializer.data)
 
-@api_view(['POST'])
-@permission_classes([IsAuthenticated])
-@api_view(['POST'])
-@permission_classes([IsAuthenticated])
-@api_view(['POST'])
-@permission_classes([IsAuthenticated])
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def supplier_inventory_add_api(request):
@@ -429,36 +745,44 @@ def supplier_inventory_add_api(request):
             return Response({"error": f"{field} is required"}, status=status.HTTP_400_BAD_REQUEST)
 
     try:
-        # Step 1: Create Product
-        product = Product.objects.create(
-            name=data['name'],
-            price=data['price'],
-            rating=data.get('rating', 0),
-            rating_count=data.get('rating_count', 0),
-            category=data['category'],
-            image=data.get('image', 'https://cdn-icons-png.flaticon.com/512/3081/3081559.png'),
-            badge=data.get('badge', ''),
-            supplier=supplier.organization_name,
-            supplier_image=data.get('supplier_image', 'https://randomuser.me/api/portraits/men/1.jpg'),
-            description=data.get('description', '')
-        )
+        # Step 1: Reuse the catalog entry if another supplier already lists
+        # this item; the supplier's own price then becomes its custom price.
+        product = find_canonical(data['name'], data['category'])
+        matched = product is not None
+        if matched:
+            custom_price = data.get('custom_price') or data['price']
+        else:
+            product = Product.objects.create(
+                name=data['name'],
+                price=data['price'],
+                rating=data.get('rating', 0),
+                rating_count=data.get('rating_count', 0),
+                category=data['category'],
+                image=data.get('image', 'https://cdn-icons-png.flaticon.com/512/3081/3081559.png'),
+                badge=data.get('badge', ''),
+                supplier=supplier.organization_name,
+                supplier_profile=supplier,
+                supplier_image=data.get('supplier_image', 'https://randomuser.me/api/portraits/men/1.jpg'),
+                description=data.get('description', '')
+            )
+            custom_price = data.get('custom_price') or None
 
         # Step 2: Add to SupplierInventory
-        SupplierInventory.objects.create(
+        inventory, _ = SupplierInventory.objects.update_or_create(
             supplier=supplier,
             product=product,
-            stock_quantity=data['stock_quantity'],
-            custom_price=data.get('custom_price') or None
+            defaults={'stock_quantity': data['stock_quantity'], 'custom_price': custom_price},
         )
 
         return Response({
             "id": product.id,
             "name": product.name,
             "category": product.category,
-            "price": product.price,
+            "price": inventory.custom_price or product.price,
             "stock_quantity": data['stock_quantity'],
             "image": product.image,
-            "description": product.description
+            "description": product.description,
+            "matched_existing": matched,
         }, status=status.HTTP_201_CREATED)
 
     except Exception as e:
@@ -470,16 +794,253 @@ def supplier_inventory_add_api(request):
 
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
-def supplier_inventory_delete_api(request, pk):
-    """Delete product (both SupplierInventory & Product)."""
+def supplier_inventory_delete_api(request, item_id):
+    """
+    Remove the item from the supplier's inventory. The Product goes too when
+    the supplier created it and no other supplier stocks it.
+    """
     supplier = request.user.supplier_profile
     try:
-        inventory_item = SupplierInventory.objects.get(id=pk, supplier=supplier)
+        inventory_item = SupplierInventory.objects.get(id=item_id, supplier=supplier)
     except SupplierInventory.DoesNotExist:
         return Response({"error": "Product not found or unauthorized"}, status=404)
 
     product = inventory_item.product
     inventory_item.delete()
-    product.delete()
+    # Products are shared between suppliers, and imported ones belong to no
+    # supplier; only drop the supplier's own product once nobody else stocks it.
+    if product.supplier_profile_id == supplier.id and not product.supplier_inventories.exists():
+        product.delete()
 
     return Response({"success": True, "message": "Product deleted successfully"})
+
+
+# -------------------- ASYNC READ APIs (ASGI) --------------------
+# Async twins of the read-heavy endpoints, routed instead of the DRF views when
+# settings.ASYNC_API_VIEWS is on. They return the same JSON, but a slow query
+# parks a coroutine rather than a whole worker thread.
+
+def _json_response(data, status=200):
+    # DRF's renderer keeps the payload byte-identical to the sync views.
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
+
+
+def _not_authenticated():
+    return _json_response({"detail": "Authentication credentials were not provided."},
+                          status=status.HTTP_403_FORBIDDEN)
+
+
+async def _aload_profile(user):
+    """
+    Fetch the user's vendor or supplier profile and cache both reverse
+    relations on the user, so hasattr() checks afterwards cost no query.
+    """
+    vendor = await VendorProfile.objects.filter(user=user).afirst()
+    supplier = None if vendor else await SupplierProfile.objects.filter(user=user).afirst()
+    for name, profile in (('vendor_profile', vendor), ('supplier_profile', supplier)):
+        if profile is not None:
+            profile.user = user
+        User._meta.get_field(name).set_cached_value(user, profile)
+    return vendor or supplier
+
+
+@conditional(CATALOG_SCOPE)
+async def product_list_async(request):
+    if request.method != 'GET':
+        return _json_response({"detail": f'Method "{request.method}" not allowed.'},
+                              status=status.HTTP_405_METHOD_NOT_ALLOWED)
+    fields = sparse_fields(request.GET)
+    products = [product async for product in narrow(catalog_queryset(request.GET), ProductListSerializer, **fields)]
+    return _json_response(ProductListSerializer(products, many=True, **fields).data)
+
+
+@conditional(CATALOG_SCOPE)
+async def product_detail_async(request, product_id):
+    if request.method != 'GET':
+        return _json_response({"detail": f'Method "{request.method}" not allowed.'},
+                              status=status.HTTP_405_METHOD_NOT_ALLOWED)
+    fields = sparse_fields(request.GET)
+    product = await narrow(Product.objects.select_related('best_offer'), ProductSerializer, **fields).filter(
+        id=product_id).afirst()
+    if product is None:
+        return _json_response({"error": "Product not found."}, status=status.HTTP_404_NOT_FOUND)
+    return _json_response(ProductSerializer(product, **fields).data)
+
+
+@csrf_exempt  # POST is handed to the DRF view, which enforces CSRF itself
+@conditional(orders_scope, window=hot_since)
+async def order_list_async(request):
+    if request.method != 'GET':
+        return await sync_to_async(order_list)(request)
+    user = await request.auser()
+    if not user.is_authenticated:
+        return _not_authenticated()
+    vendor_profile = await VendorProfile.objects.aget(user=user)
+
+    fields = sparse_fields(request.GET)
+    orders = narrow(Order.objects.filter(vendor=vendor_profile).order_by('-date'), OrderSerializer, **fields)
+    current_orders = [order async for order in orders.filter(progress__lt=3)]
+    recent_orders = [order async for order in orders.filter(progress=3, date__gte=hot_since())[:5]]
+    return _json_response({
+        "currentOrders": OrderSerializer(current_orders, many=True, **fields).data,
+        "recentOrders": OrderSerializer(recent_orders, many=True, **fields).data
+    })
+
+
+@stale_while_revalidate('supplier-stats', fresh_for=DASHBOARD_FRESH_SECONDS)
+async def asupplier_stats(supplier_id):
+    return _supplier_stats(*await gather_queries(*((query, supplier_id) for query in SUPPLIER_STATS_QUERIES)))
+
+
+@stale_while_revalidate('supplier-categories', fresh_for=DASHBOARD_FRESH_SECONDS)
+async def asupplier_category_chart(supplier_id):
+    [chart] = await gather_queries((_category_chart, supplier_id))
+    return chart
+
+
+async def supplier_dashboard_api_async(request):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return _not_authenticated()
+    supplier = await SupplierProfile.objects.filter(user=user).afirst()
+    if supplier is None:
+        return _json_response({"error": "No supplier profile found"}, status=status.HTTP_403_FORBIDDEN)
+
+    sections = select_names(DASHBOARD_SECTIONS, **sparse_fields(request.GET))
+
+    async def revenue_chart():
+        # Revenue chart (we can later make it dynamic based on order dates)
+        revenue_labels = ["Jan", "Feb", "Mar", "Apr", "May", "Jun"]
+        revenue_data = [15000, 19000, 22000, 18000, 24000, 28000]  # Placeholder
+        return {"labels": revenue_labels, "data": revenue_data}
+
+    # The sections are independent and their queries run on connections of
+    # their own, so they are gathered. Both aggregates share their cache
+    # entries with the sync view.
+    builders = {
+        "stats": lambda: asupplier_stats(supplier.id),
+        "revenueChart": revenue_chart,
+        "categoryChart": lambda: asupplier_category_chart(supplier.id),
+    }
+    results = await asyncio.gather(*(builders[name]() for name in sections))
+    return _json_response(dict(zip(sections, results)))
+
+
+@conditional(profile_scope)
+async def profile_view_async(request):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return _not_authenticated()
+    await _aload_profile(user)
+    return _json_response(UserProfileSerializer(user, **sparse_fields(request.GET)).data)
+
+
+# -------------------- BATCH --------------------
+MAX_BATCH_REQUESTS = 20
+
+
+# Headers of the batch POST that mean nothing for its GETs: validators for the
+# batch response itself and the description of its body.
+_BATCH_ONLY_META = (
+    'HTTP_IF_NONE_MATCH', 'HTTP_IF_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'HTTP_IF_UNMODIFIED_SINCE', 'HTTP_IF_RANGE',
+    'HTTP_RANGE', 'CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_CONTENT_ENCODING', 'HTTP_TRANSFER_ENCODING',
+)
+
+
+def _sub_request(request, user, path):
+    """
+    A GET for `path` that shares the batch request's session, user and cookies,
+    so authentication is resolved once for the whole batch.
+    """
+    url = urlsplit(path)
+    sub = copy.copy(request)
+    sub.__dict__.pop('headers', None)  # cached from the batch's META
+    sub.user = user
+    sub.method = 'GET'
+    sub.path = sub.path_info = url.path
+    sub.GET = QueryDict(url.query)
+    sub.META = {key: value for key, value in request.META.items() if key not in _BATCH_ONLY_META}
+    sub.META.update({'REQUEST_METHOD': 'GET', 'PATH_INFO': url.path, 'QUERY_STRING': url.query})
+    return sub
+
+
+def _run_sub_request(path, match, sub):
+    try:
+        response = match.func(sub, *match.args, **match.kwargs)
+    except Exception as e:
+        response = response_for_exception(sub, e)
+    return _batch_result(path, response)
+
+
+async def _arun_sub_request(path, match, sub):
+    try:
+        response = await match.func(sub, *match.args, **match.kwargs)
+    except Exception as e:
+        response = await sync_to_async(response_for_exception)(sub, e)
+    return _batch_result(path, response)
+
+
+def _batch_result(path, response):
+    if response.streaming:
+        return {"path": path, "status": status.HTTP_400_BAD_REQUEST,
+                "body": {"error": "Streaming endpoints can't be batched"}}
+    if hasattr(response, 'data'):  # DRF Response: skip the render/parse round trip
+        body = response.data
+    elif response.get('Content-Type', '').startswith('application/json'):
+        body = json.loads(response.content)
+    else:
+        body = response.content.decode(response.charset)
+    return {"path": path, "status": response.status_code, "body": body}
+
+
+@read_only
+async def batch_api(request):
+    """
+    Run several internal GET requests in one round trip:
+    POST {"requests": ["/api/profile/", "/supplier/api/dashboard/", ...]}
+    returns {"responses": [{"path", "status", "body"}, ...]} in the same order.
+
+    Sub-requests are resolved through the URLconf and share this request's
+    authenticated user, but not its conditional or body headers. They run
+    concurrently (accounts.parallel): sync views each on a worker thread with
+    a database connection of its own, async views on this event loop. The
+    batch is marked read_only: its sub-requests may read from replicas like
+    the GETs they stand for, and it doesn't pin the client to the primary.
+    """
+    if request.method != 'POST':
+        return _json_response({"detail": f'Method "{request.method}" not allowed.'},
+                              status=status.HTTP_405_METHOD_NOT_ALLOWED)
+    user = await request.auser()
+    if not user.is_authenticated:
+        return _not_authenticated()
+    try:
+        paths = json.loads(request.body).get('requests', [])
+    except (ValueError, AttributeError):
+        return _json_response({"error": "Expected a JSON object with a 'requests' list"},
+                              status=status.HTTP_400_BAD_REQUEST)
+    if not isinstance(paths, list) or not all(isinstance(p, str) for p in paths):
+        return _json_response({"error": "'requests' must be a list of paths"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(paths) > MAX_BATCH_REQUESTS:
+        return _json_response({"error": f"At most {MAX_BATCH_REQUESTS} requests per batch"},
+                              status=status.HTTP_400_BAD_REQUEST)
+
+    results = [None] * len(paths)
+    calls, call_indexes = [], []
+    for index, path in enumerate(paths):
+        try:
+            match = resolve(urlsplit(path).path)
+        except Resolver404:
+            results[index] = {"path": path, "status": status.HTTP_404_NOT_FOUND, "body": {"error": "Not found"}}
+            continue
+        if match.func is batch_api:
+            results[index] = {"path": path, "status": status.HTTP_400_BAD_REQUEST,
+                              "body": {"error": "Batches can't be nested"}}
+            continue
+        sub = _sub_request(request, user, path)
+        sub.resolver_match = match
+        run = _arun_sub_request if iscoroutinefunction(match.func) else _run_sub_request
+        calls.append((run, path, match, sub))
+        call_indexes.append(index)
+    for index, result in zip(call_indexes, await gather_queries(*calls)):
+        results[index] = result
+    return _json_response({"responses": results})
@@ -0,0 +1,1111 @@
+    document.addEventListener("DOMContentLoaded", function () {
+      // =============================================
+      // BATCHED INITIAL LOAD
+      // =============================================
+      // Profile, stats, inventory and orders come back from one /api/batch/
+      // call. Each result is handed out once; later reloads fetch normally.
+      const batchedPaths = [
+        '/api/profile/',
+        '/supplier/api/dashboard/',
+        '/supplier/api/inventory/',
+        '/supplier/api/orders/',
+      ];
+      const batchResults = fetch('/api/batch/', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', 'X-CSRFToken': getCSRFToken() },
+        body: JSON.stringify({ requests: batchedPaths }),
+      })
+        .then((res) => (res.ok ? res.json() : { responses: [] }))
+        .catch(() => ({ responses: [] }));
+      const consumedPaths = new Set();
+
+      function batchedFetch(path) {
+        if (consumedPaths.has(path)) return fetch(path);
+        consumedPaths.add(path);
+        return batchResults.then(({ responses }) => {
+          const hit = responses.find((r) => r.path === path);
+          if (!hit) return fetch(path);
+          return new Response(JSON.stringify(hit.body), {
+            status: hit.status,
+            headers: { 'Content-Type': 'application/json' },
+          });
+        });
+      }
+
+      function loadSidebarUser() {
+  batchedFetch('/api/profile/')
+    .then(res => {
+      if (!res.ok) throw new Error('Failed to fetch user profile');
+      return res.json();
+    })
+    .then(user => {
+      // Full name or email
+      const fullName = `${user.first_name || ''} ${user.last_name || ''}`.trim() || user.email;
+      document.getElementById('sidebarUserName').textContent = fullName;
+
+      // Initials for profile image circle
+      const initials = fullName.split(" ").map(n => n[0]?.toUpperCase()).join("").slice(0,2);
+      document.getElementById('sidebarUserImg').textContent = initials || 'U';
+
+      // Role (Vendor/Supplier)
+      document.getElementById('sidebarUserRole').textContent =
+        user.user_type === 'supplier' ? 'Supplier Admin' : 'Vendor Admin';
+    })
+    .catch(err => console.error("Error loading user profile:", err));
+}
+
+// Call on page load
+loadSidebarUser();
+      // =============================================
+      // GLOBAL VARIABLES AND DATA STORAGE
+      // =============================================
+      let dashboardData = null;
+      let products = [];
+      let ordersData = [];
+
+      // Sample user data for settings
+      const userData = {
+        companyName: "SupplierPro Inc.",
+        contactEmail: "john@supplierpro.com",
+        phoneNumber: "+1 (555) 123-4567",
+        businessAddress: "123 Culinary Street, Foodville, FC 12345",
+        location: "123 Culinary Street, Foodville, FC 12345",
+        notifications: {
+          newOrders: true,
+          lowStock: true,
+          monthlyReports: false,
+        },
+        security: {
+          twoFactorEnabled: false,
+          lastPasswordChange: "2023-04-15",
+        },
+      };
+
+      // =============================================
+      // NAVIGATION MANAGEMENT
+      // =============================================
+      document.querySelectorAll(".nav-links a").forEach((link) => {
+        link.addEventListener("click", function (e) {
+          e.preventDefault();
+          const pageId = this.getAttribute("data-page");
+
+          // Update active nav link
+          document.querySelectorAll(".nav-links a").forEach((a) => {
+            a.classList.remove("active");
+          });
+          this.classList.add("active");
+
+          // Hide all page contents
+          document.querySelectorAll(".page-content").forEach((page) => {
+            page.classList.remove("active");
+          });
+
+          // Show the selected page
+          const pageElement = document.getElementById(pageId);
+          pageElement.classList.add("active");
+
+          // Update header title based on page
+          updateHeaderTitle(pageId);
+
+          // Initialize page-specific functionality
+          initializePage(pageId);
+
+          // Add loading class during transitions
+          pageElement.classList.add("loading");
+          setTimeout(() => pageElement.classList.remove("loading"), 500);
+        });
+      });
+
+      function updateHeaderTitle(pageId) {
+        const headerTitle = document.querySelector(".header-title h1");
+        const headerSubtitle = document.querySelector(".header-title p");
+
+        const titles = {
+          dashboard: [
+            "Dashboard Overview",
+            "View your key metrics and statistics",
+          ],
+          inventory: [
+            "Inventory Management",
+            "Manage your products and stock levels",
+          ],
+          orders: ["Order Management", "View and process customer orders"],
+          analytics: [
+            "Analytics Dashboard",
+            "View your business performance metrics",
+          ],
+          settings: ["Account Settings", "Manage your account preferences"],
+        };
+
+        headerTitle.textContent = titles[pageId][0];
+        headerSubtitle.textContent = titles[pageId][1];
+      }
+
+      function initializePage(pageId) {
+        switch (pageId) {
+          case "dashboard":
+            initDashboard();
+            break;
+          case "inventory":
+            initInventory();
+            break;
+          case "orders":
+            initOrders();
+            break;
+          case "analytics":
+            initAnalytics();
+            break;
+          case "settings":
+            initSettings();
+            break;
+        }
+      }
+
+      // =============================================
+      // DASHBOARD FUNCTIONALITY
+      // =============================================
+      function initDashboard() {
+        // Only load data if we don't have it already
+        if (!dashboardData) {
+          loadDashboardData();
+        } else {
+          // Data already loaded, just update the display
+          updateStats(dashboardData.stats);
+          renderCharts(dashboardData);
+        }
+      }
+
+      function loadDashboardData() {
+        // Show loading state
+        document.querySelectorAll(".stat-card h3").forEach(el => {
+          el.textContent = "Loading...";
+        });
+
+        batchedFetch("/supplier/api/dashboard/")
+  .then((res) => {
+    if (!res.ok) {
+      throw new Error(`HTTP error! status: ${res.status}`);
+    }
+    return res.json();
+  })
+  .then((data) => {
+    dashboardData = data;
+    updateStats(data.stats);       // Update numbers (orders, revenue, products)
+    renderCharts(data);            // Update revenue & category charts
+  })
+  .catch((err) => {
+    console.error("Error loading dashboard data:", err);
+    showToast("Failed to load dashboard data", "error");
+
+    // Fallback to previously loaded data
+    if (dashboardData) {
+      updateStats(dashboardData.stats);
+      renderCharts(dashboardData);
+    }
+  });
+      }
+
+      function updateStats(stats) {
+        const cards = document.querySelectorAll(".stat-card");
+        cards.forEach((card) => {
+          const icon = card.querySelector(".stat-icon i").classList[1];
+          const valueEl = card.querySelector("h3");
+          if (icon.includes("shopping-cart")) {
+            valueEl.textContent = stats.newOrders;
+          } else if (icon.includes("box")) {
+            valueEl.textContent = stats.activeProducts;
+          } else if (icon.includes("dollar-sign")) {
+            valueEl.textContent = `$${(stats.revenue / 1000).toFixed(1)}K`;
+          }
+        });
+      }
+
+      function renderCharts(data) {
+        // Revenue Chart
+        const revenueCtx = document.getElementById("revenueChart");
+        if (revenueCtx) {
+          new Chart(revenueCtx.getContext("2d"), {
+            type: "line",
+            data: {
+              labels: data.revenueChart.labels,
+              datasets: [
+                {
+                  label: "Revenue",
+                  data: data.revenueChart.data,
+                  borderColor: "#3b82f6",
+                  backgroundColor: "rgba(59, 130, 246, 0.1)",
+                  tension: 0.3,
+                  fill: true,
+                },
+              ],
+            },
+            options: getChartOptions(),
+          });
+        }
+
+        // Category Chart
+        const categoryCtx = document.getElementById("categoryChart");
+        if (categoryCtx) {
+          new Chart(categoryCtx.getContext("2d"), {
+            type: "doughnut",
+            data: {
+              labels: data.categoryChart.labels,
+              datasets: [
+                {
+                  data: data.categoryChart.data,
+                  backgroundColor: [
+                    "#3b82f6",
+                    "#60a5fa",
+                    "#93c5fd",
+                    "#bfdbfe",
+                    "#dbeafe",
+                  ],
+                },
+              ],
+            },
+            options: {
+              ...getChartOptions(),
+              plugins: { legend: { position: "bottom" } },
+            },
+          });
+        }
+      }
+
+      function getChartOptions() {
+        return {
+          responsive: true,
+          maintainAspectRatio: false,
+          plugins: { legend: { display: false } },
+          scales: {
+            y: { beginAtZero: true, grid: { drawBorder: false } },
+            x: { grid: { display: false } },
+          },
+        };
+      }
+
+      // =============================================
+      // INVENTORY FUNCTIONALITY
+      // =============================================
+      function initInventory() {
+        // Fetch products from JSON file
+        batchedFetch('/supplier/api/inventory/')
+  .then((response) => response.json())
+  .then((data) => {
+    // Directly map the API response to products
+    products = data.map((item) => ({
+      id: item.id,
+      name: item.product_name,
+      category: item.category,
+      price: item.price,
+      stock_quantity: item.stock_quantity,
+      image: item.image,
+      description: item.description,
+      supplier: "You", // Since this is supplier's own inventory
+    }));
+    renderProducts(products);
+    localStorage.setItem("products", JSON.stringify(products));
+  })
+  .catch((error) => {
+    console.error("Error loading inventory:", error);
+    products = JSON.parse(localStorage.getItem("products")) || [];
+    renderProducts(products);
+  });
+
+
+        // Search and filter functionality
+        document
+          .getElementById("inventorySearch")
+          ?.addEventListener("input", filterProducts);
+        document
+          .getElementById("categoryFilter")
+          ?.addEventListener("change", filterProducts);
+
+        // Product actions (using event delegation)
+        document
+          .getElementById("productGrid")
+          ?.addEventListener("click", handleProductActions);
+
+        // Add Product Modal
+        const modal = document.getElementById("productModal");
+        const addProductBtn = document.getElementById("addProductBtn");
+
+        if (addProductBtn) {
+          addProductBtn.addEventListener("click", () => openModal());
+        }
+
+        if (document.querySelector(".modal-close")) {
+          document
+            .querySelector(".modal-close")
+            .addEventListener("click", closeModal);
+        }
+
+        if (document.getElementById("cancelProduct")) {
+          document
+            .getElementById("cancelProduct")
+            .addEventListener("click", closeModal);
+        }
+
+        if (modal) {
+          modal.addEventListener("click", (e) => {
+            if (e.target === modal) closeModal();
+          });
+        }
+
+        // Product form submission
+        if (document.getElementById("saveProduct")) {
+          document
+            .getElementById("saveProduct")
+            .addEventListener("click", saveProduct);
+        }
+      }
+
+      function handleProductActions(e) {
+        if (e.target.closest(".edit-product")) {
+          const productId = parseInt(
+            e.target.closest(".edit-product").dataset.id
+          );
+          const product = products.find((p) => p.id === productId);
+          openModal(product);
+        }
+
+        if (e.target.closest(".delete-product")) {
+          const productId = parseInt(
+            e.target.closest(".delete-product").dataset.id
+          );
+          deleteProduct(productId);
+        }
+      }
+
+      function renderProducts(productsToRender) {
+        const productGrid = document.getElementById("productGrid");
+        if (!productGrid) return;
+
+        productGrid.innerHTML = productsToRender
+          .map(
+            (product) => `
+          <!-- In your inventory section, update the product card template -->
+<div class="product-card" data-id="${product.id}" data-category="${product.category}">
+  <div class="product-image">
+    <img src="${product.image || 'https://cdn-icons-png.flaticon.com/512/3081/3081559.png'}"
+         alt="${product.name}"
+         onerror="this.src='https://cdn-icons-png.flaticon.com/512/3081/3081559.png'"/>
+    ${product.badge ? `<span class="product-badge">${product.badge}</span>` : ''}
+  </div>
+  <div class="product-info">
+    <h3 class="product-title">${product.name}</h3>
+    <span class="product-category">${product.category}</span>
+
+    <div class="product-meta">
+      <div class="product-price">₹${product.price.toFixed(2)}</div>
+      <div class="product-stock stock-${getStockStatus(product.qty)}">
+        ${getStockText(product.qty)}
+      </div>
+    </div>
+
+    <div class="supplier-info">
+      <img src="${product.supplierImage || 'https://randomuser.me/api/portraits/men/1.jpg'}"
+           class="supplier-avatar"
+           alt="${product.supplier}"
+           onerror="this.src='https://randomuser.me/api/portraits/men/1.jpg'"/>
+      <span class="supplier-name">${product.supplier}</span>
+    </div>
+
+    <div class="product-actions">
+      <button class="btn btn-small edit-product" data-id="${product.id}">
+        <i class="fas fa-edit"></i> Edit
+      </button>
+      <button class="btn btn-small btn-danger delete-product" data-id="${product.id}">
+        <i class="fas fa-trash"></i> Delete
+      </button>
+    </div>
+  </div>
+</div>
+        `
+          )
+          .join("");
+      }
+
+      function filterProducts() {
+        const searchTerm = (
+          document.getElementById("inventorySearch")?.value || ""
+        ).toLowerCase();
+        const category =
+          document.getElementById("categoryFilter")?.value || "";
+
+        const filtered = products.filter((product) => {
+          const matchesSearch =
+            product.name.toLowerCase().includes(searchTerm) ||
+            product.description.toLowerCase().includes(searchTerm) ||
+            product.supplier.toLowerCase().includes(searchTerm) ||
+            product.location.toLowerCase().includes(searchTerm);
+          const matchesCategory = !category || product.category === category;
+          return matchesSearch && matchesCategory;
+        });
+
+        renderProducts(filtered);
+      }
+
+      function getStockStatus(quantity) {
+  if (quantity > 50) return "high";
+  if (quantity > 10) return "medium";
+  if (quantity > 0) return "low";
+  return "none";
+}
+
+      function getStockText(quantity) {
+  const status = getStockStatus(quantity);
+  const texts = {
+    high: `In Stock (${quantity})`,
+    medium: `Low Stock (${quantity})`,
+    low: `Very Low Stock (${quantity})`,
+    none: `Out of Stock`
+  };
+  return texts[status];
+}
+
+function loadInventory() {
+  fetch('/supplier/api/inventory/')
+    .then((res) => res.json())
+    .then((data) => {
+      products = data.map((item) => ({
+        id: item.id,
+        name: item.product_name,
+        category: item.category,
+        price: item.price,
+        stock_quantity: item.stock_quantity,
+        image: item.image,
+        description: item.description,
+        supplier: "You",
+      }));
+      renderProducts(products);
+    })
+    .catch((err) => console.error("Error reloading inventory:", err));
+}
+function getCSRFToken() {
+  let cookieValue = null;
+  if (document.cookie && document.cookie !== "") {
+    const cookies = document.cookie.split(";");
+    for (let cookie of cookies) {
+      cookie = cookie.trim();
+      if (cookie.startsWith("csrftoken=")) {
+        cookieValue = cookie.substring("csrftoken=".length);
+        break;
+      }
+    }
+  }
+  return cookieValue;
+}
+
+     function deleteProduct(productId) {
+  if (!confirm("Are you sure you want to delete this product?")) return;
+
+  fetch(`/supplier/api/inventory/delete/${productId}/`, {
+    method: "DELETE",
+    headers: { "X-CSRFToken": getCSRFToken() },
+  })
+    .then((res) => res.json())
+    .then((data) => {
+      showToast(data.message, "success");
+      loadInventory();
+    })
+    .catch((err) => {
+      console.error("Error deleting product:", err);
+      showToast("Failed to delete product", "error");
+    });
+}
+
+
+     // In your JavaScript, enhance the modal handling
+function openModal(product = null) {
+  const form = document.getElementById("productForm");
+  const modal = document.getElementById("productModal");
+
+  if (product) {
+    // Edit mode - populate all fields
+    form.reset();
+    form.elements["productName"].value = product.name;
+    form.elements["productCategory"].value = product.category;
+    form.elements["productDescription"].value = product.description;
+    form.elements["productPrice"].value = product.price;
+    form.elements["productStock"].value = product.qty;
+    form.elements["productRating"].value = product.rating;
+    form.elements["productRatingCount"].value = product.ratingCount;
+    form.elements["productSupplier"].value = product.supplier;
+    form.elements["productLocation"].value = product.location;
+    form.elements["productBadge"].value = product.badge || "";
+    form.elements["productImage"].value = product.image || "";
+
+    // Update modal title and button
+    modal.querySelector(".modal-header h2").textContent = "Edit Product";
+    document.getElementById("saveProduct").textContent = "Save Changes";
+    modal.dataset.mode = "edit";
+    modal.dataset.productId = product.id;
+  } else {
+    // Add mode
+    form.reset();
+    modal.querySelector(".modal-header h2").textContent = "Add New Product";
+    document.getElementById("saveProduct").textContent = "Add Product";
+    modal.dataset.mode = "add";
+    delete modal.dataset.productId;
+  }
+
+  modal.classList.add("active");
+}
+
+function saveProduct() {
+  const form = document.getElementById("productForm");
+  const modal = document.getElementById("productModal");
+
+  const productData = {
+    name: form.elements["productName"].value.trim(),
+    category: form.elements["productCategory"].value,
+    description: form.elements["productDescription"].value.trim(),
+    price: parseFloat(form.elements["productPrice"].value),
+    stock_quantity: parseInt(form.elements["productStock"].value),
+    rating: parseFloat(form.elements["productRating"].value) || 0,
+    rating_count: parseInt(form.elements["productRatingCount"].value) || 0,
+    badge: form.elements["productBadge"].value.trim() || "",
+    image: form.elements["productImage"].value.trim() || "https://cdn-icons-png.flaticon.com/512/3081/3081559.png",
+    supplier_image: "https://randomuser.me/api/portraits/men/" + Math.floor(Math.random() * 100) + ".jpg"
+  };
+
+fetch('/supplier/api/inventory/add/', {
+  method: "POST",
+  headers: {
+    "Content-Type": "application/json",
+    "X-CSRFToken": getCSRFToken()
+  },
+  body: JSON.stringify(productData)
+})
+.then(response => {
+  if (!response.ok) throw new Error("Failed to save product");
+  return response.json();
+})
+.then(data => {
+  console.log("Product saved:", data);
+  showToast("Product saved successfully", "success");
+})
+.catch(err => console.error(err));
+}
+
+
+
+
+
+
+      function closeModal() {
+        document.getElementById("productModal").classList.remove("active");
+      }
+
+      function saveProducts() {
+        localStorage.setItem("products", JSON.stringify(products));
+      }
+
+      // =============================================
+      // ORDERS FUNCTIONALITY
+      // =============================================
+      const ORDERS_POLL_MS = 30000;
+
+      function initOrders() {
+        // Load order data from JSON file
+       batchedFetch('/supplier/api/orders/')
+  .then((response) => {
+    if (!response.ok) {
+      throw new Error("Failed to load orders data");
+    }
+    return response.json();
+  })
+  .then((data) => {
+    ordersData = data;
+    renderOrderTables();
+
+    // Push progress changes and new orders instead of re-fetching
+    const orderEvents = new EventSource('/api/orders/stream/');
+    ['shared_order.created', 'shared_order.updated'].forEach(type =>
+      orderEvents.addEventListener(type, (e) => {
+        const order = JSON.parse(e.data);
+        ordersData = [order, ...ordersData.filter(o => o.id !== order.id)];
+        renderOrderTables();
+      }));
+    // Without ASGI the stream answers 204 and EventSource gives up: poll.
+    let ordersPoll = null;
+    orderEvents.addEventListener('error', () => {
+      if (orderEvents.readyState === EventSource.CLOSED && ordersPoll === null) {
+        ordersPoll = setInterval(() => {
+          fetch('/supplier/api/orders/', { cache: 'no-cache' })
+            .then((res) => res.json())
+            .then((orders) => {
+              ordersData = orders;
+              renderOrderTables();
+            })
+            .catch((error) => console.error("Error polling orders:", error));
+        }, ORDERS_POLL_MS);
+      }
+    });
+  })
+  .catch((error) => {
+    console.error("Error loading orders:", error);
+    document.getElementById("ongoing-orders-body").innerHTML =
+      '<tr><td colspan="6" class="error-message">Failed to load orders data</td></tr>';
+    document.getElementById("completed-orders-body").innerHTML =
+      '<tr><td colspan="7" class="error-message">Failed to load orders data</td></tr>';
+  });
+
+      }
+
+      function renderOrderTables() {
+        // Map Django's progress field to a readable status
+        ordersData = ordersData.map(order => ({
+          ...order,
+          status: order.progress < 3 ? "ongoing" : "completed"
+        }));
+
+        // Separate into ongoing & completed
+        const ongoingOrders = ordersData.filter(order => order.status === "ongoing");
+        const completedOrders = ordersData.filter(order => order.status === "completed");
+
+        renderOngoingOrders(ongoingOrders);
+        renderCompletedOrders(completedOrders);
+
+        // Initialize event listeners after data is loaded
+        initOrderEventListeners();
+      }
+
+      function formatDate(dateString) {
+        const date = new Date(dateString);
+        return date.toLocaleDateString("en-US", {
+          year: "numeric",
+          month: "short",
+          day: "numeric",
+        });
+      }
+
+      function countItems(items) {
+        return items.reduce((total, item) => total + item.quantity, 0);
+      }
+
+      function renderOngoingOrders(orders) {
+        const ongoingTable = document.getElementById("ongoing-orders-body");
+        if (!ongoingTable) return;
+
+        ongoingTable.innerHTML = orders
+          .map((order) => {
+            return order.items
+              .map(
+                (item) => `
+              <tr class="order-row" data-order="${order.orderId
+                  }" data-tracking="${order.track}">
+                <td>${order.orderId}</td>
+                <td>${item.itemName}</td>
+                <td>${item.quantity}</td>
+                <td>${order.vendor.vendorName}</td>
+                <td><span class="status processing">Processing</span></td>
+                <td>
+                  <button class="btn-icon details-toggle">
+                    <i class="fas fa-chevron-down"></i>
+                  </button>
+                </td>
+              </tr>
+              <tr class="order-details" id="details-${order.orderId}">
+                <td colspan="6">
+                  <div class="order-details-content">
+                    <div class="details-grid">
+                      <div class="detail-item">
+                        <span class="detail-label">Order ID</span>
+                        <span class="detail-value">${order.orderId}</span>
+                      </div>
+                      <div class="detail-item">
+                        <span class="detail-label">Item Name</span>
+                        <span class="detail-value">${item.itemName}</span>
+                      </div>
+                      <div class="detail-item">
+                        <span class="detail-label">Quantity</span>
+                        <span class="detail-value">${item.quantity}</span>
+                      </div>
+                      <div class="detail-item">
+                        <span class="detail-label">Price</span>
+                        <span class="detail-value">₹${item.price.toFixed(
+                    2
+                  )}</span>
+                      </div>
+                      <div class="detail-item">
+                        <span class="detail-label">Vendor Name</span>
+                        <span class="detail-value">${order.vendor.vendorName
+                  }</span>
+                      </div>
+                      <div class="detail-item">
+                        <span class="detail-label">Supplier Name</span>
+                        <span class="detail-value">${order.supplier.supplierName
+                  }</span>
+                      </div>
+                      <div class="detail-item">
+                        <span class="detail-label">Payment Mode</span>
+                        <span class="detail-value">${order.modeOfPayment.charAt(0).toUpperCase() +
+                  order.modeOfPayment.slice(1)
+                  }</span>
+                      </div>
+                    </div>
+
+                    <div class="tracking-section">
+                      <h4>Order Tracking</h4>
+                      <div class="tracking-checkboxes">
+                        <label class="checkbox-label">
+                          <input type="checkbox" class="tracking-checkbox" data-step="1" ${order.track >= 1 ? "checked" : ""
+                  } />
+                          <span class="checkbox-custom"></span>
+                          <span>Accepted</span>
+                        </label>
+                        <label class="checkbox-label">
+                          <input type="checkbox" class="tracking-checkbox" data-step="2" ${order.track >= 2 ? "checked" : ""
+                  } />
+                          <span class="checkbox-custom"></span>
+                          <span>Packed</span>
+                        </label>
+                        <label class="checkbox-label">
+                          <input type="checkbox" class="tracking-checkbox" data-step="3" ${order.track >= 3 ? "checked" : ""
+                  } />
+                          <span class="checkbox-custom"></span>
+                          <span>Dispatched</span>
+                        </label>
+                      </div>
+                    </div>
+                  </div>
+                </td>
+              </tr>
+            `
+              )
+              .join("");
+          })
+          .join("");
+      }
+
+      function renderCompletedOrders(orders) {
+        const completedTable = document.getElementById(
+          "completed-orders-body"
+        );
+        if (!completedTable) return;
+
+        completedTable.innerHTML = orders
+          .map(
+            (order) => `
+          <tr data-order-id="${order.orderId}">
+            <td>${order.orderId}</td>
+            <td>${order.vendor.vendorName}</td>
+            <td>${formatDate(order.date)}</td>
+            <td>${countItems(order.items)}</td>
+            <td>₹${order.totalAmount.toFixed(2)}</td>
+            <td><span class="status completed">Completed</span></td>
+            <td>
+              <button class="btn btn-small btn-secondary">
+                <i class="fas fa-redo"></i> Reorder
+              </button>
+            </td>
+          </tr>
+        `
+          )
+          .join("");
+      }
+
+      function initOrderEventListeners() {
+        // Order details toggle
+        document.querySelectorAll(".details-toggle").forEach((button) => {
+          button.addEventListener("click", function () {
+            const orderRow = this.closest(".order-row");
+            const orderId = orderRow.getAttribute("data-order");
+            const detailsRow = document.getElementById(`details-${orderId}`);
+
+            // Toggle details
+            detailsRow.classList.toggle("show");
+            this.classList.toggle("active");
+
+            // Close other open details
+            document.querySelectorAll(".order-details").forEach((row) => {
+              if (row.id !== `details-${orderId}`) {
+                row.classList.remove("show");
+              }
+            });
+            document.querySelectorAll(".details-toggle").forEach((btn) => {
+              if (btn !== this) {
+                btn.classList.remove("active");
+              }
+            });
+          });
+        });
+
+        // Tracking checkboxes functionality
+        document
+          .querySelectorAll(".tracking-checkbox")
+          .forEach((checkbox) => {
+            checkbox.addEventListener("change", function () {
+              const step = parseInt(this.getAttribute("data-step"));
+              const orderRow = this.closest(".order-row");
+              const orderId = orderRow.getAttribute("data-order");
+
+              if (this.checked) {
+                // Check all previous steps
+                for (let i = 1; i <= step; i++) {
+                  const prevCheckbox = orderRow.querySelector(
+                    `.tracking-checkbox[data-step="${i}"]`
+                  );
+                  if (prevCheckbox) {
+                    prevCheckbox.checked = true;
+                  }
+                }
+
+                orderRow.setAttribute("data-tracking", step);
+
+                // Update status badge
+                const statusBadge = orderRow.querySelector(".status");
+                if (step === 1) {
+                  statusBadge.textContent = "Processing";
+                  statusBadge.className = "status processing";
+                } else if (step === 2) {
+                  statusBadge.textContent = "Packed";
+                  statusBadge.className = "status packed";
+                } else if (step === 3) {
+                  statusBadge.textContent = "Dispatched";
+                  statusBadge.className = "status shipped";
+                }
+              } else {
+                for (let i = step; i <= 3; i++) {
+                  const nextCheckbox = orderRow.querySelector(
+                    `.tracking-checkbox[data-step="${i}"]`
+                  );
+                  if (nextCheckbox) {
+                    nextCheckbox.checked = false;
+                  }
+                }
+                orderRow.setAttribute("data-tracking", step - 1);
+              }
+            });
+          });
+
+        // Completed Order Modal Functionality
+        const completedOrderModal = document.getElementById(
+          "completedOrderModal"
+        );
+        const closeCompletedModal = document.getElementById(
+          "closeCompletedModal"
+        );
+        const modalCloseBtn = document.querySelector(".modal-close");
+
+        // Open modal when clicking on a completed order row
+        document
+          .querySelectorAll("#completed-orders-body tr")
+          .forEach((row) => {
+            row.addEventListener("click", function (e) {
+              if (e.target.closest("button")) return;
+
+              const orderId = this.getAttribute("data-order-id");
+              const order = ordersData.find((o) => o.orderId === orderId);
+
+              if (order) {
+                document.getElementById("completed-order-id").textContent =
+                  order.orderId;
+                document.getElementById("completed-vendor").textContent =
+                  order.vendor.vendorName;
+                document.getElementById("completed-date").textContent =
+                  formatDate(order.date);
+                document.getElementById("completed-items").textContent =
+                  countItems(order.items);
+                document.getElementById(
+                  "completed-amount"
+                ).textContent = `₹${order.totalAmount.toFixed(2)}`;
+
+                const statusElement =
+                  document.getElementById("completed-status");
+                statusElement.innerHTML = `<span class="status ${order.status
+                  }">
+            ${order.status.charAt(0).toUpperCase() + order.status.slice(1)}
+          </span>`;
+
+                const itemsList = document.getElementById(
+                  "completed-items-list"
+                );
+                itemsList.innerHTML = order.items
+                  .map(
+                    (item) => `
+                <tr>
+                  <td>${item.itemName}</td>
+                  <td>${item.quantity}</td>
+                  <td>₹${item.price.toFixed(2)}</td>
+                  <td>₹${item.subtotal.toFixed(2)}</td>
+                </tr>
+              `
+                  )
+                  .join("");
+
+                completedOrderModal.classList.add("active");
+              }
+            });
+          });
+
+        // Close modal
+        closeCompletedModal.addEventListener("click", () => {
+          completedOrderModal.classList.remove("active");
+        });
+
+        modalCloseBtn.addEventListener("click", () => {
+          completedOrderModal.classList.remove("active");
+        });
+
+        completedOrderModal.addEventListener("click", (e) => {
+          if (e.target === completedOrderModal) {
+            completedOrderModal.classList.remove("active");
+          }
+        });
+
+        // Reorder functionality
+        document
+          .getElementById("reorderBtn")
+          ?.addEventListener("click", () => {
+            const orderId =
+              document.getElementById("completed-order-id").textContent;
+            alert(`Reorder initiated for ${orderId}`);
+            completedOrderModal.classList.remove("active");
+          });
+      }
+
+      // =============================================
+      // ANALYTICS FUNCTIONALITY
+      // =============================================
+      function initAnalytics() {
+        // Sales Chart
+        const salesCtx = document
+          .getElementById("salesChart")
+          .getContext("2d");
+        new Chart(salesCtx, {
+          type: "bar",
+          data: {
+            labels: ["Veg", "Dairy", "Non-veg", "Bakery", "Spice"],
+            datasets: [
+              {
+                label: "Q1 Sales",
+                data: [42000, 28000, 35000, 26000, 19000],
+                backgroundColor: "#3b82f6",
+              },
+              {
+                label: "Q2 Sales",
+                data: [48000, 19000, 31000, 39000, 13000],
+                backgroundColor: "#60a5fa",
+              },
+            ],
+          },
+          options: getChartOptions(),
+        });
+
+        // Customer Chart
+        const customerCtx = document
+          .getElementById("customerChart")
+          .getContext("2d");
+        new Chart(customerCtx, {
+          type: "pie",
+          data: {
+            labels: ["Retailers", "Distributors", "E-commerce", "Corporate"],
+            datasets: [
+              {
+                data: [45, 25, 20, 10],
+                backgroundColor: ["#3b82f6", "#60a5fa", "#93c5fd", "#bfdbfe"],
+              },
+            ],
+          },
+          options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            plugins: {
+              legend: {
+                position: "bottom",
+                display: true,
+              },
+            },
+          },
+        });
+      }
+
+      // =============================================
+      // SETTINGS FUNCTIONALITY
+      // =============================================
+      function initSettings() {
+        // Notification toggles
+        document
+          .getElementById("notifyNewOrders")
+          ?.addEventListener("change", function () {
+            userData.notifications.newOrders = this.checked;
+          });
+
+        document
+          .getElementById("notifyLowStock")
+          ?.addEventListener("change", function () {
+            userData.notifications.lowStock = this.checked;
+          });
+
+        document
+          .getElementById("notifyMonthlyReports")
+          ?.addEventListener("change", function () {
+            userData.notifications.monthlyReports = this.checked;
+          });
+
+        // Security buttons
+        document
+          .getElementById("enable2faBtn")
+          ?.addEventListener("click", function () {
+            userData.security.twoFactorEnabled =
+              !userData.security.twoFactorEnabled;
+            this.textContent = userData.security.twoFactorEnabled
+              ? "Disable"
+              : "Enable";
+            alert(
+              `Two-factor authentication ${userData.security.twoFactorEnabled ? "enabled" : "disabled"
+              }`
+            );
+          });
+
+        document
+          .getElementById("changePasswordBtn")
+          ?.addEventListener("click", function () {
+            const newPassword = prompt("Enter your new password:");
+            if (newPassword) {
+              userData.security.lastPasswordChange = new Date()
+                .toISOString()
+                .split("T")[0];
+              document.getElementById("lastPasswordChange").textContent =
+                "just now";
+              alert("Password changed successfully");
+            }
+          });
+      }
+
+      // =============================================
+      // UTILITY FUNCTIONS
+      // =============================================
+      function showToast(message, type = "success") {
+  // Remove any existing toasts first
+  document.querySelectorAll('.toast-notification').forEach(toast => {
+    toast.remove();
+  });
+
+  const toast = document.createElement('div');
+  toast.className = `toast-notification ${type}`;
+  toast.innerHTML = `
+    <i class="fas fa-${type === 'success' ? 'check-circle' : 'exclamation-circle'}"></i>
+    <span>${message}</span>
+  `;
+
+  document.body.appendChild(toast);
+
+  // Force reflow to enable animation
+  void toast.offsetWidth;
+
+  // Show with animation
+  toast.classList.add('show');
+
+  // Auto-hide after 3 seconds
+  setTimeout(() => {
+    toast.style.animation = 'fadeOut 0.3s forwards';
+    setTimeout(() => toast.remove(), 300);
+  }, 3000);
+}
+
+      // Initialize the current page (dashboard by default)
+      initializePage("dashboard");
+    });
@@ -0,0 +1,349 @@
+document.addEventListener('DOMContentLoaded', () => {
+    function getCSRFToken() {
+        let cookieValue = null;
+        if (document.cookie && document.cookie !== '') {
+            const cookies = document.cookie.split(';');
+            for (let cookie of cookies) {
+                cookie = cookie.trim();
+                if (cookie.startsWith('csrftoken=')) {
+                    cookieValue = cookie.substring('csrftoken='.length);
+                    break;
+                }
+            }
+        }
+        return cookieValue;
+    }
+
+    let allProducts = [],
+        cart = JSON.parse(localStorage.getItem('cart')) || [],  // Persisted cart
+        ordersData = { currentOrders: [], recentOrders: [] },
+        profileData = {};
+    const tabElements = document.querySelectorAll('.nav-tab');
+    const contentElements = document.querySelectorAll('.main-content');
+    const cartIcon = document.getElementById('cartIcon');
+    const cartDrawer = document.getElementById('cartDrawer');
+    const closeCart = document.getElementById('closeCart');
+    const cartItemsEl = document.getElementById('cartItems');
+    const cartCountEl = document.getElementById('cartCount');
+    const productsContainer = document.getElementById('products-container');
+    const searchInput = document.getElementById('searchInput');
+    const checkoutBtn = document.getElementById('checkoutBtn');
+
+    // ====== Utility ======
+    function saveCart() {
+        localStorage.setItem('cart', JSON.stringify(cart));
+        updateCartCount();
+    }
+
+    function updateCartCount() {
+        cartCountEl.textContent = cart.reduce((sum, item) => sum + item.quantity, 0);
+    }
+
+    function switchTab(tabId) {
+        tabElements.forEach(tab => tab.classList.toggle('active', tab.dataset.tab === tabId));
+        contentElements.forEach(content => content.classList.toggle('active', content.id === tabId));
+    }
+
+    function toggleCartDrawer() {
+        cartDrawer.classList.toggle('open');
+        renderCartItems();
+    }
+
+    // ====== Orders Rendering ======
+   function renderOrders(data) {
+    // Current Orders
+    document.getElementById("currentOrdersCount").textContent = data.currentOrders.length;
+    const currentOrdersBody = document.getElementById("currentOrdersBody");
+    currentOrdersBody.innerHTML = "";
+    data.currentOrders.forEach(order => {
+        const row = document.createElement("tr");
+        row.innerHTML = `
+            <td>${order.order_id}</td>
+            <td>${order.customer}</td>
+            <td>${order.item_name}</td>
+            <td>
+                <div class="timeline">
+                    ${generateSteps(order.progress)}
+                </div>
+                <div class="step-labels">
+                    <span>Accepted</span>
+                    <span>Packed</span>
+                    <span>Dispatched</span>
+                </div>
+            </td>`;
+        currentOrdersBody.appendChild(row);
+    });
+
+    // Recent Orders (only 3 initially)
+    const recentOrdersBody = document.getElementById("recentOrdersBody");
+    recentOrdersBody.innerHTML = "";
+    let visibleOrders = data.recentOrders.slice(0, 3);  // Show only 3
+    visibleOrders.forEach(order => {
+        const row = document.createElement("tr");
+        row.innerHTML = `
+            <td>${order.order_id}</td>
+            <td>${order.customer}</td>
+            <td>${order.item_name}</td>
+            <td>${order.date}</td>
+            <td>₹${order.amount}</td>`;
+        recentOrdersBody.appendChild(row);
+    });
+
+    // Handle "View More"
+    const viewMoreBtn = document.getElementById("viewMoreBtn");
+    viewMoreBtn.onclick = () => {
+        recentOrdersBody.innerHTML = "";
+        data.recentOrders.forEach(order => {
+            const row = document.createElement("tr");
+            row.innerHTML = `
+                <td>${order.order_id}</td>
+                <td>${order.customer}</td>
+                <td>${order.item_name}</td>
+                <td>${order.date}</td>
+                <td>₹${order.amount}</td>`;
+            recentOrdersBody.appendChild(row);
+        });
+        viewMoreBtn.style.display = 'none'; // Hide button after expanding
+    };
+}
+
+    function generateSteps(progress) {
+        const steps = ["✓", "✓", "✓"];
+        return steps.map((val, idx) =>
+            `<div class="step ${idx < progress ? "completed" : ""}">${val}</div>`
+        ).join("");
+    }
+
+    // ====== Cart Rendering ======
+    function renderCartItems() {
+        cartItemsEl.innerHTML = cart.length === 0 ? '<p>Your cart is empty.</p>' : '';
+        cart.forEach((item, index) => {
+            const div = document.createElement('div');
+            div.classList.add('cart-item');
+            div.innerHTML = `
+                <h4>${item.name}</h4>
+                <p>Qty: ${item.quantity} | ₹${item.price * item.quantity}</p>
+                <button class="remove-btn" data-index="${index}">Remove</button>
+            `;
+            div.querySelector('.remove-btn').addEventListener('click', () => {
+                cart.splice(index, 1);
+                saveCart();
+                renderCartItems();
+            });
+            cartItemsEl.appendChild(div);
+        });
+        updateCartCount();
+    }
+
+    // ====== Products Rendering ======
+    function renderProducts(products) {
+        productsContainer.innerHTML = '';
+        products.forEach(product => {
+            const card = document.createElement('div');
+            card.classList.add('product-card');
+            card.innerHTML = `
+                <img src="${product.image}" alt="${product.name}">
+                <h3>${product.name}</h3>
+                <p>₹${product.price}</p>`;
+            const btn = document.createElement('button');
+            btn.textContent = 'Add to Cart';
+            btn.addEventListener('click', () => {
+                const existing = cart.find(p => p.id === product.id);
+                if (existing) existing.quantity++;
+                else cart.push({ ...product, quantity: 1 });
+                saveCart();
+                renderCartItems();
+                alert(`${product.name} added to cart`);
+            });
+            card.appendChild(btn);
+            productsContainer.appendChild(card);
+        });
+    }
+
+    // ====== Profile ======
+    function populateProfile(data) {
+        document.getElementById('fullNameView').textContent = `${data.first_name} ${data.last_name}`;
+        document.getElementById('emailView').textContent = data.email;
+        document.getElementById('phoneView').textContent = data.profile_data?.phone || 'N/A';
+        document.getElementById('restaurantNameView').textContent = data.profile_data?.company_name || data.profile_data?.organization_name || 'N/A';
+        document.getElementById('restaurantTypeView').textContent = data.profile_data?.business_type || data.profile_data?.business_category || 'N/A';
+        document.getElementById('locationView').textContent = data.profile_data?.address || 'N/A';
+    }
+
+    // ====== Checkout ======
+   checkoutBtn.addEventListener('click', () => {
+    if (cart.length === 0) {
+        alert("Your cart is empty!");
+        return;
+    }
+
+    fetch('/api/orders/', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': getCSRFToken()
+        },
+        body: JSON.stringify({ items: cart })
+    })
+    .then(res => res.json())
+    .then(data => {
+    alert("Order placed successfully!");
+    cart = [];  // Clear the cart
+    updateCartCount();
+    renderCartItems();  // Refresh the cart UI
+    toggleCartDrawer();  // Close the drawer
+    // The new orders arrive through the order event stream below.
+    if (ordersPoll !== null) pollOrders();
+})
+
+    .catch(err => {
+        console.error(err);
+        alert("Error placing order. Please try again.");
+    });
+});
+
+
+    // ====== Event Bindings ======
+    tabElements.forEach(tab => tab.addEventListener('click', () => switchTab(tab.dataset.tab)));
+    cartIcon.addEventListener('click', toggleCartDrawer);
+    closeCart.addEventListener('click', toggleCartDrawer);
+    searchInput.addEventListener('input', () => {
+        const q = searchInput.value.toLowerCase();
+        renderProducts(allProducts.filter(p => p.name.toLowerCase().includes(q)));
+    });
+
+    // ====== Initial Load ======
+    // One round trip for the first screen, then the rest of the catalog.
+    fetch('/api/vendor/bootstrap/')
+        .then(r => r.json())
+        .then(({ profile, catalog, orders }) => {
+            allProducts = catalog.results;
+            ordersData = orders;
+            profileData = profile;
+            renderProducts(allProducts);
+            renderOrders(ordersData);
+            populateProfile(profileData);
+            renderCartItems();
+            updateCartCount();
+            changesToken = catalog.changes_token;
+            setInterval(syncCatalog, CATALOG_SYNC_MS);
+            if (catalog.next_offset !== null) {
+                return loadCatalogSnapshot().catch(() =>
+                    fetch(`/api/products/?offset=${catalog.next_offset}`)
+                        .then(r => r.json())
+                        .then(rest => {
+                            allProducts = allProducts.concat(rest);
+                            renderProducts(allProducts);
+                        }));
+            }
+        })
+        .catch(err => console.error(err));
+
+    // The rest of the catalog comes from the static snapshot (precompressed,
+    // cached forever); delta sync then brings it up to date from its token.
+    function loadCatalogSnapshot() {
+        return fetch(document.body.dataset.catalogManifest, { cache: 'no-cache' })
+            .then(r => { if (!r.ok) throw new Error('No catalog snapshot'); return r.json(); })
+            .then(manifest => fetch(manifest.all)
+                .then(r => { if (!r.ok) throw new Error('Catalog snapshot missing'); return r.json(); })
+                .then(products => {
+                    allProducts = products;
+                    renderProducts(allProducts);
+                    changesToken = manifest.changes_token;
+                    return syncCatalog();
+                }));
+    }
+
+    // ====== Catalog Delta Sync ======
+    // Only products changed or deleted since the last token are downloaded.
+    const CATALOG_SYNC_MS = 60000;
+    let changesToken = null;
+
+    function applyCatalogChanges({ changed, deleted }) {
+        const gone = new Set(deleted.concat(changed.map(p => p.id)));
+        allProducts = allProducts.filter(p => !gone.has(p.id)).concat(changed);
+        allProducts.sort((a, b) => a.id - b.id);
+        const q = searchInput.value.toLowerCase();
+        renderProducts(q ? allProducts.filter(p => p.name.toLowerCase().includes(q)) : allProducts);
+    }
+
+    function syncCatalog() {
+        return fetch(`/api/products/changes/?since=${encodeURIComponent(changesToken)}`)
+            .then(r => {
+                if (r.status === 410) {
+                    // Token older than the server keeps deletions for: start over.
+                    allProducts = [];
+                    changesToken = '';
+                    return syncCatalog();
+                }
+                return r.json().then(page => {
+                    changesToken = page.token;
+                    if (page.changed.length || page.deleted.length) applyCatalogChanges(page);
+                    if (page.more) return syncCatalog();
+                });
+            })
+            .catch(err => console.error(err));
+    }
+
+    // ====== Live Order Updates (Server-Sent Events) ======
+    function applyOrderEvent(order) {
+        const others = o => o.id !== order.id;
+        ordersData.currentOrders = ordersData.currentOrders.filter(others);
+        ordersData.recentOrders = ordersData.recentOrders.filter(others);
+        if (order.progress < 3) {
+            ordersData.currentOrders.unshift(order);
+        } else {
+            ordersData.recentOrders = [order, ...ordersData.recentOrders].slice(0, 5);
+        }
+        renderOrders(ordersData);
+    }
+
+    // Without ASGI the stream answers 204 and EventSource gives up; the order
+    // list is polled instead (a 304 while nothing changed).
+    const ORDERS_POLL_MS = 30000;
+    let ordersPoll = null;
+
+    function pollOrders() {
+        return fetch('/api/orders/', { cache: 'no-cache' })
+            .then(r => r.json())
+            .then(data => {
+                ordersData = data;
+                renderOrders(ordersData);
+            })
+            .catch(err => console.error(err));
+    }
+
+    const orderEvents = new EventSource('/api/orders/stream/');
+    ['order.created', 'order.updated'].forEach(type =>
+        orderEvents.addEventListener(type, e => applyOrderEvent(JSON.parse(e.data))));
+    orderEvents.addEventListener('error', () => {
+        if (orderEvents.readyState === EventSource.CLOSED && ordersPoll === null) {
+            ordersPoll = setInterval(pollOrders, ORDERS_POLL_MS);
+        }
+    });
+});
+
+// Switch tab function
+// function switchTab(tabId) {
+//     document.querySelectorAll('.nav-tab').forEach(tab => tab.classList.toggle('active', tab.dataset.tab === tabId));
+//     document.querySelectorAll('.main-content').forEach(content => content.classList.toggle('active', content.id === tabId));
+// }
+//
+// // Button actions
+// document.getElementById('shopNowBtn').addEventListener('click', () => switchTab('shop'));
+// document.getElementById('profileBtn2').addEventListener('click', () => switchTab('profile'));
+
+// Switch tab function
+function switchTab(tabId) {
+    document.querySelectorAll('.nav-tab').forEach(tab =>
+        tab.classList.toggle('active', tab.dataset.tab === tabId)
+    );
+    document.querySelectorAll('.main-content').forEach(content =>
+        content.classList.toggle('active', content.id === tabId)
+    );
+}
+
+// Button actions
+document.getElementById('shopNowBtn').addEventListener('click', () => switchTab('shop'));
+document.getElementById('profileBtn2').addEventListener('click', () => switchTab('profile'));
+document.getElementById('profileBtn').addEventListener('click', () => switchTab('profile')); // Top-right logo/profile
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vendor_project.settings")
+# The async API views only pay off when served by an ASGI server.
+os.environ.setdefault("ASYNC_API_VIEWS", "True")
 
 application = get_asgi_application()
@@ -1,5 +1,9 @@
 import os
+import sys
+from os import getenv, environ
 from pathlib import Path
+
+import dj_database_url
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,11 +27,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'accounts.middleware.StaticFilesMiddleware',
+    'accounts.middleware.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'accounts.middleware.ReplicaRoutingMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -52,30 +59,124 @@ TEMPLATES = [
 ]
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / "static"]
+STATIC_ROOT = Path(getenv('STATIC_ROOT', BASE_DIR / 'staticfiles'))
+# collectstatic minifies, fingerprints and gzip/brotli-compresses the assets;
+# WhiteNoise (accounts.middleware.StaticFilesMiddleware) serves the
+# fingerprinted files with far-future, immutable cache headers.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'accounts.storage.MinifiedManifestStaticFilesStorage'},
+}
+# Precompressed catalog snapshots under STATIC_ROOT (see accounts.snapshots).
+# Turn on in production, next to a `manage.py build_catalog_snapshots --watch`
+# process that rebuilds them at most once per CATALOG_SNAPSHOT_DEBOUNCE seconds
+# after catalog writes. Keep the directory out of `collectstatic --clear`.
+CATALOG_SNAPSHOTS = getenv('CATALOG_SNAPSHOTS', 'False').lower() == 'true'
+CATALOG_SNAPSHOT_DIR = 'catalog'
+CATALOG_SNAPSHOT_DEBOUNCE = int(getenv('CATALOG_SNAPSHOT_DEBOUNCE', '30'))
+# Responses smaller than this go out uncompressed (accounts.compression).
+COMPRESSION_MIN_BYTES = int(getenv('COMPRESSION_MIN_BYTES', '1024'))
 TEMPLATES[0]['DIRS'] = [BASE_DIR / "templates"]
+if not DEBUG:
+    # Parse each template once per process; DEBUG keeps reloading edits.
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+# Live order events (/api/orders/stream/, accounts.events) need ASGI; under
+# WSGI the stream answers 204 and the dashboards poll the order lists.
 WSGI_APPLICATION = 'vendor_project.wsgi.application'
+ASGI_APPLICATION = 'vendor_project.asgi.application'
+# Serve product_list, order_list (GET), supplier_dashboard_api and profile_view
+# from their async versions. vendor_project.asgi turns this on; under WSGI the
+# async views would only add a per-request event loop. Under ASGI each
+# request's ORM calls run on a thread of their own, so persistent
+# connections pile up until PostgreSQL refuses more: use DB_POOL there.
+ASYNC_API_VIEWS = getenv('ASYNC_API_VIEWS', 'False').lower() == 'true'
 LOGIN_REDIRECT_URL = '/accounts/login-success/'
 # Database - PostgreSQL
-import dj_database_url
-from os import getenv, environ
+# Connections are reused across requests instead of paying the TCP/TLS/auth
+# handshake every time. Two modes, picked through the environment:
+#   * persistent (default): DB_CONN_MAX_AGE seconds per worker thread, with
+#     DB_CONN_HEALTH_CHECKS pinging a reused connection before handing it out.
+#   * pooled (DB_POOL=true): a psycopg 3 ConnectionPool per process, sized by
+#     DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE. Needs psycopg[pool] and PostgreSQL.
+DB_POOL = getenv('DB_POOL', 'False').lower() == 'true'
+DB_CONNECTION_OPTIONS = {
+    'conn_max_age': 0 if DB_POOL else int(getenv('DB_CONN_MAX_AGE', '60')),
+    'conn_health_checks': getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true',
+}
+DB_POOL_OPTIONS = {
+    'min_size': int(getenv('DB_POOL_MIN_SIZE', '2')),
+    'max_size': int(getenv('DB_POOL_MAX_SIZE', '10')),
+    'timeout': float(getenv('DB_POOL_TIMEOUT', '10')),
+}
 
 DATABASES = {
     'default': dj_database_url.config(
-        default=environ.get('DATABASE_URL')
+        default=environ.get('DATABASE_URL'),
+        **DB_CONNECTION_OPTIONS,
     )
 }
 
+# Read replicas: DATABASE_REPLICA_URLS is a comma-separated list of URLs.
+# accounts.routers sends reads made while serving a GET/HEAD request (or a
+# POST to a read-only view such as the batch API) to a replica (round-robin, skipping any lagging more than DB_REPLICA_MAX_LAG
+# seconds) and keeps a client on the primary for DB_READ_YOUR_WRITES_SECONDS
+# after it writes. Two local sqlite files are enough to try it out.
+DATABASE_REPLICAS = []
+for _index, _url in enumerate(
+        [u.strip() for u in getenv('DATABASE_REPLICA_URLS', '').split(',') if u.strip()], start=1):
+    DATABASES[f'replica_{_index}'] = dj_database_url.parse(_url, **DB_CONNECTION_OPTIONS)
+    DATABASES[f'replica_{_index}']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(f'replica_{_index}')
+if sys.argv[1:2] == ['test'] and not DATABASE_REPLICAS:
+    # A replica alias mirroring the test database, so the router tests run
+    # without replicas configured. It only takes reads once a test lists it
+    # in DATABASE_REPLICAS.
+    DATABASES['replica_1'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+
+if DB_POOL:
+    for _alias in DATABASES:
+        DATABASES[_alias].setdefault('OPTIONS', {})['pool'] = dict(DB_POOL_OPTIONS)
+
+DATABASE_ROUTERS = ['accounts.routers.PrimaryReplicaRouter']
+DB_REPLICA_MAX_LAG = float(getenv('DB_REPLICA_MAX_LAG', '5'))
+DB_REPLICA_LAG_CHECK_INTERVAL = float(getenv('DB_REPLICA_LAG_CHECK_INTERVAL', '2'))
+DB_READ_YOUR_WRITES_SECONDS = int(getenv('DB_READ_YOUR_WRITES_SECONDS', '5'))
+
+# Order history (accounts.partitions). On PostgreSQL the order tables are
+# partitioned by month; `manage.py maintain_order_partitions` (run daily, on
+# any database) rolls up the supplier totals of closed months, keeps
+# ORDER_PARTITIONS_AHEAD months ready and, with --archive, moves months older
+# than ORDER_ARCHIVE_AFTER_MONTHS to Parquet files under ORDER_ARCHIVE_DIR.
+# The dashboards list completed orders of the last ORDER_HOT_DAYS days only.
+ORDER_HOT_DAYS = int(getenv('ORDER_HOT_DAYS', '90'))
+ORDER_PARTITIONS_AHEAD = int(getenv('ORDER_PARTITIONS_AHEAD', '3'))
+ORDER_ARCHIVE_AFTER_MONTHS = int(getenv('ORDER_ARCHIVE_AFTER_MONTHS', '24'))
+ORDER_ARCHIVE_DIR = Path(getenv('ORDER_ARCHIVE_DIR', BASE_DIR / 'archive'))
+
 # Redis Session Backend
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
 
 # Cache Configuration with Redis
+REDIS_URL = getenv('REDIS_URL', 'redis://127.0.0.1:6379/0')
+
+# Redis with an in-process LRU in front for the hot keys below; see accounts.tiered_cache.
 CACHES = {
     'default': {
-        'BACKEND': 'django_redis.cache.RedisCache',
-        'LOCATION': 'redis://127.0.0.1:6379/0',
+        'BACKEND': 'accounts.tiered_cache.TwoTierCache',
+        'LOCATION': REDIS_URL,
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'L1_PREFIXES': ['version:', 'fragment:'],  # price tables have their own L1 (accounts.pricing)
+            'L1_MAX_ENTRIES': int(getenv('CACHE_L1_MAX_ENTRIES', '10000')),
+            'L1_MAX_BYTES': int(getenv('CACHE_L1_MAX_BYTES', str(32 * 1024 * 1024))),
+            'L1_TIMEOUT': int(getenv('CACHE_L1_TIMEOUT', '30')),
         }
     }
 }
@@ -31,4 +31,4 @@ urlpatterns = [
     path('', api_root, name='api_root'),
     path('', include('accounts.urls')),
     path('accounts/', include('accounts.urls')),
-]
\ No newline at end of file
+]